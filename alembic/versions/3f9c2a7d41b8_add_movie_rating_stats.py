@@ -0,0 +1,51 @@
+"""Add movie_rating_stats aggregate table
+
+Revision ID: 3f9c2a7d41b8
+Revises: 57d7865182ea
+Create Date: 2026-10-18 09:12:41.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d41b8'
+down_revision: Union[str, Sequence[str], None] = '57d7865182ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('movie_rating_stats',
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('ratings_sum', sa.BigInteger(), nullable=False),
+    sa.Column('ratings_count', sa.Integer(), nullable=False),
+    sa.Column('min_score', sa.Integer(), nullable=True),
+    sa.Column('max_score', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ),
+    sa.PrimaryKeyConstraint('movie_id')
+    )
+
+    # Backfill: one row per existing movie, aggregated from movie_ratings.
+    op.execute(
+        """
+        INSERT INTO movie_rating_stats (movie_id, ratings_sum, ratings_count, min_score, max_score)
+        SELECT m.id,
+               COALESCE(SUM(r.score), 0),
+               COUNT(r.id),
+               MIN(r.score),
+               MAX(r.score)
+        FROM movies m
+        LEFT JOIN movie_ratings r ON r.movie_id = m.id
+        GROUP BY m.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('movie_rating_stats')
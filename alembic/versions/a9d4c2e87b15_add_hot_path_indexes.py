@@ -0,0 +1,49 @@
+"""Add indexes on foreign keys and filter columns used by hot queries
+
+Revision ID: a9d4c2e87b15
+Revises: e2b6d9f14c70
+Create Date: 2026-10-18 15:02:44.730561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4c2e87b15'
+down_revision: Union[str, Sequence[str], None] = 'e2b6d9f14c70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column): rating loads / movie deletes, genre filter join,
+# director lookups, release_year filter
+INDEXES = (
+    ('movie_ratings', 'movie_id'),
+    ('movie_genres', 'genre_id'),
+    ('movies', 'director_id'),
+    ('movies', 'release_year'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while the indexes build; it cannot
+    # run inside a transaction. If a build fails, PostgreSQL leaves an INVALID
+    # index behind: drop it and run the upgrade again.
+    with op.get_context().autocommit_block():
+        for table, column in INDEXES:
+            op.create_index(
+                op.f(f'ix_{table}_{column}'), table, [column], unique=False,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, column in reversed(INDEXES):
+            op.drop_index(
+                op.f(f'ix_{table}_{column}'), table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
@@ -0,0 +1,53 @@
+"""Add trigram and full-text search indexes
+
+Revision ID: b81e4c0d9a27
+Revises: 3f9c2a7d41b8
+Create Date: 2026-10-18 11:40:05.517392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81e4c0d9a27'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a7d41b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the operator class must exist before the trigram indexes are built
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY keeps movies and genres writable while the indexes build; it
+    # cannot run inside a transaction. If a build fails, PostgreSQL leaves an
+    # INVALID index behind: drop it and run the upgrade again.
+    with op.get_context().autocommit_block():
+        # Trigram GIN indexes serve ILIKE '%...%' and the similarity operator (%)
+        op.create_index(
+            'ix_movies_title_trgm', 'movies', ['title'],
+            postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_genres_name_trgm', 'genres', ['name'],
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        # Full-text index; the expression must match MovieRepository.search exactly
+        op.create_index(
+            'ix_movies_title_tsv', 'movies', [sa.text("to_tsvector('simple', title)")],
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_movies_title_tsv', table_name='movies', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_genres_name_trgm', table_name='genres', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_movies_title_trgm', table_name='movies', postgresql_concurrently=True, if_exists=True)
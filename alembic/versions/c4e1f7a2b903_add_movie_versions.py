@@ -0,0 +1,33 @@
+"""Add movie version and updated_at columns for conditional GETs
+
+Revision ID: c4e1f7a2b903
+Revises: b81e4c0d9a27
+Create Date: 2026-10-18 13:05:27.640918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1f7a2b903'
+down_revision: Union[str, Sequence[str], None] = 'b81e4c0d9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant / stable defaults: PostgreSQL adds these without rewriting the tables
+    op.add_column('movies', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    op.add_column('movies', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False))
+    op.add_column('movie_rating_stats', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('movie_rating_stats', 'updated_at')
+    op.drop_column('movies', 'updated_at')
+    op.drop_column('movies', 'version')
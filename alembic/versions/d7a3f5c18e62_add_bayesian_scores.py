@@ -0,0 +1,65 @@
+"""Add damped-average scores and leaderboard indexes
+
+Revision ID: d7a3f5c18e62
+Revises: a9d4c2e87b15
+Create Date: 2026-10-18 18:21:07.413920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import LEADERBOARD_PRIOR_MEAN, LEADERBOARD_PRIOR_VOTES
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3f5c18e62'
+down_revision: Union[str, Sequence[str], None] = 'a9d4c2e87b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movie_rating_stats', sa.Column('bayesian_score', sa.Float(), nullable=True))
+    op.add_column('movie_genres', sa.Column('bayesian_score', sa.Float(), nullable=True))
+
+    # Backfill with the configured prior (same formula as MovieRepository).
+    op.execute(
+        sa.text(
+            """
+            UPDATE movie_rating_stats
+            SET bayesian_score = (CAST(ratings_sum AS FLOAT) + :prior_sum) / (ratings_count + :prior_votes)
+            WHERE ratings_count > 0
+            """
+        ).bindparams(
+            prior_sum=LEADERBOARD_PRIOR_MEAN * LEADERBOARD_PRIOR_VOTES,
+            prior_votes=LEADERBOARD_PRIOR_VOTES,
+        )
+    )
+    op.execute(
+        """
+        UPDATE movie_genres
+        SET bayesian_score = (
+            SELECT s.bayesian_score FROM movie_rating_stats s WHERE s.movie_id = movie_genres.movie_id
+        )
+        """
+    )
+
+    op.create_index(
+        'ix_movie_rating_stats_bayesian_score', 'movie_rating_stats',
+        [sa.text('bayesian_score DESC'), 'movie_id'], unique=False,
+    )
+    op.create_index(
+        'ix_movie_genres_genre_id_bayesian_score', 'movie_genres',
+        ['genre_id', sa.text('bayesian_score DESC'), 'movie_id'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movie_genres_genre_id_bayesian_score', table_name='movie_genres')
+    op.drop_index('ix_movie_rating_stats_bayesian_score', table_name='movie_rating_stats')
+    op.drop_column('movie_genres', 'bayesian_score')
+    op.drop_column('movie_rating_stats', 'bayesian_score')
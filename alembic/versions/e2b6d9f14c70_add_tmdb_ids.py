@@ -0,0 +1,41 @@
+"""Add tmdb_id external ids to movies, directors and genres
+
+Revision ID: e2b6d9f14c70
+Revises: c4e1f7a2b903
+Create Date: 2026-10-18 14:21:53.118306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6d9f14c70'
+down_revision: Union[str, Sequence[str], None] = 'c4e1f7a2b903'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('movies', 'directors', 'genres')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('tmdb_id', sa.Integer(), nullable=True))
+
+    # Built without blocking writes, so this can run against a live database
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                op.f(f'ix_{table}_tmdb_id'), table, ['tmdb_id'], unique=True,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(op.f(f'ix_{table}_tmdb_id'), table_name=table)
+        op.drop_column(table, 'tmdb_id')
@@ -0,0 +1,54 @@
+"""Add per-score rating counters to movie_rating_stats
+
+Revision ID: f3c8e1a6b250
+Revises: d7a3f5c18e62
+Create Date: 2026-10-18 20:47:32.905146
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8e1a6b250'
+down_revision: Union[str, Sequence[str], None] = 'd7a3f5c18e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCORES = range(1, 11)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for score in SCORES:
+        op.add_column(
+            'movie_rating_stats',
+            sa.Column(f'score_{score}', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        )
+
+    # Backfill from movie_ratings; movies without ratings keep the zero default.
+    # scripts.reconcile_score_histograms rebuilds the same counters later.
+    counts = ",\n".join(f"score_{score} = h.score_{score}" for score in SCORES)
+    buckets = ",\n".join(
+        f"COUNT(*) FILTER (WHERE score = {score}) AS score_{score}" for score in SCORES
+    )
+    op.execute(
+        f"""
+        UPDATE movie_rating_stats
+        SET {counts}
+        FROM (
+            SELECT movie_id, {buckets}
+            FROM movie_ratings
+            GROUP BY movie_id
+        ) AS h
+        WHERE h.movie_id = movie_rating_stats.movie_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for score in reversed(SCORES):
+        op.drop_column('movie_rating_stats', f'score_{score}')
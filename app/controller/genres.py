@@ -0,0 +1,64 @@
+from app.core.logger import get_logger
+
+logger = get_logger("movie_rating")
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Optional
+
+from app.controller.movies import movie_list_response
+from app.core.responses import FastJSONResponse
+from app.dependencies import get_movie_service, run_service
+from app.services.movie_service import CountStrategy, MovieService
+
+router = APIRouter()
+
+
+@router.get("/genres/", summary="List genres with movie counts and average ratings")
+async def list_genres(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=100),
+    service: MovieService = Depends(get_movie_service),
+):
+    logger.info("Fetching genres list (page=%s, page_size=%s, route=/api/v1/genres)", page, page_size)
+
+    result = await run_service(service.get_genres_page, page=page, page_size=page_size)
+    return FastJSONResponse(result)
+
+
+@router.get("/genres/{genre_id}/movies", summary="Movies in one genre (filter & pagination)")
+async def list_genre_movies(
+    genre_id: int,
+    request: Request,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    title: Optional[str] = Query(None),
+    release_year: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; overrides page"),
+    count: CountStrategy = Query("exact", description="How total_items is computed: exact, estimated or none"),
+    service: MovieService = Depends(get_movie_service),
+):
+    logger.info(
+        "Fetching genre movies (genre_id=%s, page=%s, page_size=%s, cursor=%s, count=%s, "
+        "route=/api/v1/genres/{genre_id}/movies)",
+        genre_id, page, page_size, cursor, count,
+    )
+
+    if not await run_service(service.genre_exists, genre_id):
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "status": "failure",
+                "error": {"code": 404, "message": "Genre not found"},
+            },
+        )
+    return await movie_list_response(
+        request,
+        service,
+        page=page,
+        page_size=page_size,
+        title=title,
+        release_year=release_year,
+        cursor=cursor,
+        count=count,
+        genre_id=genre_id,
+    )
@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.logger import dropped_records
+from app.core.metrics import PrometheusText, request_metrics
+from app.db.database import async_engine, async_pool_stats, pool_stats
+from app.dependencies import require_internal_token
+from app.services.movie_cache import movie_cache
+from app.services.movie_service import estimated_count_cache, genre_list_cache
+from app.services.rating_buffer import rating_buffer
+from app.services.reference_cache import reference_cache
+
+# Operational endpoints: not under /api/v1, hidden from the public schema and
+# only served to callers holding INTERNAL_API_TOKEN
+router = APIRouter(prefix="/internal", include_in_schema=False, dependencies=[Depends(require_internal_token)])
+# /metrics sits at the root, where Prometheus scrapes by default
+metrics_router = APIRouter(include_in_schema=False, dependencies=[Depends(require_internal_token)])
+
+
+@router.get("/db-pool", summary="Live connection pool statistics")
+def db_pool_stats():
+    pools = [pool_stats.snapshot()]
+    if async_engine is not None:
+        pools.append(async_pool_stats.snapshot())
+    return {"status": "success", "data": {"pools": pools}}
+
+
+@router.get("/rating-buffer", summary="Write-behind rating buffer statistics")
+def rating_buffer_stats():
+    return {
+        "status": "success",
+        "data": {"enabled": rating_buffer is not None, **(rating_buffer.snapshot() if rating_buffer else {})},
+    }
+
+
+@router.get("/cache", summary="Movie detail, reference-data and genre list cache statistics")
+def cache_stats():
+    return {
+        "status": "success",
+        "data": {
+            "enabled": movie_cache is not None,
+            **(movie_cache.stats() if movie_cache else {}),
+            "reference_data": {
+                "enabled": reference_cache is not None,
+                **(reference_cache.stats() if reference_cache else {}),
+            },
+            "genre_list": genre_list_cache.stats(),
+        },
+    }
+
+
+@metrics_router.get("/metrics", summary="Prometheus metrics")
+def metrics():
+    out = PrometheusText()
+
+    routes = sorted(request_metrics.routes.items())
+    out.counter("http_requests_total", "HTTP requests by route template and status.", (
+        ({"method": method, "route": route, "status": status}, count)
+        for (method, route), m in routes for status, count in sorted(m.statuses.items())
+    ))
+    out.histogram("http_request_duration_seconds", "Request latency, first byte in to last byte out.", (
+        ({"method": method, "route": route}, m.latency) for (method, route), m in routes
+    ))
+    out.histogram("http_request_db_seconds", "Time spent in the database driver per request.", (
+        ({"method": method, "route": route}, m.db_seconds) for (method, route), m in routes
+    ))
+    out.histogram("http_request_db_queries", "SQL statements per request.", (
+        ({"method": method, "route": route}, m.db_queries) for (method, route), m in routes
+    ))
+
+    pools = [pool_stats] + ([async_pool_stats] if async_engine is not None else [])
+    out.histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", (
+        ({"pool": p.name}, p.wait) for p in pools
+    ))
+    out.counter("db_pool_checkouts_total", "Connection checkouts.", (({"pool": p.name}, p.checkouts) for p in pools))
+    out.counter("db_pool_slow_checkouts_total", "Checkouts over DB_POOL_SLOW_CHECKOUT_SECONDS.", (
+        ({"pool": p.name}, p.slow_checkouts) for p in pools
+    ))
+    out.counter("db_pool_timeouts_total", "Checkouts that hit DB_POOL_TIMEOUT.", (({"pool": p.name}, p.timeouts) for p in pools))
+    snapshots = [p.snapshot() for p in pools]
+    out.gauge("db_pool_checked_out", "Connections currently in use.", (({"pool": s["pool"]}, s["checked_out"]) for s in snapshots))
+    out.gauge("db_pool_overflow", "Connections opened beyond pool_size.", (({"pool": s["pool"]}, s["overflow"]) for s in snapshots))
+
+    caches = [("movie_count", estimated_count_cache.stats()), ("genre_list", genre_list_cache.stats())]
+    if movie_cache is not None:
+        caches.append(("movie_detail", movie_cache.stats()))
+    out.counter("cache_hits_total", "Cache lookups served from the cache.", (({"cache": n}, c["hits"]) for n, c in caches))
+    out.counter("cache_misses_total", "Cache lookups that went to the database.", (({"cache": n}, c["misses"]) for n, c in caches))
+    out.gauge("cache_hit_ratio", "Hits / lookups since start.", (({"cache": n}, c["hit_ratio"]) for n, c in caches))
+    out.gauge("cache_entries", "Entries currently cached.", (({"cache": n}, c["entries"]) for n, c in caches))
+
+    if rating_buffer is not None:
+        out.gauge("rating_buffer_depth", "Ratings waiting in the write-behind queue.", [({}, rating_buffer.depth)])
+        out.gauge("rating_buffer_pending", "Ratings accepted but not yet written.", [({}, rating_buffer.pending)])
+        out.counter("rating_buffer_flushed_total", "Ratings written by the flusher.", [({}, rating_buffer.flushed)])
+        out.counter("rating_buffer_dropped_total", "Ratings dropped by failed flushes.", [({}, rating_buffer.dropped)])
+        out.counter("rating_buffer_flush_retries_total", "Flush attempts retried after an error.", [({}, rating_buffer.retried)])
+        out.counter("rating_buffer_rejected_total", "Ratings rejected with 503 (queue full).", [({}, rating_buffer.rejected)])
+        out.histogram("rating_buffer_flush_seconds", "Duration of one flush.", [({}, rating_buffer.flush_seconds)])
+
+    out.counter("log_records_dropped_total", "Log records dropped because the log queue was full.", [
+        ({}, dropped_records())
+    ])
+
+    return PlainTextResponse(out.render(), media_type=PrometheusText.content_type)
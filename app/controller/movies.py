@@ -2,12 +2,25 @@ from app.core.logger import get_logger
 
 logger = get_logger("movie_rating")
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from starlette.responses import StreamingResponse
 from typing import Optional
 
-from app.dependencies import get_movie_service
-from app.schemas.schemas import MovieCreate, MovieResponse, MovieCreateResponse, MovieUpdate
-from app.services.movie_service import MovieService
+from app.core.http_cache import is_not_modified, not_modified
+from app.core.responses import FastJSONResponse
+from app.dependencies import get_movie_service, get_session_factory, run_service
+from app.schemas.schemas import (
+    MovieBatchCreate,
+    MovieBatchUpdate,
+    MovieCreate,
+    MovieCreateResponse,
+    MovieResponse,
+    MovieUpdate,
+)
+from app.services.catalog_export import MEDIA_TYPES, ExportFormat, accepts_gzip, parse_fields, stream_catalog
+from app.services.movie_service import CountStrategy, MovieService
 
 router = APIRouter()
 
@@ -29,49 +42,184 @@ router = APIRouter()
 #         genre_name=genre,
 #     )
 @router.get("/movies/", summary="List movies (filter & pagination)")
-def list_movies(
+async def list_movies(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     title: Optional[str] = Query(None),
     release_year: Optional[int] = Query(None),
     genre: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; overrides page"),
+    count: CountStrategy = Query("exact", description="How total_items is computed: exact, estimated or none"),
     service: MovieService = Depends(get_movie_service),
 ):
     logger.info(
-        "Fetching movies list "
-        f"(page={page}, page_size={page_size}, title={title}, "
-        f"release_year={release_year}, genre={genre}, route=/api/v1/movies)"
+        "Fetching movies list (page=%s, page_size=%s, title=%s, release_year=%s, genre=%s, "
+        "cursor=%s, count=%s, route=/api/v1/movies)",
+        page, page_size, title, release_year, genre, cursor, count,
     )
 
-    return service.get_movies_list(
+    return await movie_list_response(
+        request,
+        service,
         page=page,
         page_size=page_size,
         title=title,
         release_year=release_year,
         genre_name=genre,
+        cursor=cursor,
+        count=count,
+    )
+
+
+async def movie_list_response(request: Request, service: MovieService, **params):
+    """
+    Shared by the movie list routes (also /directors/{id}/movies and
+    /genres/{id}/movies): `params` go to MovieService.get_movies_list.
+    """
+    try:
+        # the narrow validators query only runs for a conditional request; a
+        # plain GET gets its ETag from the rows of the page itself
+        if "if-none-match" in request.headers:
+            validators = await run_service(service.get_movies_list_validators, **params)
+            if is_not_modified(request.headers, validators):
+                return not_modified(validators)
+
+        result, validators = await run_service(service.get_movies_list_with_validators, **params)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "failure",
+                "error": {"code": 400, "message": "Invalid cursor"},
+            },
+        )
+
+    return FastJSONResponse(result, headers=validators.headers())
+
+
+# declared before /movies/{movie_id} so "search" is not parsed as an id
+@router.get("/movies/search", summary="Search movies by title (ranked, highlighted)")
+async def search_movies(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    genre: Optional[str] = Query(None),
+    service: MovieService = Depends(get_movie_service),
+):
+    logger.info(
+        "Searching movies (q=%s, page=%s, page_size=%s, genre=%s, route=/api/v1/movies/search)",
+        q, page, page_size, genre,
+    )
+
+    result = await run_service(
+        service.search_movies,
+        text=q,
+        page=page,
+        page_size=page_size,
+        genre_name=genre,
+    )
+    return FastJSONResponse(result)
+
+
+@router.get("/movies/top", summary="Top-rated movies by damped average, overall or per genre")
+async def top_movies(
+    genre: Optional[str] = Query(None, description="Exact genre name (case-insensitive)"),
+    release_year: Optional[int] = Query(None),
+    min_votes: int = Query(1, ge=1, description="Only movies with at least this many ratings"),
+    limit: int = Query(10, ge=1, le=100),
+    service: MovieService = Depends(get_movie_service),
+):
+    logger.info(
+        "Fetching top movies (genre=%s, release_year=%s, min_votes=%s, limit=%s, route=/api/v1/movies/top)",
+        genre, release_year, min_votes, limit,
+    )
+
+    result = await run_service(
+        service.get_top_movies,
+        limit=limit,
+        genre_name=genre,
+        release_year=release_year,
+        min_votes=min_votes,
+    )
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "status": "failure",
+                "error": {"code": 404, "message": f"Genre '{genre}' not found"},
+            },
+        )
+    return FastJSONResponse(result)
+
+
+@router.get("/movies/export", summary="Stream the whole catalog as NDJSON or CSV")
+async def export_movies(
+    request: Request,
+    format: ExportFormat = Query("ndjson"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of the columns (default: all)"),
+    since: Optional[datetime] = Query(None, description="Only movies or ratings changed at or after this time"),
+    session_factory=Depends(get_session_factory),
+):
+    logger.info(
+        "Exporting movies (format=%s, fields=%s, since=%s, route=/api/v1/movies/export)", format, fields, since
+    )
+
+    try:
+        selected = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "failure",
+                "error": {"code": 400, "message": str(e)},
+            },
+        )
+
+    compress = accepts_gzip(request.headers.get("accept-encoding"))
+    headers = {
+        "Content-Disposition": f'attachment; filename="movies.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    # the body is produced while it is sent, from a server-side cursor (see stream_catalog)
+    return StreamingResponse(
+        stream_catalog(session_factory, selected, format, since=since, compress=compress),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
     )
 
 
 @router.get("/movies/{movie_id}", response_model=MovieResponse)
-def get_movie(
+async def get_movie(
     movie_id: int,
+    request: Request,
+    histogram: bool = Query(False, description="Include score_histogram (ratings per score 1-10)"),
     service: MovieService = Depends(get_movie_service),
 ):
-    movie = service.get_movie_by_id(movie_id)
+    # a 304 costs a cache hit or one primary-key lookup; the body is never built
+    validators = await run_service(service.get_movie_validators, movie_id)
+    if validators is not None and is_not_modified(request.headers, validators):
+        return not_modified(validators)
+
+    movie = await run_service(service.get_movie_by_id, movie_id, with_histogram=histogram)
     if not movie:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Movie with id {movie_id} not found",
         )
-    return movie
+    # already a MovieResponse: skip the response_model round trip
+    return FastJSONResponse(movie, headers=validators.headers() if validators else None)
 
 
 @router.post("/movies/", response_model=MovieResponse, status_code=status.HTTP_201_CREATED)
-def create_movie(
+async def create_movie(
     movie_data: MovieCreate,
     service: MovieService = Depends(get_movie_service),
 ):
-    created_movie = service.create_movie(
+    created_movie = await run_service(
+        service.create_movie,
         title=movie_data.title,
         director_id=movie_data.director_id,
         release_year=movie_data.release_year,
@@ -85,7 +233,47 @@ def create_movie(
             detail="Invalid director_id or genre_ids",
         )
 
-    return created_movie
+    return FastJSONResponse(created_movie, status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/movies:batch", summary="Create many movies in one transaction")
+async def create_movies_batch(
+    payload: MovieBatchCreate,
+    service: MovieService = Depends(get_movie_service),
+):
+    logger.info("Movie batch create received (items=%s, route=/api/v1/movies:batch)", len(payload.items))
+
+    try:
+        result = await run_service(service.create_movies_batch, [item.model_dump() for item in payload.items])
+    except Exception:
+        logger.error("Failed to create movie batch (items=%s)", len(payload.items), exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    logger.info(
+        "Movie batch created (created=%s, failed=%s)", result["data"]["created"], result["data"]["failed"]
+    )
+    return FastJSONResponse(result)
+
+
+@router.put("/movies:batch", summary="Update many movies in one transaction")
+async def update_movies_batch(
+    payload: MovieBatchUpdate,
+    service: MovieService = Depends(get_movie_service),
+):
+    logger.info("Movie batch update received (items=%s, route=/api/v1/movies:batch)", len(payload.items))
+
+    try:
+        result = await run_service(
+            service.update_movies_batch, [item.model_dump(exclude_unset=True) for item in payload.items]
+        )
+    except Exception:
+        logger.error("Failed to update movie batch (items=%s)", len(payload.items), exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    logger.info(
+        "Movie batch updated (updated=%s, failed=%s)", result["data"]["updated"], result["data"]["failed"]
+    )
+    return FastJSONResponse(result)
 
 
 @router.put("/movies/{movie_id}/", response_model=MovieCreateResponse)
@@ -96,7 +284,7 @@ async def update_movie(
 ):
     try:
         movie_data = movie.model_dump(exclude_unset=True)
-        result = service.update_movie(movie_id, movie_data)
+        result = await run_service(service.update_movie, movie_id, movie_data)
 
         if result is None:
             raise HTTPException(
@@ -107,12 +295,12 @@ async def update_movie(
                 },
             )
 
-        return MovieCreateResponse(status="success", data=result)
+        return FastJSONResponse({"status": "success", "data": result})
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Controller error: {e}")
+    except Exception:
+        logger.error("Movie update failed (movie_id=%s, route=/api/v1/movies/{movie_id}/)", movie_id, exc_info=True)
         raise HTTPException(
             status_code=422,
             detail={
@@ -123,11 +311,11 @@ async def update_movie(
 
 
 @router.delete("/movies/{movie_id}/", status_code=status.HTTP_204_NO_CONTENT, summary="Delete a movie")
-def delete_movie(
+async def delete_movie(
     movie_id: int,
     service: MovieService = Depends(get_movie_service),
 ):
-    deleted = service.delete_movie(movie_id)
+    deleted = await run_service(service.delete_movie, movie_id)
 
     if not deleted:
         raise HTTPException(
@@ -3,9 +3,14 @@ from app.core.logger import get_logger
 logger = get_logger("movie_rating")
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
-from app.repositories.movie_repository import MovieRepository, get_movie_repository
-from app.schemas.schemas import RatingCreate, RatingResponse
+from app.core.responses import FastJSONResponse
+from app.dependencies import get_movie_service, run_service
+from app.schemas.schemas import RatingBatchCreate, RatingCreate, RatingResponse
+from app.services.movie_service import MovieService
+from app.services.rating_buffer import RatingBufferFull, rating_buffer
 
 router = APIRouter(prefix="/movies")
 
@@ -25,29 +30,45 @@ router = APIRouter(prefix="/movies")
 #         "data": RatingResponse.model_validate(rating).model_dump(),
 #     }
 @router.post("/{movie_id}/ratings", status_code=201)
-def create_rating(
+async def create_rating(
     movie_id: int,
     payload: RatingCreate,
-    movie_repo: MovieRepository = Depends(get_movie_repository),
+    service: MovieService = Depends(get_movie_service),
 ):
-    route = f"/api/v1/movies/{movie_id}/ratings"
-
     # ✅ INFO — شروع ثبت امتیاز
     logger.info(
-        "Rating movie "
-        f"(movie_id={movie_id}, rating={payload.score}, route={route})"
+        "Rating movie (movie_id=%s, rating=%s, route=/api/v1/movies/{movie_id}/ratings)",
+        movie_id, payload.score,
     )
 
     # ✅ WARNING — امتیاز نامعتبر
     if payload.score < 1 or payload.score > 10:
         logger.warning(
-            "Invalid rating value "
-            f"(movie_id={movie_id}, rating={payload.score}, route={route})"
+            "Invalid rating value (movie_id=%s, rating=%s, route=/api/v1/movies/{movie_id}/ratings)",
+            movie_id, payload.score,
         )
         raise HTTPException(status_code=400, detail="Invalid rating value")
 
+    # ✅ write-behind: queue the rating and let the flusher insert it in a batch
+    if rating_buffer is not None:
+        if not await run_service(service.movie_exists, movie_id):
+            raise HTTPException(status_code=404, detail=f"Movie with id {movie_id} not found.")
+        try:
+            # may block up to the put timeout under backpressure, so off the event loop
+            queued = await run_in_threadpool(rating_buffer.submit, movie_id, payload.score)
+        except RatingBufferFull:
+            logger.warning("Rating buffer full (movie_id=%s, depth=%s)", movie_id, rating_buffer.depth)
+            raise HTTPException(status_code=503, detail="Rating queue is full, retry later",
+                                headers={"Retry-After": "1"})
+        if queued:
+            return JSONResponse(
+                status_code=202,
+                content={"status": "accepted", "data": {"movie_id": movie_id, "score": payload.score}},
+            )
+        # past the sync threshold: fall through to a synchronous write
+
     try:
-        rating = movie_repo.add_rating(movie_id=movie_id, score=payload.score)
+        rating = await run_service(service.add_rating, movie_id=movie_id, score=payload.score)
 
         if rating is None:
             raise HTTPException(
@@ -56,10 +77,7 @@ def create_rating(
             )
 
         # ✅ INFO — موفق
-        logger.info(
-            "Rating saved successfully "
-            f"(movie_id={movie_id}, rating={payload.score})"
-        )
+        logger.info("Rating saved successfully (movie_id=%s, rating=%s)", movie_id, payload.score)
 
         return {
             "status": "success",
@@ -72,8 +90,40 @@ def create_rating(
     except Exception:
         # ✅ ERROR — خطای سیستمی
         logger.error(
-            "Failed to save rating "
-            f"(movie_id={movie_id}, rating={payload.score})",
-            exc_info=True
+            "Failed to save rating (movie_id=%s, rating=%s)", movie_id, payload.score, exc_info=True
         )
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{movie_id}/ratings/histogram", summary="Number of ratings per score (1-10)")
+async def get_rating_histogram(
+    movie_id: int,
+    service: MovieService = Depends(get_movie_service),
+):
+    # read from the per-movie counters, never from movie_ratings
+    histogram = await run_service(service.get_score_histogram, movie_id)
+    if histogram is None:
+        raise HTTPException(status_code=404, detail=f"Movie with id {movie_id} not found.")
+    return FastJSONResponse({"status": "success", "data": histogram})
+
+
+@router.post("/ratings:batch", summary="Add many ratings in one transaction")
+async def create_ratings_batch(
+    payload: RatingBatchCreate,
+    service: MovieService = Depends(get_movie_service),
+):
+    logger.info("Rating batch received (items=%s, route=/api/v1/movies/ratings:batch)", len(payload.items))
+
+    try:
+        result = await run_service(
+            service.add_ratings_batch,
+            [(item.movie_id, item.score) for item in payload.items],
+        )
+    except Exception:
+        logger.error("Failed to save rating batch (items=%s)", len(payload.items), exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    logger.info(
+        "Rating batch saved (created=%s, failed=%s)", result["data"]["created"], result["data"]["failed"]
+    )
+    return FastJSONResponse(result)
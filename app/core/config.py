@@ -0,0 +1,119 @@
+import os
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+# --- Movie list ---
+# How long an `estimated` total_items is reused for the same filters
+COUNT_CACHE_TTL_SECONDS = _env_float("COUNT_CACHE_TTL_SECONDS", 60.0)
+
+# --- Database ---
+# Serve routes from an AsyncSession (asyncpg) instead of the sync engine + threadpool
+DB_ASYNC = _env_bool("DB_ASYNC", False)
+
+# Connection pool (per worker process). When DB_MAX_CONNECTIONS is set, it is the
+# budget for the whole deployment and is split across WEB_CONCURRENCY workers.
+WEB_CONCURRENCY = max(1, _env_int("WEB_CONCURRENCY", 1))
+DB_MAX_CONNECTIONS = _env_int("DB_MAX_CONNECTIONS", 0)
+DB_POOL_SIZE = _env_int(
+    "DB_POOL_SIZE", max(1, DB_MAX_CONNECTIONS // WEB_CONCURRENCY) if DB_MAX_CONNECTIONS else 5
+)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 0 if DB_MAX_CONNECTIONS else 10)
+DB_POOL_TIMEOUT = _env_float("DB_POOL_TIMEOUT", 30.0)
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+# Checkouts waiting at least this long are logged as warnings
+DB_POOL_SLOW_CHECKOUT_SECONDS = _env_float("DB_POOL_SLOW_CHECKOUT_SECONDS", 0.1)
+
+# Per-request SQL statistics: X-DB-Queries / X-DB-Time headers and a log line per request
+DB_QUERY_STATS_ENABLED = _env_bool("DB_QUERY_STATS_ENABLED", True)
+# Strict mode flags (logs a warning and sets X-DB-Violations) any lazy load and any
+# request issuing more than DB_QUERY_BUDGET statements (0 disables the budget)
+DB_QUERY_STRICT = _env_bool("DB_QUERY_STRICT", False)
+DB_QUERY_BUDGET = _env_int("DB_QUERY_BUDGET", 10)
+
+# --- Logging ---
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# json (one object per line) or text
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").strip().lower()
+LOG_FILE = os.getenv("LOG_FILE", "logs/app.log")
+# Records waiting for the background writer; when full, new records are dropped
+LOG_QUEUE_SIZE = _env_int("LOG_QUEUE_SIZE", 10000)
+# Hot INFO lines: keep this fraction (per record), and at most LOG_INFO_RATE_LIMIT
+# records per second per message template (0 = unlimited). WARNING and above always pass.
+LOG_INFO_SAMPLE_RATE = _env_float("LOG_INFO_SAMPLE_RATE", 1.0)
+LOG_INFO_RATE_LIMIT = _env_int("LOG_INFO_RATE_LIMIT", 0)
+# Add file/line/function, thread and process to every log line
+LOG_CALLER_INFO = _env_bool("LOG_CALLER_INFO", False)
+
+# --- Telemetry ---
+# Per-route request counts and latency histograms, served in Prometheus format on /metrics
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+# /metrics and /internal/* only answer "Authorization: Bearer <INTERNAL_API_TOKEN>";
+# while it is unset they return 404
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN", "")
+
+# --- Movies ---
+# Upper bound on items accepted by POST/PUT /api/v1/movies:batch
+MOVIE_BATCH_MAX_ITEMS = _env_int("MOVIE_BATCH_MAX_ITEMS", 1000)
+
+# GET /api/v1/movies/export: rows fetched per server-side cursor round trip (and per
+# chunk written), and the gzip level used when the client accepts gzip
+EXPORT_BATCH_SIZE = _env_int("EXPORT_BATCH_SIZE", 1000)
+EXPORT_GZIP_LEVEL = _env_int("EXPORT_GZIP_LEVEL", 6)
+
+# --- Reference data (genres, directors) ---
+# In-process id -> name maps used for create/update validation and response building.
+# A background thread checks row count / max id every CHECK_SECONDS and reloads on
+# change, and reloads unconditionally every TTL_SECONDS (catches renames).
+REFERENCE_CACHE_ENABLED = _env_bool("REFERENCE_CACHE_ENABLED", True)
+REFERENCE_CACHE_CHECK_SECONDS = _env_float("REFERENCE_CACHE_CHECK_SECONDS", 30.0)
+REFERENCE_CACHE_TTL_SECONDS = _env_float("REFERENCE_CACHE_TTL_SECONDS", 600.0)
+# GET /api/v1/genres pages (genres with movie counts and average ratings) are
+# reused for this long; movie and rating writes in the same process drop them
+GENRE_LIST_CACHE_TTL_SECONDS = _env_float("GENRE_LIST_CACHE_TTL_SECONDS", 60.0)
+
+# --- Ratings ---
+# Leaderboards rank by a damped average: every movie counts PRIOR_VOTES extra
+# votes at PRIOR_MEAN. Stored per movie, so rerun scripts.backfill_rating_stats
+# after changing either.
+LEADERBOARD_PRIOR_MEAN = _env_float("LEADERBOARD_PRIOR_MEAN", 5.5)
+LEADERBOARD_PRIOR_VOTES = _env_int("LEADERBOARD_PRIOR_VOTES", 10)
+
+# Upper bound on items accepted by POST /api/v1/movies/ratings:batch
+RATING_BATCH_MAX_ITEMS = _env_int("RATING_BATCH_MAX_ITEMS", 10000)
+
+# Write-behind rating buffer: POST /movies/{id}/ratings returns 202 and a background
+# flusher inserts queued ratings in batches every RATING_BUFFER_FLUSH_MS or MAX_BATCH rows
+RATING_BUFFER_ENABLED = _env_bool("RATING_BUFFER_ENABLED", False)
+RATING_BUFFER_FLUSH_MS = _env_int("RATING_BUFFER_FLUSH_MS", 200)
+RATING_BUFFER_MAX_BATCH = _env_int("RATING_BUFFER_MAX_BATCH", 1000)
+# Bounded queue: when full, requests wait up to PUT_TIMEOUT_MS and then get 503
+RATING_BUFFER_MAX_SIZE = _env_int("RATING_BUFFER_MAX_SIZE", 10000)
+RATING_BUFFER_PUT_TIMEOUT_MS = _env_int("RATING_BUFFER_PUT_TIMEOUT_MS", 100)
+# From this queue depth on, ratings are written synchronously instead of queued
+RATING_BUFFER_SYNC_THRESHOLD = _env_int("RATING_BUFFER_SYNC_THRESHOLD", 8000)
+# A failed flush is retried this many times, waiting RETRY_BACKOFF_MS, then twice
+# that, ...; a constraint error switches to row-by-row inserts instead
+RATING_BUFFER_FLUSH_RETRIES = _env_int("RATING_BUFFER_FLUSH_RETRIES", 3)
+RATING_BUFFER_RETRY_BACKOFF_MS = _env_int("RATING_BUFFER_RETRY_BACKOFF_MS", 100)
+
+# --- Movie detail cache (GET /api/v1/movies/{movie_id}) ---
+MOVIE_CACHE_ENABLED = _env_bool("MOVIE_CACHE_ENABLED", True)
+MOVIE_CACHE_MAX_ENTRIES = _env_int("MOVIE_CACHE_MAX_ENTRIES", 10000)
+MOVIE_CACHE_TTL_SECONDS = _env_float("MOVIE_CACHE_TTL_SECONDS", 60.0)
@@ -0,0 +1,66 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+class Validators(BaseModel):
+    """ETag / Last-Modified of a representation, computed without building it."""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    def headers(self) -> Dict[str, str]:
+        # no-cache: clients may store the body but must revalidate before reuse
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(_as_utc(self.last_modified), usegmt=True)
+        return headers
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive UTC timestamps
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the repr of `parts` (same parts -> same tag)."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def latest(values: Iterable[Optional[datetime]]) -> Optional[datetime]:
+    present = [_as_utc(v) for v in values if v is not None]
+    return max(present) if present else None
+
+
+def is_not_modified(request_headers: Mapping[str, str], validators: Validators) -> bool:
+    """
+    RFC 9110 evaluation for GET: If-None-Match (weak comparison) wins;
+    If-Modified-Since is only consulted when it is absent.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        opaque = validators.etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and validators.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return _as_utc(validators.last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def not_modified(validators: Validators) -> Response:
+    return Response(status_code=304, headers=validators.headers())
@@ -14,35 +14,198 @@
 #         logger.addHandler(handler)
 
 #     return logger
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import (
+    LOG_CALLER_INFO,
+    LOG_FILE,
+    LOG_FORMAT,
+    LOG_INFO_RATE_LIMIT,
+    LOG_INFO_SAMPLE_RATE,
+    LOG_LEVEL,
+    LOG_QUEUE_SIZE,
+)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+CALLER_TEXT_FORMAT = (
+    "%(asctime)s - %(name)s - %(levelname)s - %(pathname)s:%(lineno)d %(funcName)s "
+    "[%(processName)s/%(threadName)s] - %(message)s"
+)
+
+# attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, message, `extra` fields,
+    exc_info. With `caller_info` also file, line, func, thread and process.
+    """
+
+    def __init__(self, caller_info: bool = False):
+        super().__init__()
+        self.caller_info = caller_info
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if self.caller_info:
+            entry.update(
+                file=record.pathname,
+                line=record.lineno,
+                func=record.funcName,
+                thread=record.threadName,
+                process=record.processName,
+            )
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class HotLineFilter(logging.Filter):
+    """
+    Sampling and per-template rate limiting for INFO and below; warnings and
+    errors always pass. A record can set its own rate with
+    extra={"sample_rate": 0.01}. The rate limit is keyed by the unformatted
+    message template, so call sites must use %-style arguments, not f-strings.
+    The first record let through after a throttled second carries
+    `suppressed` (records dropped in that second). Counters are not locked:
+    under concurrency the limit is approximate, which is fine for logs.
+    """
+
+    MAX_TEMPLATES = 1024
+
+    def __init__(self, sample_rate: float = 1.0, rate_limit: int = 0):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.rate_limit = rate_limit
+        # (logger, template) -> [second, emitted, suppressed]
+        self._windows: Dict[Tuple[str, str], List[int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = getattr(record, "sample_rate", self.sample_rate)
+        if rate < 1.0 and random.random() >= rate:
+            return False
+        if not self.rate_limit:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = int(time.monotonic())
+        window = self._windows.get(key)
+        if window is None or window[0] != now:
+            if window is not None and window[2]:
+                record.suppressed = window[2]
+            if len(self._windows) >= self.MAX_TEMPLATES:
+                self._windows.clear()
+            window = self._windows[key] = [now, 0, 0]
+        if window[1] >= self.rate_limit:
+            window[2] += 1
+            return False
+        window[1] += 1
+        return True
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    Hands records to a bounded in-process queue without blocking the caller.
+    The record is queued as is: %-formatting, JSON encoding and all I/O
+    happen on the listener thread. When the queue is full the record is
+    dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _build_formatter() -> logging.Formatter:
+    if LOG_FORMAT == "json":
+        return JsonFormatter(caller_info=LOG_CALLER_INFO)
+    return logging.Formatter(CALLER_TEXT_FORMAT if LOG_CALLER_INFO else TEXT_FORMAT)
+
+
+def _build_output_handlers() -> List[logging.Handler]:
+    formatter = _build_formatter()
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    log_path = Path(LOG_FILE)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    file_handler = RotatingFileHandler(
+        log_path,
+        maxBytes=5 * 1024 * 1024,  # 5 MB
+        backupCount=3,
+    )
+    file_handler.setFormatter(formatter)
+    return [console_handler, file_handler]
+
+
+_setup_lock = threading.Lock()
+_queue_handler: Optional[BackgroundQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _get_queue_handler() -> BackgroundQueueHandler:
+    """Process-wide queue handler; the listener thread owns the real handlers."""
+    global _queue_handler, _listener
+    with _setup_lock:
+        if _queue_handler is None:
+            handler = BackgroundQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+            handler.addFilter(HotLineFilter(LOG_INFO_SAMPLE_RATE, LOG_INFO_RATE_LIMIT))
+            _listener = QueueListener(handler.queue, *_build_output_handlers(), respect_handler_level=True)
+            _listener.start()
+            atexit.register(stop_logging)
+            _queue_handler = handler
+        return _queue_handler
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread (idempotent)."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
 
 
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
 
     if not logger.handlers:
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-
-        # ✅ Console handler (همونی که الان داری)
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-
-        # ✅ File handler
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
-
-        file_handler = RotatingFileHandler(
-            log_dir / "app.log",
-            maxBytes=5 * 1024 * 1024,  # 5 MB
-            backupCount=3,
-        )
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        logger.setLevel(LOG_LEVEL)
+        logger.addHandler(_get_queue_handler())
 
     return logger
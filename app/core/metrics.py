@@ -0,0 +1,142 @@
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Default latency buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Pre-bucketed histogram: observe() is a bisect plus two additions, no lock.
+    Counts are per bucket; snapshot() reports them cumulatively (Prometheus style).
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, hits in zip(self.buckets + (float("inf"),), self.counts):
+            running += hits
+            cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+        return {"count": self.count, "sum": round(self.sum, 6), "buckets": cumulative}
+
+
+# Statements per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RouteMetrics:
+    """Counters and histograms for one (method, route template) pair."""
+
+    def __init__(self):
+        self.statuses: Dict[int, int] = {}
+        self.latency = Histogram()
+        self.db_seconds = Histogram()
+        self.db_queries = Histogram(buckets=QUERY_COUNT_BUCKETS)
+
+
+class RequestMetrics:
+    """
+    Per-route request metrics. observe() is only called from the event loop
+    thread (by MetricsMiddleware), so plain dict and integer updates need no
+    lock; readers may see a snapshot that is one request behind.
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        db_seconds: Optional[float] = None,
+        db_queries: Optional[int] = None,
+    ) -> None:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+        metrics.latency.observe(seconds)
+        if db_seconds is not None:
+            metrics.db_seconds.observe(db_seconds)
+        if db_queries is not None:
+            metrics.db_queries.observe(db_queries)
+
+
+# Process-wide registry, fed by MetricsMiddleware and served on /metrics
+request_metrics = RequestMetrics()
+
+
+Labels = Dict[str, Any]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class PrometheusText:
+    """Builds a Prometheus text exposition (format 0.0.4), one metric family at a time."""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def _header(self, name: str, kind: str, help_text: str) -> None:
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, kind: str, help_text: str, samples: Iterable[Tuple[Labels, Optional[float]]]) -> None:
+        """One counter or gauge family; samples with a None value are skipped."""
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples:
+            return
+        self._header(name, kind, help_text)
+        for labels, value in samples:
+            self.lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def counter(self, name: str, help_text: str, samples: Iterable[Tuple[Labels, Optional[float]]]) -> None:
+        self.sample(name, "counter", help_text, samples)
+
+    def gauge(self, name: str, help_text: str, samples: Iterable[Tuple[Labels, Optional[float]]]) -> None:
+        self.sample(name, "gauge", help_text, samples)
+
+    def histogram(self, name: str, help_text: str, series: Iterable[Tuple[Labels, Histogram]]) -> None:
+        series = [(labels, histogram) for labels, histogram in series if histogram.count]
+        if not series:
+            return
+        self._header(name, "histogram", help_text)
+        for labels, histogram in series:
+            running = 0
+            for bound, hits in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                running += hits
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                self.lines.append(f"{name}_bucket{bucket_labels} {running}")
+            self.lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+            self.lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
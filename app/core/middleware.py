@@ -0,0 +1,117 @@
+import logging
+import time
+
+from app.core.logger import get_logger
+from app.core.metrics import RequestMetrics
+from app.db import query_stats
+
+logger = get_logger("movie_rating")
+
+
+def route_template(scope) -> str:
+    """Matched route path (e.g. /api/v1/movies/{movie_id}), so ids do not explode cardinality."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task/stream overhead) that
+    counts the SQL a request issues. Adds X-DB-Queries and X-DB-Time
+    (milliseconds) to the response and logs one line per request with the
+    same figures as `extra` fields. In strict mode lazy loads and requests
+    over `budget` statements are logged as warnings and listed in
+    X-DB-Violations.
+    """
+
+    def __init__(self, app, strict: bool = False, budget: int = 0):
+        self.app = app
+        self.strict = strict
+        self.budget = budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = query_stats.start_request(self.strict)
+        status = 500
+
+        async def send_with_headers(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # dependencies (and their sessions) are closed before the response starts
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.statements).encode()))
+                headers.append((b"x-db-time", f"{stats.seconds * 1000:.3f}".encode()))
+                if self.strict:
+                    violations = stats.violations(self.budget)
+                    if violations:
+                        headers.append((b"x-db-violations", "; ".join(violations).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            self._log(scope, status, stats)
+
+    def _log(self, scope, status: int, stats: query_stats.QueryStats) -> None:
+        if self.strict:
+            violations = stats.violations(self.budget)
+            if violations:
+                fields = {"method": scope["method"], "route": route_template(scope), "status": status}
+                logger.warning(
+                    "DB strict mode violation (method=%s, route=%s, violations=%s)",
+                    fields["method"], fields["route"], violations,
+                    extra={**fields, **stats.log_fields(), "db_violations": violations},
+                )
+        # the hottest INFO line: skip building the fields when INFO is off
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        fields = {"method": scope["method"], "route": route_template(scope), "status": status, **stats.log_fields()}
+        logger.info(
+            "Request DB stats (method=%s, route=%s, status=%s, db_queries=%s, db_time_ms=%s)",
+            fields["method"], fields["route"], status, fields["db_queries"], fields["db_time_ms"],
+            extra=fields,
+        )
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware feeding RequestMetrics: request count per status,
+    latency, and DB time / statement count when QueryStatsMiddleware runs
+    outside it. Recording is a dict lookup and three histogram observes.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            stats = query_stats.current()
+            self.metrics.observe(
+                scope["method"],
+                route_template(scope),
+                status,
+                time.perf_counter() - start,
+                db_seconds=stats.seconds if stats is not None else None,
+                db_queries=stats.statements if stats is not None else None,
+            )
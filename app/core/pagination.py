@@ -0,0 +1,24 @@
+import base64
+import json
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Opaque keyset cursor pointing just after `last_id` (movies are ordered by id).
+    """
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Inverse of encode_cursor. Raises ValueError for anything it did not produce.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))["id"]
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError("Invalid cursor")
+    return last_id
@@ -0,0 +1,20 @@
+from typing import Any
+
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+# Built once: serializes dicts/lists/models in a single pydantic-core pass,
+# dispatching on each value's runtime type
+_ANY_ADAPTER = TypeAdapter(Any)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for payloads that are already validated models (or dicts /
+    lists of them). Returning it from a route skips FastAPI's response_model
+    re-validation and the jsonable_encoder walk; pydantic-core writes the
+    bytes directly.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return _ANY_ADAPTER.dump_json(content)
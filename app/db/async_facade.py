@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+class AsyncFacade(ABC):
+    """
+    Awaitable view of a sync repository/service bound to an AsyncSession.
+
+    Every public method of the wrapped object becomes a coroutine that runs the
+    sync implementation through AsyncSession.run_sync: the ORM code is shared
+    with the sync stack, but I/O goes through the async driver on the event
+    loop, so concurrency is bounded by the connection pool, not by threads.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    @abstractmethod
+    def build(db: Session) -> Any:
+        """The wrapped sync object for `db` (usually the sync class itself)."""
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return await self.session.run_sync(
+                lambda db: getattr(self.build(db), name)(*args, **kwargs)
+            )
+
+        call.__name__ = name
+        return call
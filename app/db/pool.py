@@ -0,0 +1,76 @@
+import time
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+
+from app.core.logger import get_logger
+from app.core.metrics import Histogram
+
+logger = get_logger("movie_rating")
+
+
+class PoolStats:
+    """
+    Live counters for one connection pool. Checkout wait time is measured
+    around the pool's internal get, i.e. it is the time a request spent
+    queueing for a connection (including opening a new one).
+    """
+
+    def __init__(self, name: str, slow_checkout_seconds: float):
+        self.name = name
+        self.slow_checkout_seconds = slow_checkout_seconds
+        self.pool: Optional[Pool] = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.slow_checkouts = 0
+        self.wait = Histogram()
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.pool
+        return {
+            "pool": self.name,
+            "size": pool.size() if pool is not None else None,
+            "checked_out": pool.checkedout() if pool is not None else None,
+            "checked_in": pool.checkedin() if pool is not None else None,
+            # SQLAlchemy reports overflow as negative until pool_size connections exist
+            "overflow": max(0, pool.overflow()) if pool is not None else None,
+            "checkouts": self.checkouts,
+            "slow_checkouts": self.slow_checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds": self.wait.snapshot(),
+        }
+
+
+def instrument_pool_class(pool_class: Type[Pool], stats: PoolStats) -> Type[Pool]:
+    """
+    Subclass of `pool_class` that records checkout waits into `stats` and logs
+    slow checkouts and pool timeouts together with the current pool state.
+    """
+
+    class InstrumentedPool(pool_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            stats.pool = self  # engine.dispose() recreates the pool
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                stats.timeouts += 1
+                logger.error("DB pool checkout timed out %s", stats.snapshot())
+                raise
+            finally:
+                waited = time.perf_counter() - start
+                stats.checkouts += 1
+                stats.wait.observe(waited)
+                if waited >= stats.slow_checkout_seconds:
+                    stats.slow_checkouts += 1
+                    logger.warning(
+                        "Slow DB pool checkout (waited=%.3fs, pool=%s, checked_out=%s, overflow=%s)",
+                        waited, stats.name, self.checkedout(), max(0, self.overflow()),
+                    )
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
@@ -0,0 +1,105 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+
+class QueryStats:
+    """
+    SQL statements issued on behalf of one request: count, total time spent
+    in the driver and the slowest statement. In strict mode lazy loads are
+    recorded too (they are the usual source of N+1 queries).
+    """
+
+    def __init__(self, strict: bool = False):
+        self.strict = strict
+        self.statements = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.lazy_loads: List[str] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def violations(self, budget: int) -> List[str]:
+        found = [f"lazy load of {path}" for path in self.lazy_loads]
+        if budget and self.statements > budget:
+            found.append(f"{self.statements} statements (budget {budget})")
+        return found
+
+    def log_fields(self) -> Dict[str, Any]:
+        return {
+            "db_queries": self.statements,
+            "db_time_ms": round(self.seconds * 1000, 3),
+            "db_slowest_ms": round(self.slowest_seconds * 1000, 3),
+            # one line is enough to identify the statement
+            "db_slowest": " ".join(self.slowest_statement.split())[:200] if self.slowest_statement else None,
+        }
+
+
+# Set by QueryStatsMiddleware for the duration of a request. Context variables
+# follow the request into the threadpool (sync routes, run_service) and into
+# SQLAlchemy's greenlets (async stack); background threads such as the rating
+# buffer flusher see None and are not counted.
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request(strict: bool = False) -> QueryStats:
+    stats = QueryStats(strict)
+    _current.set(stats)
+    return stats
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_stats_start")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(exception_context):
+    # a failed statement never reaches after_cursor_execute
+    started = exception_context.connection.info.get("query_stats_start") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def _do_orm_execute(orm_execute_state: ORMExecuteState):
+    stats = _current.get()
+    if stats is None or not stats.strict or not orm_execute_state.is_select:
+        return
+    instance = orm_execute_state.lazy_loaded_from
+    if instance is None:
+        return
+    # e.g. "Movie.director" for movie.director touched without a loader option
+    path = orm_execute_state.loader_strategy_path
+    attribute = getattr(path[-1], "key", "?") if path is not None and len(path) else "?"
+    stats.lazy_loads.append(f"{instance.class_.__name__}.{attribute}")
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements run by `engine` into the current request's stats (async: pass .sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+# AsyncSession runs on a sync Session, so one class-level hook covers both stacks
+event.listen(Session, "do_orm_execute", _do_orm_execute)
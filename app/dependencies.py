@@ -1,14 +1,21 @@
-from fastapi import Depends
-from sqlalchemy.orm import Session
+import inspect
+import secrets
+from typing import Optional
 
-from app.db.database import get_db
-from app.repositories.movie_repository import MovieRepository
+from fastapi import Depends, Header, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import DB_ASYNC, INTERNAL_API_TOKEN
+from app.db.database import AsyncSessionLocal, SessionLocal, get_async_db, get_db
+from app.repositories.movie_repository import AsyncMovieRepository, MovieRepository
 from app.repositories.director_repository import DirectorRepository
 from app.repositories.genre_repository import GenreRepository
-from app.services.movie_service import MovieService
+from app.services.movie_service import AsyncMovieService, MovieService
 
 
-def get_movie_service(db: Session = Depends(get_db)) -> MovieService:
+def _get_sync_movie_service(db: Session = Depends(get_db)) -> MovieService:
     """
     ✅ فقط این تابع db می‌بینه
     همه Repository ها رو می‌سازه و به Service تزریق می‌کنه
@@ -24,3 +31,66 @@ def get_movie_service(db: Session = Depends(get_db)) -> MovieService:
         director_repo=director_repo,
         genre_repo=genre_repo
     )
+
+
+async def _get_async_movie_service(session: AsyncSession = Depends(get_async_db)) -> AsyncMovieService:
+    return AsyncMovieService(session)
+
+
+def _get_sync_movie_repository(db: Session = Depends(get_db)) -> MovieRepository:
+    return MovieRepository(db)
+
+
+async def _get_async_movie_repository(session: AsyncSession = Depends(get_async_db)) -> AsyncMovieRepository:
+    return AsyncMovieRepository(session)
+
+
+def _get_sync_session_factory() -> sessionmaker:
+    return SessionLocal
+
+
+def _get_async_session_factory() -> async_sessionmaker:
+    return AsyncSessionLocal
+
+
+def require_internal_token(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Guards the operational routes (/metrics, /internal/*): 404 while
+    INTERNAL_API_TOKEN is unset, 401 unless the request sends
+    "Authorization: Bearer <INTERNAL_API_TOKEN>".
+    """
+    if not INTERNAL_API_TOKEN:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "status": "failure",
+                "error": {"code": 404, "message": "Not Found"},
+            },
+        )
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.strip().encode(), INTERNAL_API_TOKEN.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail={
+                "status": "failure",
+                "error": {"code": 401, "message": "Invalid or missing internal API token"},
+            },
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+# DB_ASYNC picks the stack once at import time; routes depend on these names only
+get_movie_service = _get_async_movie_service if DB_ASYNC else _get_sync_movie_service
+get_movie_repository = _get_async_movie_repository if DB_ASYNC else _get_sync_movie_repository
+# for work that outlives the request (streamed exports): the route opens its own sessions
+get_session_factory = _get_async_session_factory if DB_ASYNC else _get_sync_session_factory
+
+
+async def run_service(fn, *args, **kwargs):
+    """
+    Call a service/repository method from an async route: async facades are
+    awaited on the event loop, sync implementations go to the threadpool.
+    """
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args, **kwargs)
+    return await run_in_threadpool(fn, *args, **kwargs)
@@ -1,10 +1,67 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from app.controller.internal import metrics_router, router as internal_router
 from app.controller.router import api_router
+from app.core.config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_QUERY_BUDGET,
+    DB_QUERY_STATS_ENABLED,
+    DB_QUERY_STRICT,
+    METRICS_ENABLED,
+    WEB_CONCURRENCY,
+)
+from app.core.logger import get_logger
+from app.core.metrics import request_metrics
+from app.core.middleware import MetricsMiddleware, QueryStatsMiddleware
+from app.db.database import async_engine, engine
+from app.services.rating_buffer import rating_buffer
+from app.services.reference_cache import reference_cache
+
+logger = get_logger("movie_rating")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info(
+        "DB pool configured (size=%s, max_overflow=%s, timeout=%ss, recycle=%ss, pre_ping=%s, workers=%s)",
+        DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING, WEB_CONCURRENCY,
+    )
+    if rating_buffer is not None:
+        rating_buffer.start()
+    if reference_cache is not None:
+        # first load is a blocking query: keep it off the event loop
+        await run_in_threadpool(reference_cache.start)
+    yield
+    if reference_cache is not None:
+        await run_in_threadpool(reference_cache.stop)
+    # flush queued ratings before the pool goes away
+    if rating_buffer is not None:
+        await run_in_threadpool(rating_buffer.stop)
+    # release pooled connections on shutdown
+    engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
-app = FastAPI()
+# the last middleware added runs outermost: QueryStatsMiddleware wraps MetricsMiddleware,
+# so the request's DB stats are complete when the metrics are recorded
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+if DB_QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware, strict=DB_QUERY_STRICT, budget=DB_QUERY_BUDGET)
 
 # Include API router
 app.include_router(api_router)
+app.include_router(internal_router)
+app.include_router(metrics_router)
 
 
 @app.get("/")
@@ -1,14 +1,29 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Table
+from sqlalchemy import DDL, BigInteger, Column, DateTime, Float, Index, Integer, String, ForeignKey, Text, Table, func, literal_column, text
+from sqlalchemy import event
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
+# The trigram indexes below need pg_trgm; create_all() sets it up the same way
+# the search-index migration does
+event.listen(
+    Base.metadata, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 # --- Association Table for Many-to-Many relationship (Movies <-> Genres) ---
 # Defined in the docs as 'movie_genres' with a composite primary key.
 movie_genres = Table(
     'movie_genres',
     Base.metadata,
     Column('movie_id', Integer, ForeignKey('movies.id'), primary_key=True),
-    Column('genre_id', Integer, ForeignKey('genres.id'), primary_key=True)
+    Column('genre_id', Integer, ForeignKey('genres.id'), primary_key=True, index=True),
+    # copy of movie_rating_stats.bayesian_score, so each genre has its own ranked index
+    Column('bayesian_score', Float, nullable=True),
+)
+# per-genre leaderboard: walk one genre's links best-first
+Index(
+    'ix_movie_genres_genre_id_bayesian_score',
+    movie_genres.c.genre_id, movie_genres.c.bayesian_score.desc(), movie_genres.c.movie_id,
 )
 
 # --- Director Model ---
@@ -19,6 +34,7 @@ class Director(Base):
     name = Column(String, nullable=False)
     birth_year = Column(Integer, nullable=True)
     description = Column(Text, nullable=True)
+    tmdb_id = Column(Integer, nullable=True, unique=True, index=True)  # external id for idempotent imports
 
     # Relationship: One Director -> Many Movies
     movies = relationship("Movie", back_populates="director")
@@ -30,19 +46,33 @@ class Genre(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
     description = Column(Text, nullable=True)
+    tmdb_id = Column(Integer, nullable=True, unique=True, index=True)
 
     # Relationship: Many Genres <-> Many Movies (via Association Table)
     movies = relationship("Movie", secondary=movie_genres, back_populates="genres")
 
+    __table_args__ = (
+        # trigram search (pg_trgm, migration b81e4c0d9a27); PostgreSQL only
+        Index(
+            "ix_genres_name_trgm", name,
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
 # --- Movie Model ---
 class Movie(Base):
     __tablename__ = "movies"
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)
-    release_year = Column(Integer, nullable=False)
+    release_year = Column(Integer, nullable=False, index=True)
     cast = Column(String, nullable=True)  # Stores actor names as a string
-    director_id = Column(Integer, ForeignKey("directors.id"), nullable=False)
+    director_id = Column(Integer, ForeignKey("directors.id"), nullable=False, index=True)
+    tmdb_id = Column(Integer, nullable=True, unique=True, index=True)
+
+    # Bumped on every update; ratings are tracked by movie_rating_stats (see ETags)
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     # Relationships
     director = relationship("Director", back_populates="movies")
@@ -52,13 +82,70 @@ class Movie(Base):
     # cascade="all, delete" ensures ratings are deleted if the movie is deleted
     ratings = relationship("Rating", back_populates="movie", cascade="all, delete-orphan")
 
+    # Relationship: One Movie -> One pre-aggregated rating summary
+    rating_stats = relationship(
+        "MovieRatingStats", back_populates="movie", uselist=False, cascade="all, delete-orphan"
+    )
+
+    __table_args__ = (
+        # search indexes (migration b81e4c0d9a27); PostgreSQL only. The
+        # tsvector expression must match MovieRepository.search exactly
+        Index(
+            "ix_movies_title_trgm", title,
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_movies_title_tsv", func.to_tsvector(literal_column("'simple'::regconfig"), title),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+
 # --- Rating Model ---
 class Rating(Base):
     __tablename__ = "movie_ratings"
 
     id = Column(Integer, primary_key=True, index=True)
     score = Column(Integer, nullable=False)  # Business logic will validate 1-10 range
-    movie_id = Column(Integer, ForeignKey("movies.id"), nullable=False)
+    movie_id = Column(Integer, ForeignKey("movies.id"), nullable=False, index=True)
 
     # Relationship to Movie
-    movie = relationship("Movie", back_populates="ratings")
\ No newline at end of file
+    movie = relationship("Movie", back_populates="ratings")
+
+# --- Movie Rating Stats Model ---
+# One row per movie, maintained by MovieRepository in the same transaction as
+# every rating write, so responses never have to scan movie_ratings.
+class MovieRatingStats(Base):
+    __tablename__ = "movie_rating_stats"
+
+    movie_id = Column(Integer, ForeignKey("movies.id"), primary_key=True)
+    ratings_sum = Column(BigInteger, nullable=False, default=0)
+    ratings_count = Column(Integer, nullable=False, default=0)
+    min_score = Column(Integer, nullable=True)
+    max_score = Column(Integer, nullable=True)
+    # ratings per score (histogram), see SCORE_COLUMNS
+    score_1 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    score_2 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    score_3 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    score_4 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    score_5 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    score_6 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    score_7 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    score_8 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    score_9 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    score_10 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    # damped average used for leaderboards (NULL without ratings)
+    bayesian_score = Column(Float, nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    # Relationship to Movie
+    movie = relationship("Movie", back_populates="rating_stats")
+
+    __table_args__ = (
+        # overall leaderboard
+        Index("ix_movie_rating_stats_bayesian_score", bayesian_score.desc(), movie_id),
+    )
+
+
+# Valid rating scores and the histogram column counting each one
+SCORES = range(1, 11)
+SCORE_COLUMNS = {score: f"score_{score}" for score in SCORES}
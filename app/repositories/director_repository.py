@@ -1,5 +1,11 @@
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from app.models.models import Director
+from app.models.models import Director, Movie, MovieRatingStats
+
+# (director, movies_count, ratings_count, ratings_sum)
+DirectorStatsRow = Tuple[Director, int, int, Optional[int]]
 
 class DirectorRepository:
     def __init__(self, db: Session):
@@ -16,4 +22,56 @@ class DirectorRepository:
         """
         Retrieve all directors.
         """
-        return db.query(Director).all()
\ No newline at end of file
+        return db.query(Director).all()
+
+    @staticmethod
+    def get_names(db: Session) -> Dict[int, str]:
+        """
+        id -> name for every director (reference-data cache load).
+        """
+        return dict(db.execute(select(Director.id, Director.name)).all())
+
+    @staticmethod
+    def fingerprint(db: Session) -> Tuple[int, int]:
+        """
+        (row count, max id): changes when directors are added or removed.
+        """
+        count, max_id = db.execute(
+            select(func.count(Director.id), func.coalesce(func.max(Director.id), 0))
+        ).one()
+        return count, max_id
+
+    def get_page_with_stats(self, skip: int = 0, limit: int = 10) -> Tuple[List[DirectorStatsRow], Optional[int]]:
+        """
+        One page of directors (by id) with their movie count and rating
+        totals, in one grouped statement: the page is cut first, so only its
+        directors' movies are aggregated. Also returns the count(*) OVER ()
+        total (None when the page is empty).
+        """
+        page = (
+            select(Director.id, func.count().over().label("total"))
+            .order_by(Director.id)
+            .offset(skip)
+            .limit(limit)
+            .subquery("director_page")
+        )
+        rows = (
+            self.db.query(
+                Director,
+                func.count(Movie.id),
+                func.coalesce(func.sum(MovieRatingStats.ratings_count), 0),
+                func.sum(MovieRatingStats.ratings_sum),
+                page.c.total,
+            )
+            .join(page, page.c.id == Director.id)
+            .outerjoin(Movie, Movie.director_id == Director.id)
+            .outerjoin(MovieRatingStats, MovieRatingStats.movie_id == Movie.id)
+            .group_by(Director.id, page.c.total)
+            .order_by(Director.id)
+            .all()
+        )
+        total = rows[0][4] if rows else None
+        return [tuple(row)[:4] for row in rows], total
+
+    def count(self) -> int:
+        return self.db.scalar(select(func.count(Director.id)))
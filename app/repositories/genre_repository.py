@@ -1,5 +1,11 @@
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from app.models.models import Genre
+from app.models.models import Genre, MovieRatingStats, movie_genres
+
+# (genre, movies_count, ratings_count, ratings_sum)
+GenreStatsRow = Tuple[Genre, int, int, Optional[int]]
 
 class GenreRepository:
     def __init__(self, db: Session):
@@ -17,4 +23,53 @@ class GenreRepository:
         Retrieve multiple genres by their IDs.
         Useful for associating genres with a movie.
         """
-        return db.query(Genre).filter(Genre.id.in_(genre_ids)).all()
\ No newline at end of file
+        return db.query(Genre).filter(Genre.id.in_(genre_ids)).all()
+
+    @staticmethod
+    def get_names(db: Session) -> Dict[int, str]:
+        """
+        id -> name for every genre (reference-data cache load).
+        """
+        return dict(db.execute(select(Genre.id, Genre.name)).all())
+
+    @staticmethod
+    def fingerprint(db: Session) -> Tuple[int, int]:
+        """
+        (row count, max id): changes when genres are added or removed.
+        """
+        count, max_id = db.execute(select(func.count(Genre.id), func.coalesce(func.max(Genre.id), 0))).one()
+        return count, max_id
+
+    def get_page_with_stats(self, skip: int = 0, limit: int = 10) -> Tuple[List[GenreStatsRow], Optional[int]]:
+        """
+        One page of genres (by id) with their movie count and rating totals,
+        grouped over the page's movie_genres links in one statement, plus the
+        count(*) OVER () total (None when the page is empty).
+        """
+        page = (
+            select(Genre.id, func.count().over().label("total"))
+            .order_by(Genre.id)
+            .offset(skip)
+            .limit(limit)
+            .subquery("genre_page")
+        )
+        rows = (
+            self.db.query(
+                Genre,
+                func.count(movie_genres.c.movie_id),
+                func.coalesce(func.sum(MovieRatingStats.ratings_count), 0),
+                func.sum(MovieRatingStats.ratings_sum),
+                page.c.total,
+            )
+            .join(page, page.c.id == Genre.id)
+            .outerjoin(movie_genres, movie_genres.c.genre_id == Genre.id)
+            .outerjoin(MovieRatingStats, MovieRatingStats.movie_id == movie_genres.c.movie_id)
+            .group_by(Genre.id, page.c.total)
+            .order_by(Genre.id)
+            .all()
+        )
+        total = rows[0][4] if rows else None
+        return [tuple(row)[:4] for row in rows], total
+
+    def count(self) -> int:
+        return self.db.scalar(select(func.count(Genre.id)))
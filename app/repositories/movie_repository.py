@@ -1,13 +1,135 @@
 from __future__ import annotations
 
-from typing import Optional, List, Tuple, Union
+from collections import Counter
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, List, Set, Tuple, Union
 
 from fastapi import Depends
-from sqlalchemy import delete
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import (
+    BigInteger, Float, Integer, and_, bindparam, case, column, delete, func, insert, literal, literal_column, or_,
+    select, update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import cast as cast_
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.core.config import LEADERBOARD_PRIOR_MEAN, LEADERBOARD_PRIOR_VOTES
+from app.db.async_facade import AsyncFacade
 from app.db.database import get_db
-from app.models.models import Movie, Genre, Director, movie_genres, Rating
+from app.models.models import SCORE_COLUMNS, Movie, Genre, Director, movie_genres, Rating, MovieRatingStats
+
+# Inlined (not bound) so the expression matches ix_movies_title_tsv
+_TS_CONFIG = literal_column("'simple'::regconfig")
+
+# Damped (Bayesian) average: LEADERBOARD_PRIOR_VOTES extra votes at
+# LEADERBOARD_PRIOR_MEAN pull movies with few ratings toward the prior, so two
+# 10s do not outrank ten thousand 9s
+_PRIOR_SUM = LEADERBOARD_PRIOR_MEAN * LEADERBOARD_PRIOR_VOTES
+
+
+def bayesian_score(ratings_sum: int, ratings_count: int) -> Optional[float]:
+    """
+    Damped average of `ratings_count` ratings adding up to `ratings_sum`
+    (None without ratings). Python twin of _bayesian_score_sql for bulk loaders.
+    """
+    if not ratings_count:
+        return None
+    return (ratings_sum + _PRIOR_SUM) / (ratings_count + LEADERBOARD_PRIOR_VOTES)
+
+
+def _bayesian_score_sql(ratings_sum, ratings_count):
+    return case(
+        (ratings_count > 0, (cast_(ratings_sum, Float) + _PRIOR_SUM) / (ratings_count + LEADERBOARD_PRIOR_VOTES)),
+        else_=None,
+    )
+
+
+def sync_genre_scores(movie_ids: Optional[Iterable[int]] = None):
+    """
+    UPDATE copying movie_rating_stats.bayesian_score onto the genre links of
+    `movie_ids` (every link when None). Run in the same transaction whenever a
+    movie's scores or genre links change.
+    """
+    score = (
+        select(MovieRatingStats.bayesian_score)
+        .where(MovieRatingStats.movie_id == movie_genres.c.movie_id)
+        .scalar_subquery()
+    )
+    stmt = update(movie_genres).values(bayesian_score=score)
+    if movie_ids is not None:
+        stmt = stmt.where(movie_genres.c.movie_id.in_(list(movie_ids)))
+    return stmt
+
+
+def _score_counts():
+    # COUNT(movie_ratings.id) FILTER (WHERE score = n) for every score, in order
+    return [func.count(Rating.id).filter(Rating.score == score).label(name) for score, name in SCORE_COLUMNS.items()]
+
+
+# Relative increment of one movie's aggregate row; executed singly or executemany
+_STATS_INCREMENT = (
+    update(MovieRatingStats.__table__)
+    .where(MovieRatingStats.movie_id == bindparam("b_movie_id", type_=Integer))
+    .values(
+        ratings_sum=MovieRatingStats.ratings_sum + bindparam("b_sum", type_=BigInteger),
+        ratings_count=MovieRatingStats.ratings_count + bindparam("b_count", type_=Integer),
+        min_score=case(
+            (MovieRatingStats.min_score.is_(None), bindparam("b_min", type_=Integer)),
+            (MovieRatingStats.min_score > bindparam("b_min", type_=Integer), bindparam("b_min", type_=Integer)),
+            else_=MovieRatingStats.min_score,
+        ),
+        max_score=case(
+            (MovieRatingStats.max_score.is_(None), bindparam("b_max", type_=Integer)),
+            (MovieRatingStats.max_score < bindparam("b_max", type_=Integer), bindparam("b_max", type_=Integer)),
+            else_=MovieRatingStats.max_score,
+        ),
+        bayesian_score=_bayesian_score_sql(
+            MovieRatingStats.ratings_sum + bindparam("b_sum", type_=BigInteger),
+            MovieRatingStats.ratings_count + bindparam("b_count", type_=Integer),
+        ),
+        **{
+            name: getattr(MovieRatingStats, name) + bindparam(f"b_{name}", type_=Integer)
+            for name in SCORE_COLUMNS.values()
+        },
+        updated_at=func.now(),
+    )
+)
+
+# Columns update_many may set (besides version / updated_at)
+_UPDATABLE_FIELDS = frozenset({"title", "director_id", "release_year", "cast"})
+
+# (movie, average_rating, ratings_count)
+MovieRow = Tuple[Movie, Optional[float], int]
+
+# score (1-10) -> number of ratings
+ScoreCounts = Dict[int, int]
+
+# (movie, average_rating, ratings_count, bayesian_score)
+RankedRow = Tuple[Movie, Optional[float], int, float]
+
+# (movie_id, version, ratings_count, movie updated_at, stats updated_at)
+VersionRow = Tuple[int, int, int, Optional[datetime], Optional[datetime]]
+
+# Columns iter_export can select, in their default output order
+EXPORT_FIELDS = (
+    "id", "title", "release_year", "cast", "director_id", "director", "genres",
+    "average_rating", "ratings_count", "updated_at",
+)
+_RATING_FIELDS = frozenset({"average_rating", "ratings_count", "updated_at"})
+
+# unit separator: genre names are aggregated into one string per movie and split
+# again in Python, so it must not occur in a name
+_GENRE_SEPARATOR = "\x1f"
+
+
+def _export_batch(partition, fields: List[str]) -> List[Dict[str, Any]]:
+    # export rows -> dicts; genre names arrive as one aggregated string
+    batch = [dict(zip(fields, row)) for row in partition]
+    if "genres" in fields:
+        for row in batch:
+            names = row["genres"]
+            row["genres"] = sorted(names.split(_GENRE_SEPARATOR)) if names else []
+    return batch
 
 
 class MovieRepository:
@@ -18,6 +140,74 @@ class MovieRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def _rows_query(self):
+        """
+        Movie entity plus its rating aggregates, computed in SQL.
+        Genres are selectin-loaded so LIMIT/OFFSET apply to movies directly
+        instead of being wrapped in a subquery for a collection join.
+        """
+        return (
+            self.db.query(
+                Movie,
+                (
+                    cast_(MovieRatingStats.ratings_sum, Float)
+                    / func.nullif(MovieRatingStats.ratings_count, 0)
+                ).label("average_rating"),
+                func.coalesce(MovieRatingStats.ratings_count, 0).label("ratings_count"),
+            )
+            .outerjoin(MovieRatingStats, MovieRatingStats.movie_id == Movie.id)
+            .options(
+                joinedload(Movie.director),
+                selectinload(Movie.genres),
+            )
+        )
+
+    @staticmethod
+    def _apply_filters(
+        query,
+        title: Optional[str] = None,
+        release_year: Optional[int] = None,
+        genre_name: Optional[str] = None,
+        director_id: Optional[int] = None,
+        genre_id: Optional[int] = None,
+    ):
+        if title:
+            query = query.filter(Movie.title.ilike(f"%{title}%"))
+        if release_year is not None:
+            query = query.filter(Movie.release_year == release_year)
+        if genre_name:
+            # EXISTS rather than a join: a movie matching several genres stays one row
+            query = query.filter(Movie.genres.any(Genre.name.ilike(f"%{genre_name}%")))
+        if director_id is not None:
+            query = query.filter(Movie.director_id == director_id)
+        if genre_id is not None:
+            query = query.filter(
+                select(movie_genres.c.movie_id)
+                .where(movie_genres.c.movie_id == Movie.id, movie_genres.c.genre_id == genre_id)
+                .exists()
+            )
+        return query
+
+    def _page_query(
+        self,
+        query,
+        skip: int,
+        limit: int,
+        title: Optional[str],
+        release_year: Optional[int],
+        genre_name: Optional[str],
+        after_id: Optional[int],
+        director_id: Optional[int] = None,
+        genre_id: Optional[int] = None,
+    ):
+        query = self._apply_filters(query, title, release_year, genre_name, director_id, genre_id)
+        if after_id is not None:
+            query = query.filter(Movie.id > after_id)
+        query = query.order_by(Movie.id)
+        if skip:
+            query = query.offset(skip)
+        return query.limit(limit)
+
     def get_all(
         self,
         skip: int = 0,
@@ -25,40 +215,241 @@ class MovieRepository:
         title: Optional[str] = None,
         release_year: Optional[int] = None,
         genre_name: Optional[str] = None,
-    ) -> List[Movie]:
+        after_id: Optional[int] = None,
+        director_id: Optional[int] = None,
+        genre_id: Optional[int] = None,
+    ) -> List[MovieRow]:
         """
-        Retrieve movies with optional filtering.
+        Retrieve (movie, average_rating, ratings_count) rows with optional filtering.
+        Rows are ordered by id; pass `after_id` for keyset pagination, which seeks
+        on the primary key instead of scanning and discarding `skip` rows.
         """
-        query = self.db.query(Movie).options(
-            joinedload(Movie.director),
-            joinedload(Movie.genres),
-            joinedload(Movie.ratings),
+        query = self._page_query(
+            self._rows_query(), skip, limit, title, release_year, genre_name, after_id, director_id, genre_id
         )
+        return [tuple(row) for row in query.all()]
 
-        if title:
-            query = query.filter(Movie.title.ilike(f"%{title}%"))
+    def get_all_with_total(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        title: Optional[str] = None,
+        release_year: Optional[int] = None,
+        genre_name: Optional[str] = None,
+        director_id: Optional[int] = None,
+        genre_id: Optional[int] = None,
+    ) -> Tuple[List[MovieRow], Optional[int]]:
+        """
+        Same as get_all, plus the exact filtered total from a count(*) OVER ()
+        window in the same statement. The total is None when the page is empty
+        (past the end), since there is no row to carry it.
+        """
+        query = self._page_query(
+            self._rows_query().add_columns(func.count().over().label("total_count")),
+            skip, limit, title, release_year, genre_name, None, director_id, genre_id,
+        )
+        rows = query.all()
+        total = rows[0][3] if rows else None
+        return [tuple(row)[:3] for row in rows], total
+
+    def _versions_query(self):
+        return self.db.query(
+            Movie.id,
+            Movie.version,
+            func.coalesce(MovieRatingStats.ratings_count, 0),
+            Movie.updated_at,
+            MovieRatingStats.updated_at,
+        ).outerjoin(MovieRatingStats, MovieRatingStats.movie_id == Movie.id)
+
+    def get_version(self, movie_id: int) -> Optional[VersionRow]:
+        """
+        Everything a movie's ETag / Last-Modified depend on, by primary key,
+        without loading the movie, its director or its genres.
+        """
+        row = self._versions_query().filter(Movie.id == movie_id).first()
+        return tuple(row) if row else None
+
+    def get_page_versions(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        title: Optional[str] = None,
+        release_year: Optional[int] = None,
+        genre_name: Optional[str] = None,
+        after_id: Optional[int] = None,
+        with_total: bool = False,
+        director_id: Optional[int] = None,
+        genre_id: Optional[int] = None,
+    ) -> Tuple[List[VersionRow], Optional[int]]:
+        """
+        Version rows of the page get_all would return for the same arguments,
+        plus the count(*) OVER () total when `with_total` (None on an empty page).
+        """
+        query = self._versions_query()
+        if with_total:
+            query = query.add_columns(func.count().over())
+        rows = self._page_query(
+            query, skip, limit, title, release_year, genre_name, after_id, director_id, genre_id
+        ).all()
+        total = rows[0][5] if with_total and rows else None
+        return [tuple(row)[:5] for row in rows], total
+
+    def search(
+        self,
+        text: str,
+        skip: int = 0,
+        limit: int = 10,
+        genre_name: Optional[str] = None,
+    ) -> List[Tuple[Movie, Optional[float], int, float, str]]:
+        """
+        Relevance-ranked title search. Returns (movie, average_rating,
+        ratings_count, rank, highlight) rows, best match first.
+
+        On PostgreSQL this matches full-text (to_tsvector), trigram similarity
+        and substring predicates, all served by the GIN indexes from the
+        search-index migration; other databases fall back to ILIKE.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            tsquery = func.plainto_tsquery(_TS_CONFIG, text)
+            tsvector = func.to_tsvector(_TS_CONFIG, Movie.title)
+            rank = func.similarity(Movie.title, text) + func.ts_rank(tsvector, tsquery)
+            highlight = func.ts_headline(
+                _TS_CONFIG, Movie.title, tsquery, "StartSel=<mark>, StopSel=</mark>, HighlightAll=true"
+            )
+            match = or_(
+                tsvector.op("@@")(tsquery),
+                Movie.title.op("%")(text),
+                Movie.title.ilike(f"%{text}%"),
+            )
+        else:
+            rank = case(
+                (func.lower(Movie.title) == text.lower(), 1.0),
+                (Movie.title.ilike(f"{text}%"), 0.75),
+                else_=0.5,
+            )
+            highlight = Movie.title
+            match = Movie.title.ilike(f"%{text}%")
+
+        query = self._apply_filters(
+            self._rows_query().add_columns(rank.label("rank"), highlight.label("highlight")),
+            genre_name=genre_name,
+        )
+        query = query.filter(match).order_by(rank.desc(), Movie.id)
+        if skip:
+            query = query.offset(skip)
+        return [tuple(row) for row in query.limit(limit).all()]
+
+    def top_rated(
+        self,
+        limit: int,
+        genre_id: Optional[int] = None,
+        release_year: Optional[int] = None,
+        min_votes: int = 1,
+    ) -> List[RankedRow]:
+        """
+        Highest damped averages first (ties: lower id first). Walks
+        ix_movie_rating_stats_bayesian_score, or the genre's slice of
+        ix_movie_genres_genre_id_bayesian_score, and stops after `limit`
+        matches: the cost follows the filters' selectivity, not catalog size.
+        """
+        query = self._rows_query()
+        if genre_id is None:
+            score, tie = MovieRatingStats.bayesian_score, MovieRatingStats.movie_id
+        else:
+            score, tie = movie_genres.c.bayesian_score, movie_genres.c.movie_id
+            query = query.join(
+                movie_genres, and_(movie_genres.c.movie_id == Movie.id, movie_genres.c.genre_id == genre_id)
+            )
+        query = query.add_columns(score).filter(score.isnot(None))
         if release_year is not None:
             query = query.filter(Movie.release_year == release_year)
-        if genre_name:
-            query = query.join(Movie.genres).filter(Genre.name.ilike(f"%{genre_name}%"))
+        if min_votes > 1:
+            query = query.filter(MovieRatingStats.ratings_count >= min_votes)
+        rows = query.order_by(score.desc(), tie).limit(limit).all()
+        return [tuple(row) for row in rows]
 
-        return query.offset(skip).limit(limit).all()
-
-    def get_by_id(self, movie_id: int) -> Optional[Movie]:
+    def genre_id_by_name(self, name: str) -> Optional[int]:
         """
-        Retrieve one movie by id (with relations).
+        Id of the genre called `name` (case-insensitive), or None.
         """
+        return self.db.scalar(select(Genre.id).where(func.lower(Genre.name) == name.lower()))
+
+    def _genre_names_sql(self):
+        # movie_id -> genre names in one string, aggregated over all links at once:
+        # a single hash aggregate is far cheaper than a correlated lookup per movie
+        if self.db.get_bind().dialect.name == "postgresql":
+            names = func.string_agg(Genre.name, literal(_GENRE_SEPARATOR))
+        else:
+            names = func.group_concat(Genre.name, _GENRE_SEPARATOR)
         return (
-            self.db.query(Movie)
-            .options(
-                joinedload(Movie.director),
-                joinedload(Movie.genres),
-                joinedload(Movie.ratings),
-            )
-            .filter(Movie.id == movie_id)
-            .first()
+            select(movie_genres.c.movie_id, names.label("names"))
+            .join(Genre, Genre.id == movie_genres.c.genre_id)
+            .group_by(movie_genres.c.movie_id)
+            .subquery("movie_genre_names")
         )
 
+    def iter_export(
+        self,
+        fields: Iterable[str] = EXPORT_FIELDS,
+        since: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        The whole catalog as batches of at most `batch_size` row dicts (keys:
+        `fields`, a subset of EXPORT_FIELDS), ordered by id. One SELECT joins
+        the director, genre names and rating aggregates and is read through a
+        server-side cursor (yield_per), so memory holds one batch whatever the
+        catalog size. Only the joins the requested fields need are added.
+
+        `since` keeps movies whose row or rating aggregates changed at or after
+        it; `updated_at` is the later of the two.
+        """
+        fields = list(fields)
+        stmt = self._export_statement(fields, since, batch_size)
+        # Core rows: no ORM result processing per row
+        result = self.db.connection().execute(stmt)
+        try:
+            for partition in result.partitions():
+                yield _export_batch(partition, fields)
+        finally:
+            result.close()
+
+    def _export_statement(self, fields: List[str], since: Optional[datetime], batch_size: int):
+        genre_names = self._genre_names_sql() if "genres" in fields else None
+        stats_changed = MovieRatingStats.updated_at
+        columns = {
+            "id": Movie.id,
+            "title": Movie.title,
+            "release_year": Movie.release_year,
+            "cast": Movie.cast,
+            "director_id": Movie.director_id,
+            "director": Director.name,
+            "average_rating": (
+                cast_(MovieRatingStats.ratings_sum, Float) / func.nullif(MovieRatingStats.ratings_count, 0)
+            ),
+            "ratings_count": func.coalesce(MovieRatingStats.ratings_count, 0),
+            "updated_at": case((stats_changed > Movie.updated_at, stats_changed), else_=Movie.updated_at),
+        }
+        if genre_names is not None:
+            columns["genres"] = genre_names.c.names
+        stmt = select(*(columns[name].label(name) for name in fields)).select_from(Movie)
+        if "director" in fields:
+            stmt = stmt.join(Director, Director.id == Movie.director_id)
+        if since is not None or _RATING_FIELDS.intersection(fields):
+            stmt = stmt.outerjoin(MovieRatingStats, MovieRatingStats.movie_id == Movie.id)
+        if genre_names is not None:
+            stmt = stmt.outerjoin(genre_names, genre_names.c.movie_id == Movie.id)
+        if since is not None:
+            stmt = stmt.where(or_(Movie.updated_at >= since, stats_changed >= since))
+        return stmt.order_by(Movie.id).execution_options(yield_per=batch_size)
+
+    def get_by_id(self, movie_id: int) -> Optional[MovieRow]:
+        """
+        Retrieve one (movie, average_rating, ratings_count) row by id.
+        """
+        row = self._rows_query().filter(Movie.id == movie_id).first()
+        return tuple(row) if row else None
+
     def create(
         self,
         title: str,
@@ -75,6 +466,7 @@ class MovieRepository:
             director_id=director_id,
             release_year=release_year,
             cast=cast,
+            rating_stats=MovieRatingStats(ratings_sum=0, ratings_count=0),
         )
 
         if genre_ids:
@@ -86,6 +478,12 @@ class MovieRepository:
         self.db.refresh(new_movie)
         return new_movie
 
+    def movie_exists(self, movie_id: int) -> bool:
+        """
+        Check if a movie exists (primary key lookup, no relations loaded).
+        """
+        return self.db.query(Movie.id).filter(Movie.id == movie_id).first() is not None
+
     def director_exists(self, director_id: int) -> bool:
         """
         Check if a director exists.
@@ -104,70 +502,64 @@ class MovieRepository:
         title: Optional[str] = None,
         release_year: Optional[int] = None,
         genre_name: Optional[str] = None,
+        director_id: Optional[int] = None,
+        genre_id: Optional[int] = None,
     ) -> int:
         """
         Total count for pagination (with same filters).
         """
-        query = self.db.query(Movie)
-
-        if title:
-            query = query.filter(Movie.title.ilike(f"%{title}%"))
-        if release_year is not None:
-            query = query.filter(Movie.release_year == release_year)
-        if genre_name:
-            query = query.join(Movie.genres).filter(Genre.name.ilike(f"%{genre_name}%"))
-
+        query = self._apply_filters(
+            self.db.query(Movie), title, release_year, genre_name, director_id, genre_id
+        )
         return query.count()
 
-    def update(
+    def estimate_total_count(
         self,
-        movie_id: int,
         title: Optional[str] = None,
-        director_id: Optional[int] = None,
         release_year: Optional[int] = None,
-        cast: Optional[Union[str, List[str]]] = None,
-        genre_ids: Optional[List[int]] = None,
-    ) -> Optional[Movie]:
+        genre_name: Optional[str] = None,
+        director_id: Optional[int] = None,
+        genre_id: Optional[int] = None,
+    ) -> int:
         """
-        Update movie fields + optionally replace genres.
+        Planner row estimate for the filtered movie set on PostgreSQL
+        (EXPLAIN only, nothing is scanned); exact count on other databases.
         """
-        movie = self.get_by_id(movie_id)
-        if not movie:
-            return None
-
-        if title is not None:
-            movie.title = title
-        if director_id is not None:
-            movie.director_id = director_id
-        if release_year is not None:
-            movie.release_year = release_year
-        if cast is not None:
-            movie.cast = cast
-
-        if genre_ids is not None:
-            new_genres = self.db.query(Genre).filter(Genre.id.in_(genre_ids)).all()
-            movie.genres = new_genres
+        if self.db.get_bind().dialect.name != "postgresql":
+            return self.get_total_count(title, release_year, genre_name, director_id, genre_id)
 
-        self.db.commit()
-        self.db.refresh(movie)
-        return movie
+        query = self._apply_filters(
+            self.db.query(Movie.id), title, release_year, genre_name, director_id, genre_id
+        )
+        dialect = self.db.get_bind().dialect
+        compiled = query.statement.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+        params = compiled.params
+        if dialect.positional:
+            # asyncpg compiles $1, $2, ...: the driver takes the values in placeholder order
+            params = tuple(params[name] for name in compiled.positiontup)
+        plan = (
+            self.db.connection()
+            .exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), params)
+            .scalar_one()
+        )
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     def delete(self, movie_id: int) -> bool:
         """
         Delete movie and dependent records.
         """
-        movie = self.db.query(Movie).filter(Movie.id == movie_id).first()
-        if not movie:
+        if not self.movie_exists(movie_id):
             return False
 
         # remove relations in association table
         self.db.execute(delete(movie_genres).where(movie_genres.c.movie_id == movie_id))
 
-        # delete ratings
+        # delete ratings and their aggregate
         self.db.query(Rating).filter(Rating.movie_id == movie_id).delete()
-        
+        self.db.execute(delete(MovieRatingStats).where(MovieRatingStats.movie_id == movie_id))
+
         # delete movie
-        self.db.delete(movie)
+        self.db.execute(delete(Movie).where(Movie.id == movie_id))
         self.db.commit()
         return True
 
@@ -175,27 +567,384 @@ class MovieRepository:
         """
         Add a rating for a movie. Returns None if movie not found.
         """
-        movie = self.get_by_id(movie_id)
-        if not movie:
+        if not self.movie_exists(movie_id):
             return None
 
         rating = Rating(movie_id=movie_id, score=score)
         self.db.add(rating)
+        self._apply_rating_stats(movie_id, [score])
         self.db.commit()
         self.db.refresh(rating)
         return rating
 
     @staticmethod
-    def calc_rating_stats(movie: Movie) -> Tuple[Optional[float], int]:
+    def _stats_params(movie_id: int, scores: List[int]) -> dict:
+        per_score = Counter(scores)
+        return {
+            "b_movie_id": movie_id,
+            "b_sum": sum(scores),
+            "b_count": len(scores),
+            "b_min": min(scores),
+            "b_max": max(scores),
+            **{f"b_{name}": per_score[score] for score, name in SCORE_COLUMNS.items()},
+        }
+
+    def _apply_rating_stats(self, movie_id: int, scores: List[int]) -> None:
+        """
+        Fold new scores into the movie's aggregate row (caller commits).
+        The UPDATE is relative, so concurrent writers never lose increments.
+        """
+        if not scores:
+            return
+        params = self._stats_params(movie_id, scores)
+        result = self.db.execute(_STATS_INCREMENT, params)
+        if result.rowcount == 0:
+            # movies loaded outside the API (e.g. seeddb.sql) may lack a row
+            self.db.add(
+                MovieRatingStats(
+                    movie_id=movie_id,
+                    ratings_sum=params["b_sum"],
+                    ratings_count=params["b_count"],
+                    min_score=params["b_min"],
+                    max_score=params["b_max"],
+                    bayesian_score=bayesian_score(params["b_sum"], params["b_count"]),
+                    **{name: params[f"b_{name}"] for name in SCORE_COLUMNS.values()},
+                )
+            )
+            self.db.flush()
+        self.db.execute(sync_genre_scores([movie_id]))
+
+    def _apply_rating_stats_many(self, scores_by_movie: Dict[int, List[int]]) -> None:
+        """
+        Batch form of _apply_rating_stats: creates any missing aggregate rows,
+        then folds every movie's scores in with one statement (caller commits).
+        """
+        if not scores_by_movie:
+            return
+        present = set(
+            self.db.scalars(
+                select(MovieRatingStats.movie_id).where(MovieRatingStats.movie_id.in_(scores_by_movie))
+            )
+        )
+        missing = [movie_id for movie_id in scores_by_movie if movie_id not in present]
+        if missing:
+            self.db.execute(
+                insert(MovieRatingStats.__table__),
+                [{"movie_id": movie_id, "ratings_sum": 0, "ratings_count": 0} for movie_id in missing],
+            )
+
+        if self.db.get_bind().dialect.name != "postgresql":
+            self.db.execute(
+                _STATS_INCREMENT,
+                [self._stats_params(movie_id, scores) for movie_id, scores in scores_by_movie.items()],
+            )
+        else:
+            self._apply_rating_stats_unnest(scores_by_movie)
+        self.db.execute(sync_genre_scores(scores_by_movie))
+
+    def _apply_rating_stats_unnest(self, scores_by_movie: Dict[int, List[int]]) -> None:
+        # PostgreSQL: one UPDATE ... FROM unnest(arrays); one bind parameter per
+        # column regardless of batch size
+        movie_ids = list(scores_by_movie)
+        per_score = [Counter(scores_by_movie[m]) for m in movie_ids]
+        deltas = (
+            func.unnest(
+                bindparam("d_movie_id", movie_ids, type_=ARRAY(Integer)),
+                bindparam("d_sum", [sum(scores_by_movie[m]) for m in movie_ids], type_=ARRAY(BigInteger)),
+                bindparam("d_count", [len(scores_by_movie[m]) for m in movie_ids], type_=ARRAY(Integer)),
+                bindparam("d_min", [min(scores_by_movie[m]) for m in movie_ids], type_=ARRAY(Integer)),
+                bindparam("d_max", [max(scores_by_movie[m]) for m in movie_ids], type_=ARRAY(Integer)),
+                *(
+                    bindparam(f"d_{name}", [counts[score] for counts in per_score], type_=ARRAY(Integer))
+                    for score, name in SCORE_COLUMNS.items()
+                ),
+            )
+            .table_valued(
+                column("movie_id", Integer),
+                column("total", BigInteger),
+                column("n", Integer),
+                column("low", Integer),
+                column("high", Integer),
+                *(column(name, Integer) for name in SCORE_COLUMNS.values()),
+            )
+            .render_derived(name="deltas")
+        )
+        self.db.execute(
+            update(MovieRatingStats.__table__)
+            .where(MovieRatingStats.movie_id == deltas.c.movie_id)
+            .values(
+                ratings_sum=MovieRatingStats.ratings_sum + deltas.c.total,
+                ratings_count=MovieRatingStats.ratings_count + deltas.c.n,
+                min_score=case(
+                    (MovieRatingStats.min_score.is_(None), deltas.c.low),
+                    (MovieRatingStats.min_score > deltas.c.low, deltas.c.low),
+                    else_=MovieRatingStats.min_score,
+                ),
+                max_score=case(
+                    (MovieRatingStats.max_score.is_(None), deltas.c.high),
+                    (MovieRatingStats.max_score < deltas.c.high, deltas.c.high),
+                    else_=MovieRatingStats.max_score,
+                ),
+                bayesian_score=_bayesian_score_sql(
+                    MovieRatingStats.ratings_sum + deltas.c.total,
+                    MovieRatingStats.ratings_count + deltas.c.n,
+                ),
+                **{name: getattr(MovieRatingStats, name) + deltas.c[name] for name in SCORE_COLUMNS.values()},
+                updated_at=func.now(),
+            )
+        )
+
+    def existing_movie_ids(self, movie_ids: Iterable[int]) -> Set[int]:
+        """
+        Which of `movie_ids` exist, in one query.
+        """
+        ids = set(movie_ids)
+        if not ids:
+            return set()
+        return set(self.db.scalars(select(Movie.id).where(Movie.id.in_(ids))))
+
+    def existing_director_ids(self, director_ids: Iterable[int]) -> Set[int]:
+        """
+        Which of `director_ids` exist, in one query.
+        """
+        ids = set(director_ids)
+        if not ids:
+            return set()
+        return set(self.db.scalars(select(Director.id).where(Director.id.in_(ids))))
+
+    def existing_genre_ids(self, genre_ids: Iterable[int]) -> Set[int]:
+        """
+        Which of `genre_ids` exist, in one query.
+        """
+        ids = set(genre_ids)
+        if not ids:
+            return set()
+        return set(self.db.scalars(select(Genre.id).where(Genre.id.in_(ids))))
+
+    def create_many(self, movies: List[dict]) -> List[int]:
+        """
+        Insert many movies (dicts with title, director_id, release_year, cast,
+        genre_ids) in one transaction: a multi-row INSERT ... RETURNING for the
+        movies, one for their genre links and one for the empty aggregate rows.
+        References are expected to be validated by the caller. Returns the new
+        ids in input order.
+        """
+        if not movies:
+            return []
+        movies_table = Movie.__table__
+        new_ids = self.db.scalars(
+            insert(movies_table).returning(movies_table.c.id, sort_by_parameter_order=True),
+            [
+                {
+                    "title": m["title"],
+                    "director_id": m["director_id"],
+                    "release_year": m["release_year"],
+                    "cast": m["cast"],
+                }
+                for m in movies
+            ],
+        ).all()
+
+        links = [
+            {"movie_id": movie_id, "genre_id": genre_id}
+            for movie_id, m in zip(new_ids, movies)
+            for genre_id in dict.fromkeys(m["genre_ids"])
+        ]
+        if links:
+            self.db.execute(insert(movie_genres), links)
+        # every movie has an aggregate row (see create)
+        self.db.execute(
+            insert(MovieRatingStats.__table__),
+            [{"movie_id": movie_id, "ratings_sum": 0, "ratings_count": 0} for movie_id in new_ids],
+        )
+        self.db.commit()
+        return new_ids
+
+    def update_many(self, changes: List[dict]) -> None:
+        """
+        Apply many partial updates in one transaction. Each dict has `id`, any
+        of title/director_id/release_year/cast, and optionally `genre_ids`
+        (replaces the movie's genres). Updates with the same set of fields
+        share one executemany UPDATE, genre links are replaced with one DELETE
+        and one INSERT, and every touched movie gets its version bumped.
+        Movies and references are expected to be validated by the caller.
+        """
+        if not changes:
+            return
+        movies_table = Movie.__table__
+        by_fields: Dict[Tuple[str, ...], List[dict]] = {}
+        for change in changes:
+            fields = tuple(sorted(k for k in change if k in _UPDATABLE_FIELDS))
+            by_fields.setdefault(fields, []).append(change)
+
+        for fields, group in by_fields.items():
+            stmt = (
+                update(movies_table)
+                .where(movies_table.c.id == bindparam("b_id"))
+                .values(
+                    version=movies_table.c.version + 1,
+                    updated_at=func.now(),
+                    **{field: bindparam(f"b_{field}") for field in fields},
+                )
+            )
+            self.db.execute(
+                stmt, [{"b_id": c["id"], **{f"b_{field}": c[field] for field in fields}} for c in group]
+            )
+
+        relinked = [c for c in changes if c.get("genre_ids") is not None]
+        if relinked:
+            self.db.execute(
+                delete(movie_genres).where(movie_genres.c.movie_id.in_([c["id"] for c in relinked]))
+            )
+            links = [
+                {"movie_id": c["id"], "genre_id": genre_id}
+                for c in relinked
+                for genre_id in dict.fromkeys(c["genre_ids"])
+            ]
+            if links:
+                self.db.execute(insert(movie_genres), links)
+                self.db.execute(sync_genre_scores(c["id"] for c in relinked))
+        self.db.commit()
+
+    def add_ratings_bulk(self, ratings: List[Tuple[int, int]]) -> List[Optional[int]]:
+        """
+        Insert many (movie_id, score) pairs in a single transaction: one query
+        to check movie existence, multi-row INSERT ... RETURNING for the
+        ratings, one batched UPDATE for the aggregates and a single commit.
+        Returns the new rating id per input pair, or None for unknown movies.
+        Scores are expected to be validated by the caller.
+        """
+        existing = self.existing_movie_ids(movie_id for movie_id, _ in ratings)
+        accepted = [(i, movie_id, score) for i, (movie_id, score) in enumerate(ratings) if movie_id in existing]
+        result: List[Optional[int]] = [None] * len(ratings)
+        if not accepted:
+            return result
+
+        # Core (not ORM) insert: no per-row ORM bookkeeping for thousands of rows
+        ratings_table = Rating.__table__
+        new_ids = self.db.scalars(
+            insert(ratings_table).returning(ratings_table.c.id, sort_by_parameter_order=True),
+            [{"movie_id": movie_id, "score": score} for _, movie_id, score in accepted],
+        ).all()
+
+        scores_by_movie: Dict[int, List[int]] = {}
+        for (i, movie_id, score), rating_id in zip(accepted, new_ids):
+            result[i] = rating_id
+            scores_by_movie.setdefault(movie_id, []).append(score)
+        self._apply_rating_stats_many(scores_by_movie)
+
+        self.db.commit()
+        return result
+
+    def rebuild_rating_stats(self) -> int:
+        """
+        Recompute every aggregate row from movie_ratings (backfill / repair).
+        Returns the number of movies written.
+        """
+        self.db.execute(delete(MovieRatingStats))
+        totals = (
+            select(
+                Movie.id,
+                func.coalesce(func.sum(Rating.score), 0),
+                func.count(Rating.id),
+                func.min(Rating.score),
+                func.max(Rating.score),
+                _bayesian_score_sql(func.coalesce(func.sum(Rating.score), 0), func.count(Rating.id)),
+                *_score_counts(),
+            )
+            .outerjoin(Rating, Rating.movie_id == Movie.id)
+            .group_by(Movie.id)
+        )
+        result = self.db.execute(
+            insert(MovieRatingStats).from_select(
+                [
+                    "movie_id", "ratings_sum", "ratings_count", "min_score", "max_score", "bayesian_score",
+                    *SCORE_COLUMNS.values(),
+                ],
+                totals,
+            )
+        )
+        self.db.execute(sync_genre_scores())
+        self.db.commit()
+        return result.rowcount
+
+    def get_score_histogram(self, movie_id: int) -> Optional[ScoreCounts]:
+        """
+        Ratings per score from the aggregate row (one primary-key lookup);
+        None if the movie does not exist.
+        """
+        row = self.db.execute(
+            select(Movie.id, *(getattr(MovieRatingStats, name) for name in SCORE_COLUMNS.values()))
+            .outerjoin(MovieRatingStats, MovieRatingStats.movie_id == Movie.id)
+            .where(Movie.id == movie_id)
+        ).first()
+        if row is None:
+            return None
+        return {score: count or 0 for score, count in zip(SCORE_COLUMNS, row[1:])}
+
+    def rebuild_score_histograms(self, first_id: int, last_id: int) -> int:
+        """
+        Recount the histogram columns of movies first_id..last_id from
+        movie_ratings and rewrite only the rows that drifted. Returns how
+        many were corrected. Id ranges are independent, so several can run
+        in parallel (see scripts.reconcile_score_histograms).
+        """
+        in_range = MovieRatingStats.movie_id.between(first_id, last_id)
+        # lock the rows first: the recount (a later snapshot) then sees every
+        # rating whose increment already landed, and increments still waiting
+        # on the lock apply on top of it, so the API can keep writing
+        self.db.execute(
+            select(MovieRatingStats.movie_id).where(in_range).order_by(MovieRatingStats.movie_id).with_for_update()
+        ).all()
+        counts = (
+            select(MovieRatingStats.movie_id, *_score_counts())
+            # the range on both sides lets the planner read only this chunk's ratings
+            .outerjoin(
+                Rating,
+                and_(Rating.movie_id == MovieRatingStats.movie_id, Rating.movie_id.between(first_id, last_id)),
+            )
+            .where(in_range)
+            .group_by(MovieRatingStats.movie_id)
+            .subquery("counts")
+        )
+        stats = MovieRatingStats.__table__
+        result = self.db.execute(
+            update(stats)
+            .where(stats.c.movie_id == counts.c.movie_id, stats.c.movie_id.between(first_id, last_id))
+            .where(or_(*(stats.c[name] != counts.c[name] for name in SCORE_COLUMNS.values())))
+            .values({name: counts.c[name] for name in SCORE_COLUMNS.values()})
+        )
+        self.db.commit()
+        return result.rowcount
+
+
+class AsyncMovieRepository(AsyncFacade):
+    """
+    MovieRepository over an AsyncSession (DB_ASYNC=true): same methods, awaitable.
+    """
+
+    build = staticmethod(MovieRepository)
+
+    async def iter_export(
+        self,
+        fields: Iterable[str] = EXPORT_FIELDS,
+        since: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
         """
-        Calculate average rating and count from loaded ratings relation.
+        MovieRepository.iter_export over the async driver. A generator cannot
+        go through run_sync, so the same statement is streamed with
+        AsyncConnection.stream (server-side cursor) instead.
         """
-        ratings = getattr(movie, "ratings", None) or []
-        scores = [r.score for r in ratings if r is not None and getattr(r, "score", None) is not None]
-        count = len(scores)
-        if count == 0:
-            return None, 0
-        return sum(scores) / count, count
+        fields = list(fields)
+        stmt = MovieRepository(self.session.sync_session)._export_statement(fields, since, batch_size)
+        connection = await self.session.connection()
+        result = await connection.stream(stmt)
+        try:
+            async for partition in result.partitions():
+                yield _export_batch(partition, fields)
+        finally:
+            await result.close()
 
 
 def get_movie_repository(db: Session = Depends(get_db)) -> MovieRepository:
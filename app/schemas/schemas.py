@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
+
+from app.core.config import MOVIE_BATCH_MAX_ITEMS, RATING_BATCH_MAX_ITEMS
 
 # --- Genre Schemas ---
 class GenreBase(BaseModel):
@@ -11,6 +13,12 @@ class GenreResponse(GenreBase):
     class Config:
         from_attributes = True
 
+# ✅ Schema برای فهرست ژانرها (با آمار فیلم و امتیاز)
+class GenreSummary(GenreResponse):
+    movies_count: int = 0
+    ratings_count: int = 0
+    average_rating: Optional[float] = None
+
 # --- Director Schemas ---
 class DirectorBase(BaseModel):
     name: str
@@ -22,6 +30,12 @@ class DirectorResponse(DirectorBase):
     class Config:
         from_attributes = True
 
+# ✅ Schema برای فهرست کارگردان‌ها (با آمار فیلم و امتیاز)
+class DirectorSummary(DirectorResponse):
+    movies_count: int = 0
+    ratings_count: int = 0
+    average_rating: Optional[float] = None
+
 # ✅ Director ساده برای Movie Response
 class DirectorInMovieResponse(BaseModel):
     """Schema برای نمایش کارگردان در پاسخ فیلم"""
@@ -40,6 +54,22 @@ class RatingResponse(RatingCreate):
     class Config:
         from_attributes = True
 
+# ✅ Schema برای ثبت گروهی امتیازها
+class RatingBatchItem(BaseModel):
+    movie_id: int
+    score: int
+
+class RatingBatchCreate(BaseModel):
+    items: List[RatingBatchItem] = Field(..., min_length=1, max_length=RATING_BATCH_MAX_ITEMS)
+
+class RatingBatchItemResult(BaseModel):
+    index: int
+    movie_id: int
+    score: int
+    status: Literal["created", "failed"]
+    rating_id: Optional[int] = None
+    error: Optional[str] = None
+
 # --- Movie Schemas ---
 class MovieBase(BaseModel):
     title: str
@@ -70,6 +100,22 @@ class MovieUpdate(BaseModel):
     director_id: Optional[int] = None
     genres: Optional[List[int]] = None
 
+# ✅ Schema برای ایجاد / آپدیت گروهی فیلم‌ها
+class MovieBatchCreate(BaseModel):
+    items: List[MovieCreate] = Field(..., min_length=1, max_length=MOVIE_BATCH_MAX_ITEMS)
+
+class MovieBatchUpdateItem(MovieUpdate):
+    id: int
+
+class MovieBatchUpdate(BaseModel):
+    items: List[MovieBatchUpdateItem] = Field(..., min_length=1, max_length=MOVIE_BATCH_MAX_ITEMS)
+
+class MovieBatchItemResult(BaseModel):
+    index: int
+    status: Literal["created", "updated", "failed"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
 # ✅ Schema برای پاسخ جزئیات فیلم (GET)
 class MovieResponse(MovieBase):
     id: int
@@ -81,6 +127,24 @@ class MovieResponse(MovieBase):
     class Config:
         from_attributes = True
 
+# ✅ Schema برای نتیجه جستجو
+class MovieSearchResult(MovieResponse):
+    rank: float
+    highlight: str
+
+class TopMovieResult(MovieResponse):
+    rank: int
+    score: float  # damped average the ranking uses
+
+# ✅ Schema برای توزیع امتیازها (۱ تا ۱۰)
+class ScoreHistogram(BaseModel):
+    movie_id: int
+    ratings_count: int
+    counts: Dict[int, int]  # score -> number of ratings, all ten scores present
+
+class MovieWithHistogramResponse(MovieResponse):
+    score_histogram: Dict[int, int]
+
 # ✅ Schema برای پاسخ موفق
 class MovieCreateResponse(BaseModel):
     status: str = "success"
@@ -0,0 +1,186 @@
+import csv
+import io
+import time
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Union
+
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.config import EXPORT_BATCH_SIZE, EXPORT_GZIP_LEVEL
+from app.core.logger import get_logger
+from app.repositories.movie_repository import EXPORT_FIELDS, AsyncMovieRepository, MovieRepository
+
+logger = get_logger("movie_rating")
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def parse_fields(value: Optional[str]) -> List[str]:
+    """
+    Comma-separated field list -> fields in request order (all of
+    EXPORT_FIELDS when empty). Raises ValueError naming unknown fields.
+    """
+    if not value:
+        return list(EXPORT_FIELDS)
+    fields = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in fields if name not in EXPORT_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown export fields: {', '.join(unknown)}" if unknown else "No export fields")
+    return fields
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _ndjson_batch(batch: List[Dict[str, Any]], fields: List[str]) -> bytes:
+    return b"".join([to_json(row) + b"\n" for row in batch])
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return "|".join(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_rows(rows: Iterable[List[Any]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _csv_header(fields: List[str]) -> bytes:
+    return _csv_rows([fields])
+
+
+def _csv_batch(batch: List[Dict[str, Any]], fields: List[str]) -> bytes:
+    return _csv_rows([[_csv_value(row[name]) for name in fields] for row in batch])
+
+
+# format -> (header encoder or None, batch encoder)
+_ENCODERS = {
+    "ndjson": (None, _ndjson_batch),
+    "csv": (_csv_header, _csv_batch),
+}
+
+
+class _ExportBody:
+    """
+    Encodes (and optionally gzips) one export, batch by batch, and keeps the
+    counts for the final log line. Shared by the sync and async streams.
+    """
+
+    def __init__(self, fields: List[str], fmt: ExportFormat, since: Optional[datetime], compress: bool):
+        self.fields = fields
+        self.fmt = fmt
+        self.since = since
+        self.compress = compress
+        self.header, self.encode = _ENCODERS[fmt]
+        # wbits=31: gzip container; the compressor keeps a bounded window, never the whole body
+        self.compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+        self.rows = 0
+        self.size = 0
+        self.started = time.perf_counter()
+
+    def _chunk(self, data: bytes) -> bytes:
+        if self.compressor is not None:
+            data = self.compressor.compress(data)
+        self.size += len(data)
+        return data
+
+    def start(self) -> bytes:
+        # formats without a header (NDJSON) start with the first batch
+        return self._chunk(self.header(self.fields)) if self.header is not None else b""
+
+    def batch(self, batch: List[Dict[str, Any]]) -> bytes:
+        self.rows += len(batch)
+        return self._chunk(self.encode(batch, self.fields))
+
+    def finish(self) -> bytes:
+        data = self.compressor.flush() if self.compressor is not None else b""
+        self.size += len(data)
+        logger.info(
+            "Catalog export finished (format=%s, gzip=%s, fields=%s, since=%s, rows=%s, bytes=%s, seconds=%.3f)",
+            self.fmt, self.compress, len(self.fields), self.since, self.rows, self.size,
+            time.perf_counter() - self.started,
+        )
+        return data
+
+    def failed(self) -> None:
+        # headers are already sent: the client sees a truncated body
+        logger.error("Catalog export failed (format=%s, rows=%s)", self.fmt, self.rows, exc_info=True)
+
+
+def _stream_sync(
+    session_factory: Callable[[], Session], body: _ExportBody, since: Optional[datetime], batch_size: int
+) -> Iterator[bytes]:
+    db = session_factory()
+    try:
+        chunk = body.start()
+        if chunk:
+            yield chunk
+        for batch in MovieRepository(db).iter_export(body.fields, since=since, batch_size=batch_size):
+            chunk = body.batch(batch)
+            if chunk:
+                yield chunk
+    except Exception:
+        body.failed()
+        raise
+    finally:
+        db.close()
+    yield body.finish()
+
+
+async def _stream_async(
+    session_factory: Callable[[], AsyncSession], body: _ExportBody, since: Optional[datetime], batch_size: int
+) -> AsyncIterator[bytes]:
+    async with session_factory() as session:
+        try:
+            chunk = body.start()
+            if chunk:
+                yield chunk
+            async for batch in AsyncMovieRepository(session).iter_export(
+                body.fields, since=since, batch_size=batch_size
+            ):
+                chunk = body.batch(batch)
+                if chunk:
+                    yield chunk
+        except Exception:
+            body.failed()
+            raise
+    yield body.finish()
+
+
+def stream_catalog(
+    session_factory: Union[Callable[[], Session], async_sessionmaker],
+    fields: List[str],
+    fmt: ExportFormat = "ndjson",
+    since: Optional[datetime] = None,
+    compress: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Union[Iterator[bytes], AsyncIterator[bytes]]:
+    """
+    Body of GET /api/v1/movies/export, one chunk per cursor batch.
+
+    Opens its own session from `session_factory` (see get_session_factory):
+    the stream outlives the request handler. An async_sessionmaker streams
+    through the async driver on the event loop; a sync factory gives a sync
+    iterator, which StreamingResponse runs in the threadpool. The connection
+    and the read transaction stay open until the last chunk is sent or the
+    client goes away.
+    """
+    body = _ExportBody(fields, fmt, since, compress)
+    if isinstance(session_factory, async_sessionmaker):
+        return _stream_async(session_factory, body, since, batch_size)
+    return _stream_sync(session_factory, body, since, batch_size)
@@ -0,0 +1,91 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.cache import CacheBackend, LRUCache
+from app.core.config import MOVIE_CACHE_ENABLED, MOVIE_CACHE_MAX_ENTRIES, MOVIE_CACHE_TTL_SECONDS
+from app.core.http_cache import Validators
+from app.schemas.schemas import MovieResponse, ScoreHistogram
+
+M = TypeVar("M", bound=BaseModel)
+
+# Invalidation generations are striped over a fixed array, so memory stays bounded
+_GENERATION_STRIPES = 4096
+
+# cached per movie, all dropped together on invalidation
+_KINDS = ("response", "validators", "histogram")
+
+
+class MovieCache:
+    """
+    Read-through cache of a movie's MovieResponse, HTTP validators and score
+    histogram.
+
+    Writers call invalidate() after committing. Each invalidation bumps the
+    movie's generation, and a loader only stores its result if the generation
+    did not move while it was reading, so a load that raced a write can never
+    put the pre-write response back (no stale reads on this worker).
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._generations = [0] * _GENERATION_STRIPES
+        self._lock = threading.Lock()
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(movie_id: int, kind: str = "response") -> str:
+        return f"movie:{movie_id}:{kind}"
+
+    def get_or_load(
+        self, movie_id: int, loader: Callable[[], Optional[MovieResponse]]
+    ) -> Optional[MovieResponse]:
+        return self._get_or_load(movie_id, "response", MovieResponse, loader)
+
+    def get_or_load_validators(
+        self, movie_id: int, loader: Callable[[], Optional[Validators]]
+    ) -> Optional[Validators]:
+        return self._get_or_load(movie_id, "validators", Validators, loader)
+
+    def get_or_load_histogram(
+        self, movie_id: int, loader: Callable[[], Optional[ScoreHistogram]]
+    ) -> Optional[ScoreHistogram]:
+        return self._get_or_load(movie_id, "histogram", ScoreHistogram, loader)
+
+    def _get_or_load(
+        self, movie_id: int, kind: str, model: Type[M], loader: Callable[[], Optional[M]]
+    ) -> Optional[M]:
+        key = self._key(movie_id, kind)
+        cached = self.backend.get(key)
+        if cached is not None:
+            return model.model_validate_json(cached) if self.backend.shared else cached
+
+        stripe = movie_id % _GENERATION_STRIPES
+        generation = self._generations[stripe]
+        value = loader()
+        if value is not None:
+            with self._lock:
+                if self._generations[stripe] == generation:
+                    self.backend.set(key, value.model_dump_json() if self.backend.shared else value)
+        return value
+
+    def invalidate(self, *movie_ids: int) -> None:
+        self.invalidate_many(movie_ids)
+
+    def invalidate_many(self, movie_ids: Iterable[int]) -> None:
+        with self._lock:
+            for movie_id in movie_ids:
+                self._generations[movie_id % _GENERATION_STRIPES] += 1
+                for kind in _KINDS:
+                    self.backend.delete(self._key(movie_id, kind))
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self.backend).__name__, "invalidations": self.invalidations, **self.backend.stats()}
+
+
+# Process-wide cache (None when MOVIE_CACHE_ENABLED is off)
+movie_cache: Optional[MovieCache] = (
+    MovieCache(LRUCache(MOVIE_CACHE_MAX_ENTRIES, MOVIE_CACHE_TTL_SECONDS)) if MOVIE_CACHE_ENABLED else None
+)
@@ -1,9 +1,38 @@
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Iterable, Tuple, List, Literal, Set
 
+from app.core.cache import TTLCache
+from app.core.config import COUNT_CACHE_TTL_SECONDS, GENRE_LIST_CACHE_TTL_SECONDS
+from app.core.http_cache import Validators, latest, make_etag
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.async_facade import AsyncFacade
 from app.repositories.movie_repository import MovieRepository
 from app.repositories.director_repository import DirectorRepository
 from app.repositories.genre_repository import GenreRepository
-from app.schemas.schemas import MovieResponse, DirectorInMovieResponse
+from app.services.movie_cache import movie_cache
+from app.services.reference_cache import ReferenceData, reference_cache
+from app.schemas.schemas import (
+    DirectorInMovieResponse,
+    DirectorSummary,
+    GenreSummary,
+    MovieBatchItemResult,
+    MovieResponse,
+    MovieSearchResult,
+    MovieWithHistogramResponse,
+    RatingBatchItemResult,
+    ScoreHistogram,
+    TopMovieResult,
+)
+
+CountStrategy = Literal["exact", "estimated", "none"]
+
+# shared by all requests in this process
+estimated_count_cache = TTLCache(ttl=COUNT_CACHE_TTL_SECONDS)
+genre_list_cache = TTLCache(ttl=GENRE_LIST_CACHE_TTL_SECONDS)
+
+
+def _average(ratings_sum, ratings_count: int) -> Optional[float]:
+    # SUM(bigint) comes back as Decimal on PostgreSQL
+    return float(ratings_sum) / ratings_count if ratings_count else None
 
 
 class MovieService:
@@ -21,21 +50,15 @@ class MovieService:
         self.director_repo = director_repo
         self.genre_repo = genre_repo
 
-    def _calc_rating_stats(self, movie) -> Tuple[Optional[float], int]:
-        ratings = getattr(movie, "ratings", []) or []
-        scores = [r.score for r in ratings if r is not None and getattr(r, "score", None) is not None]
-        if not scores:
-            return None, 0
-        return sum(scores) / len(scores), len(scores)
-
-    def _movie_to_response(self, movie) -> MovieResponse:
-        avg, cnt = self._calc_rating_stats(movie)
-        return MovieResponse(
+    def _movie_to_response(self, movie, avg: Optional[float], cnt: int) -> MovieResponse:
+        # model_construct: every value comes from typed columns, so pydantic
+        # validation would only re-check what the database already guarantees
+        return MovieResponse.model_construct(
             id=movie.id,
             title=movie.title,
             release_year=movie.release_year,
             cast=movie.cast or "",
-            director=DirectorInMovieResponse.model_validate(movie.director),
+            director=DirectorInMovieResponse.model_construct(id=movie.director.id, name=movie.director.name),
             genres=[g.name for g in getattr(movie, "genres", [])],
             average_rating=avg,
             ratings_count=cnt,
@@ -48,38 +71,398 @@ class MovieService:
         title: Optional[str] = None,
         release_year: Optional[int] = None,
         genre_name: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count: CountStrategy = "exact",
+        director_id: Optional[int] = None,
+        genre_id: Optional[int] = None,
     ) -> Dict[str, Any]:
-        skip = (page - 1) * page_size
+        """
+        `cursor` switches to keyset pagination and takes precedence over `page`.
+        `count` picks how total_items is produced (see _count_total).
+        `director_id` / `genre_id` scope the list (browse endpoints).
+        Raises ValueError for a malformed cursor.
+        """
+        return self.get_movies_list_with_validators(
+            page, page_size, title, release_year, genre_name, cursor, count, director_id, genre_id
+        )[0]
 
-        movies = self.movie_repo.get_all(
-            skip=skip,
-            limit=page_size,
-            title=title,
-            release_year=release_year,
-            genre_name=genre_name,
+    def get_movies_list_with_validators(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        title: Optional[str] = None,
+        release_year: Optional[int] = None,
+        genre_name: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count: CountStrategy = "exact",
+        director_id: Optional[int] = None,
+        genre_id: Optional[int] = None,
+    ) -> Tuple[Dict[str, Any], Validators]:
+        """
+        get_movies_list plus the page's ETag, built from the rows already
+        fetched (equal to get_movies_list_validators for the same page).
+        """
+        after_id, skip = self._page_position(page, page_size, cursor)
+        filters = self._list_filters(title, release_year, genre_name, director_id, genre_id)
+
+        # one extra row tells us whether a next page exists
+        if count == "exact" and after_id is None:
+            # rows and total in a single statement via count(*) OVER ()
+            rows, total_items = self.movie_repo.get_all_with_total(
+                skip=skip, limit=page_size + 1, **filters
+            )
+            if total_items is None:
+                total_items = self.movie_repo.get_total_count(**filters) if skip else 0
+        else:
+            # a window count after a keyset seek would only see the remaining rows
+            rows = self.movie_repo.get_all(
+                skip=skip, limit=page_size + 1, after_id=after_id, **filters
+            )
+            total_items = self._count_total(count, filters)
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1][0].id) if has_more else None
+        validators = self._list_validators(
+            page, page_size, cursor, count, filters, total_items,
+            [(movie.id, movie.version, cnt) for movie, _, cnt in rows], has_more,
         )
 
-        total_items = self.movie_repo.get_total_count(
-            title=title,
-            release_year=release_year,
-            genre_name=genre_name,
+        return {
+            "status": "success",
+            "data": {
+                "page": None if cursor else page,
+                "page_size": page_size,
+                "next_cursor": next_cursor,
+                "total_items": total_items,
+                "count_strategy": count,
+                "items": [self._movie_to_response(*row) for row in rows],
+            },
+        }, validators
+
+    @staticmethod
+    def _list_filters(
+        title: Optional[str],
+        release_year: Optional[int],
+        genre_name: Optional[str],
+        director_id: Optional[int],
+        genre_id: Optional[int],
+    ) -> Dict[str, Any]:
+        filters = {"title": title, "release_year": release_year, "genre_name": genre_name}
+        # only when set: plain list pages keep their ETags and count-cache keys
+        if director_id is not None:
+            filters["director_id"] = director_id
+        if genre_id is not None:
+            filters["genre_id"] = genre_id
+        return filters
+
+    @staticmethod
+    def _page_position(page: int, page_size: int, cursor: Optional[str]) -> Tuple[Optional[int], int]:
+        # (after_id, skip); raises ValueError for a malformed cursor
+        if cursor:
+            return decode_cursor(cursor), 0
+        return None, (page - 1) * page_size
+
+    def get_movies_list_validators(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        title: Optional[str] = None,
+        release_year: Optional[int] = None,
+        genre_name: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count: CountStrategy = "exact",
+        director_id: Optional[int] = None,
+        genre_id: Optional[int] = None,
+    ) -> Validators:
+        """
+        ETag of the page get_movies_list would return, from one narrow query
+        (ids, versions, rating counts) instead of the page. Only needed to
+        answer If-None-Match; a full GET takes the tag from its own rows.
+        """
+        after_id, skip = self._page_position(page, page_size, cursor)
+        filters = self._list_filters(title, release_year, genre_name, director_id, genre_id)
+
+        exact_in_page = count == "exact" and after_id is None
+        rows, total_items = self.movie_repo.get_page_versions(
+            skip=skip, limit=page_size + 1, after_id=after_id, with_total=exact_in_page, **filters
+        )
+        if not exact_in_page:
+            total_items = self._count_total(count, filters)
+        elif total_items is None:
+            total_items = self.movie_repo.get_total_count(**filters) if skip else 0
+
+        # the extra row only decides whether next_cursor is set
+        return self._list_validators(
+            page, page_size, cursor, count, filters, total_items,
+            [row[:3] for row in rows[:page_size]], len(rows) > page_size,
         )
 
+    @staticmethod
+    def _list_validators(
+        page: int,
+        page_size: int,
+        cursor: Optional[str],
+        count: CountStrategy,
+        filters: Dict[str, Any],
+        total_items: Optional[int],
+        versions: List[Tuple[int, int, int]],
+        has_more: bool,
+    ) -> Validators:
+        # ETag only: the newest timestamp on the page does not move when a row
+        # is deleted or starts matching, so Last-Modified could answer 304 wrongly
+        fingerprint = versions, has_more
+        return Validators(
+            etag=make_etag("list", page, page_size, cursor, count, sorted(filters.items()), total_items, fingerprint),
+        )
+
+    def search_movies(
+        self,
+        text: str,
+        page: int = 1,
+        page_size: int = 10,
+        genre_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        rows = self.movie_repo.search(
+            text,
+            skip=(page - 1) * page_size,
+            limit=page_size,
+            genre_name=genre_name,
+        )
+        items = [
+            MovieSearchResult.model_construct(
+                **dict(self._movie_to_response(movie, avg, cnt)),
+                rank=rank,
+                highlight=highlight,
+            )
+            for movie, avg, cnt, rank, highlight in rows
+        ]
         return {
             "status": "success",
             "data": {
+                "query": text,
                 "page": page,
                 "page_size": page_size,
-                "total_items": total_items,
-                "items": [self._movie_to_response(m).model_dump() for m in movies],
+                "items": items,
+            },
+        }
+
+    def get_top_movies(
+        self,
+        limit: int = 10,
+        genre_name: Optional[str] = None,
+        release_year: Optional[int] = None,
+        min_votes: int = 1,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Leaderboard by damped average, read best-first from the score indexes
+        (see MovieRepository.top_rated). None if `genre_name` is unknown.
+        """
+        genre_id = None
+        if genre_name:
+            genre_id = self._genre_id(genre_name)
+            if genre_id is None:
+                return None
+
+        rows = self.movie_repo.top_rated(
+            limit, genre_id=genre_id, release_year=release_year, min_votes=min_votes
+        )
+        items = [
+            TopMovieResult.model_construct(
+                **dict(self._movie_to_response(movie, avg, cnt)),
+                rank=rank,
+                score=score,
+            )
+            for rank, (movie, avg, cnt, score) in enumerate(rows, start=1)
+        ]
+        return {
+            "status": "success",
+            "data": {
+                "genre": genre_name,
+                "release_year": release_year,
+                "min_votes": min_votes,
+                "items": items,
             },
         }
 
-    def get_movie_by_id(self, movie_id: int) -> Optional[MovieResponse]:
-        movie = self.movie_repo.get_by_id(movie_id)
-        if not movie:
+    def get_directors_page(self, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
+        """
+        Directors by id, each with movies_count, ratings_count and the
+        average of all ratings of their movies, from one grouped query.
+        """
+        skip = (page - 1) * page_size
+        rows, total_items = self.director_repo.get_page_with_stats(skip=skip, limit=page_size)
+        if total_items is None:
+            total_items = self.director_repo.count() if skip else 0
+        items = [
+            DirectorSummary.model_construct(
+                id=director.id,
+                name=director.name,
+                birth_year=director.birth_year,
+                description=director.description,
+                movies_count=movies_count,
+                ratings_count=ratings_count,
+                average_rating=_average(ratings_sum, ratings_count),
+            )
+            for director, movies_count, ratings_count, ratings_sum in rows
+        ]
+        return {
+            "status": "success",
+            "data": {"page": page, "page_size": page_size, "total_items": total_items, "items": items},
+        }
+
+    def get_genres_page(self, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
+        """
+        Same as get_directors_page for genres. The genre list is small and
+        read often, so pages are reused for GENRE_LIST_CACHE_TTL_SECONDS and
+        dropped on every movie or rating write made through this process.
+        """
+        key = (page, page_size)
+        result = genre_list_cache.get(key)
+        if result is not None:
+            return result
+
+        skip = (page - 1) * page_size
+        rows, total_items = self.genre_repo.get_page_with_stats(skip=skip, limit=page_size)
+        if total_items is None:
+            total_items = self.genre_repo.count() if skip else 0
+        items = [
+            GenreSummary.model_construct(
+                id=genre.id,
+                name=genre.name,
+                description=genre.description,
+                movies_count=movies_count,
+                ratings_count=ratings_count,
+                average_rating=_average(ratings_sum, ratings_count),
+            )
+            for genre, movies_count, ratings_count, ratings_sum in rows
+        ]
+        result = {
+            "status": "success",
+            "data": {"page": page, "page_size": page_size, "total_items": total_items, "items": items},
+        }
+        genre_list_cache.set(key, result)
+        return result
+
+    def director_exists(self, director_id: int) -> bool:
+        return bool(self._existing_director_ids([director_id], self._reference_data()))
+
+    def genre_exists(self, genre_id: int) -> bool:
+        return bool(self._existing_genre_ids([genre_id], self._reference_data()))
+
+    def _genre_id(self, name: str) -> Optional[int]:
+        data = self._reference_data()
+        if data is not None:
+            lowered = name.lower()
+            genre_id = next((i for i, genre in data.genres.items() if genre.lower() == lowered), None)
+            if genre_id is not None:
+                return genre_id
+        # not in the snapshot: it may have been added since it was loaded
+        return self.movie_repo.genre_id_by_name(name)
+
+    def _count_total(self, count: CountStrategy, filters: Dict[str, Any]) -> Optional[int]:
+        """
+        exact     -> COUNT(*) with the same filters
+        estimated -> planner estimate, reused per filter set for COUNT_CACHE_TTL_SECONDS
+        none      -> not counted (infinite-scroll clients)
+        """
+        if count == "none":
+            return None
+        if count == "exact":
+            return self.movie_repo.get_total_count(**filters)
+
+        key = tuple(sorted(filters.items()))
+        total = estimated_count_cache.get(key)
+        if total is None:
+            total = self.movie_repo.estimate_total_count(**filters)
+            estimated_count_cache.set(key, total)
+        return total
+
+    def get_movie_by_id(self, movie_id: int, with_histogram: bool = False) -> Optional[MovieResponse]:
+        """
+        `with_histogram` returns a MovieWithHistogramResponse (adds
+        score_histogram from the aggregate row, cached separately).
+        """
+        if movie_cache is not None:
+            movie = movie_cache.get_or_load(movie_id, lambda: self._load_movie(movie_id))
+        else:
+            movie = self._load_movie(movie_id)
+        if movie is None or not with_histogram:
+            return movie
+
+        histogram = self.get_score_histogram(movie_id)
+        if histogram is None:
+            # deleted in between
+            return None
+        return MovieWithHistogramResponse.model_construct(**dict(movie), score_histogram=histogram.counts)
+
+    def get_score_histogram(self, movie_id: int) -> Optional[ScoreHistogram]:
+        if movie_cache is not None:
+            return movie_cache.get_or_load_histogram(movie_id, lambda: self._load_histogram(movie_id))
+        return self._load_histogram(movie_id)
+
+    def _load_histogram(self, movie_id: int) -> Optional[ScoreHistogram]:
+        counts = self.movie_repo.get_score_histogram(movie_id)
+        if counts is None:
+            return None
+        return ScoreHistogram.model_construct(movie_id=movie_id, ratings_count=sum(counts.values()), counts=counts)
+
+    def get_movie_validators(self, movie_id: int) -> Optional[Validators]:
+        """
+        Validators for GET /movies/{movie_id}: a cache hit or one primary-key
+        lookup, never a full response build. None if the movie does not exist.
+        """
+        if movie_cache is not None:
+            return movie_cache.get_or_load_validators(movie_id, lambda: self._load_validators(movie_id))
+        return self._load_validators(movie_id)
+
+    def _load_validators(self, movie_id: int) -> Optional[Validators]:
+        row = self.movie_repo.get_version(movie_id)
+        if not row:
+            return None
+        movie_id, version, ratings_count, updated_at, stats_updated_at = row
+        return Validators(
+            etag=make_etag("movie", movie_id, version, ratings_count),
+            last_modified=latest((updated_at, stats_updated_at)),
+        )
+
+    def _load_movie(self, movie_id: int) -> Optional[MovieResponse]:
+        row = self.movie_repo.get_by_id(movie_id)
+        if not row:
             return None
-        return self._movie_to_response(movie)
+        return self._movie_to_response(*row)
+
+    @staticmethod
+    def _invalidate(*movie_ids: int) -> None:
+        # call only after the write is committed
+        if movie_cache is not None:
+            movie_cache.invalidate_many(movie_ids)
+        if movie_ids:
+            # genre pages aggregate the movies' counts and ratings
+            genre_list_cache.clear()
+
+    @staticmethod
+    def _reference_data() -> Optional[ReferenceData]:
+        # None while the cache is disabled, loading or just invalidated
+        return reference_cache.current() if reference_cache is not None else None
+
+    # The snapshot only answers positive lookups: an id missing from it may have
+    # been inserted since it was loaded (another worker, import_tmdb,
+    # generate_data), so misses are checked against the database
+
+    def _existing_director_ids(self, director_ids: Iterable[int], data: Optional[ReferenceData]) -> Set[int]:
+        ids = set(director_ids)
+        found = {i for i in ids if i in data.directors} if data is not None else set()
+        if ids - found:
+            found |= self.movie_repo.existing_director_ids(ids - found)
+        return found
+
+    def _existing_genre_ids(self, genre_ids: Iterable[int], data: Optional[ReferenceData]) -> Set[int]:
+        ids = set(genre_ids)
+        found = {i for i in ids if i in data.genres} if data is not None else set()
+        if ids - found:
+            found |= self.movie_repo.existing_genre_ids(ids - found)
+        return found
 
     def create_movie(
         self,
@@ -89,42 +472,219 @@ class MovieService:
         cast: str,
         genre_ids: List[int],
     ) -> Optional[MovieResponse]:
-        if not self.movie_repo.director_exists(director_id):
-            return None
-        if not self.movie_repo.genres_exist(genre_ids):
+        data = self._reference_data()
+        if director_id not in self._existing_director_ids([director_id], data) \
+                or set(genre_ids) - self._existing_genre_ids(genre_ids, data):
             return None
 
-        created_movie = self.movie_repo.create(
+        movie_id = self.movie_repo.create_many([
+            {
+                "title": title,
+                "director_id": director_id,
+                "release_year": release_year,
+                "cast": cast,
+                "genre_ids": genre_ids,
+            }
+        ])[0]
+        genre_list_cache.clear()
+        if data is None or director_id not in data.directors or any(g not in data.genres for g in genre_ids):
+            return self._load_movie(movie_id)
+        # everything in the response is known already: no read-back
+        return MovieResponse.model_construct(
+            id=movie_id,
             title=title,
-            director_id=director_id,
             release_year=release_year,
-            cast=cast,
-            genre_ids=genre_ids,
+            cast=cast or "",
+            director=DirectorInMovieResponse.model_construct(id=director_id, name=data.directors[director_id]),
+            genres=[data.genres[g] for g in dict.fromkeys(genre_ids)],
+            average_rating=None,
+            ratings_count=0,
         )
-        return self._movie_to_response(created_movie)
 
     def update_movie(self, movie_id: int, movie_data: dict) -> Optional[MovieResponse]:
-        if "director_id" in movie_data and movie_data["director_id"]:
-            if not self.movie_repo.director_exists(movie_data["director_id"]):
+        data = self._reference_data()
+        if movie_data.get("director_id"):
+            if movie_data["director_id"] not in self._existing_director_ids([movie_data["director_id"]], data):
                 return None
 
-        if "genres" in movie_data and movie_data["genres"]:
-            if not self.movie_repo.genres_exist(movie_data["genres"]):
+        if movie_data.get("genres"):
+            if set(movie_data["genres"]) - self._existing_genre_ids(movie_data["genres"], data):
                 return None
 
-        updated_movie = self.movie_repo.update(
-            movie_id=movie_id,
-            title=movie_data.get("title"),
-            director_id=movie_data.get("director_id"),
-            release_year=movie_data.get("release_year"),
-            cast=movie_data.get("cast"),
-            genre_ids=movie_data.get("genres"),
+        if not self.movie_repo.movie_exists(movie_id):
+            return None
+
+        change = {
+            field: movie_data[field]
+            for field in ("title", "director_id", "release_year", "cast")
+            if movie_data.get(field) is not None
+        }
+        if movie_data.get("genres") is not None:
+            change["genre_ids"] = movie_data["genres"]
+        self.movie_repo.update_many([{"id": movie_id, **change}])
+
+        self._invalidate(movie_id)
+        return self._load_movie(movie_id)
+
+    def _reference_errors(self, items: List[dict]) -> List[Optional[str]]:
+        """
+        Per-item error for unknown directors / genres, answered from the
+        reference-data cache; ids it does not know (or all of them, when it is
+        not loaded) cost one query for directors and one for genres.
+        A missing or falsy director_id is not checked (as in update_movie).
+        """
+        data = self._reference_data()
+        directors = self._existing_director_ids(
+            {item["director_id"] for item in items if item.get("director_id")}, data
         )
+        genres = self._existing_genre_ids({g for item in items for g in item.get("genres") or ()}, data)
+        errors: List[Optional[str]] = []
+        for item in items:
+            error = None
+            if item.get("director_id") and item["director_id"] not in directors:
+                error = f"Director with id {item['director_id']} not found."
+            else:
+                missing = sorted(set(item.get("genres") or ()) - genres)
+                if missing:
+                    error = f"Genres not found: {missing}"
+            errors.append(error)
+        return errors
 
-        if not updated_movie:
-            return None
+    @staticmethod
+    def _batch_summary(results: List[MovieBatchItemResult], done: str) -> Dict[str, Any]:
+        succeeded = sum(1 for r in results if r.status == done)
+        return {
+            "status": "success",
+            "data": {
+                done: succeeded,
+                "failed": len(results) - succeeded,
+                "items": results,
+            },
+        }
+
+    def create_movies_batch(self, items: List[dict]) -> Dict[str, Any]:
+        """
+        Create many movies (MovieCreate dicts). Items referencing unknown
+        directors or genres are reported individually; the valid ones are
+        inserted with bulk statements in one transaction.
+        """
+        results = [MovieBatchItemResult(index=i, status="failed") for i in range(len(items))]
+        errors = self._reference_errors(items)
+        valid = []
+        for r, item, error in zip(results, items, errors):
+            if error is None:
+                valid.append((r, item))
+            else:
+                r.error = error
 
-        return self._movie_to_response(updated_movie)
+        new_ids = self.movie_repo.create_many([
+            {
+                "title": item["title"],
+                "director_id": item["director_id"],
+                "release_year": item["release_year"],
+                "cast": item["cast"],
+                "genre_ids": item["genres"],
+            }
+            for _, item in valid
+        ])
+        for (r, _), movie_id in zip(valid, new_ids):
+            r.status, r.id = "created", movie_id
+        if new_ids:
+            genre_list_cache.clear()
+        return self._batch_summary(results, "created")
+
+    def update_movies_batch(self, items: List[dict]) -> Dict[str, Any]:
+        """
+        Partially update many movies (MovieUpdate dicts plus `id`; None means
+        unchanged, as in update_movie). Unknown or repeated movie ids and
+        unknown references are reported per item; the rest are written in one
+        transaction and dropped from the cache.
+        """
+        results = [MovieBatchItemResult(index=i, id=item["id"], status="failed") for i, item in enumerate(items)]
+        existing = self.movie_repo.existing_movie_ids(item["id"] for item in items)
+        errors = self._reference_errors(items)
+
+        changes, seen = [], set()
+        for r, item, error in zip(results, items, errors):
+            if item["id"] not in existing:
+                error = f"Movie with id {item['id']} not found."
+            elif item["id"] in seen:
+                error = "Duplicate movie id in batch."
+            seen.add(item["id"])
+            if error is not None:
+                r.error = error
+                continue
+            change = {
+                field: item[field]
+                for field in ("title", "director_id", "release_year", "cast")
+                if item.get(field) is not None
+            }
+            if item.get("genres") is not None:
+                change["genre_ids"] = item["genres"]
+            changes.append({"id": item["id"], **change})
+            r.status = "updated"
+
+        self.movie_repo.update_many(changes)
+        self._invalidate(*(change["id"] for change in changes))
+        return self._batch_summary(results, "updated")
 
     def delete_movie(self, movie_id: int) -> bool:
-        return self.movie_repo.delete(movie_id)
+        deleted = self.movie_repo.delete(movie_id)
+        if deleted:
+            self._invalidate(movie_id)
+        return deleted
+
+    def movie_exists(self, movie_id: int) -> bool:
+        return self.movie_repo.movie_exists(movie_id)
+
+    def add_rating(self, movie_id: int, score: int):
+        rating = self.movie_repo.add_rating(movie_id=movie_id, score=score)
+        if rating is not None:
+            self._invalidate(movie_id)
+        return rating
+
+    def add_ratings_batch(self, items: List[Tuple[int, int]]) -> Dict[str, Any]:
+        """
+        Validate and insert many (movie_id, score) pairs at once. Invalid items
+        are reported individually; the valid ones are written in one transaction.
+        """
+        results = [
+            RatingBatchItemResult(index=i, movie_id=movie_id, score=score, status="failed")
+            for i, (movie_id, score) in enumerate(items)
+        ]
+        valid = [r for r in results if 1 <= r.score <= 10]
+        for r in results:
+            if not 1 <= r.score <= 10:
+                r.error = "Invalid rating value"
+
+        rating_ids = self.movie_repo.add_ratings_bulk([(r.movie_id, r.score) for r in valid])
+        for r, rating_id in zip(valid, rating_ids):
+            if rating_id is None:
+                r.error = f"Movie with id {r.movie_id} not found."
+            else:
+                r.status, r.rating_id = "created", rating_id
+        self._invalidate(*{r.movie_id for r in results if r.status == "created"})
+
+        created = sum(1 for r in results if r.status == "created")
+        return {
+            "status": "success",
+            "data": {
+                "created": created,
+                "failed": len(results) - created,
+                "items": results,
+            },
+        }
+
+
+class AsyncMovieService(AsyncFacade):
+    """
+    MovieService over an AsyncSession (DB_ASYNC=true): same methods, awaitable.
+    """
+
+    @staticmethod
+    def build(db) -> MovieService:
+        return MovieService(
+            movie_repo=MovieRepository(db),
+            director_repo=DirectorRepository(db),
+            genre_repo=GenreRepository(db),
+        )
@@ -0,0 +1,265 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    RATING_BUFFER_ENABLED,
+    RATING_BUFFER_FLUSH_MS,
+    RATING_BUFFER_FLUSH_RETRIES,
+    RATING_BUFFER_MAX_BATCH,
+    RATING_BUFFER_MAX_SIZE,
+    RATING_BUFFER_PUT_TIMEOUT_MS,
+    RATING_BUFFER_RETRY_BACKOFF_MS,
+    RATING_BUFFER_SYNC_THRESHOLD,
+)
+from app.core.logger import get_logger
+from app.core.metrics import Histogram
+from app.db.database import SessionLocal
+from app.repositories.movie_repository import MovieRepository
+from app.services.movie_cache import movie_cache
+from app.services.movie_service import genre_list_cache
+
+logger = get_logger("movie_rating")
+
+
+class RatingBufferFull(Exception):
+    """The queue stayed full for the whole put timeout (backpressure)."""
+
+
+class RatingBuffer:
+    """
+    In-process write-behind queue for ratings.
+
+    Requests enqueue (movie_id, score) pairs; one background thread coalesces
+    them into batches (every `flush_interval_ms` or `max_batch` rows) and
+    writes each batch with MovieRepository.add_ratings_bulk, i.e. one INSERT
+    and one aggregate update per batch. Queued ratings live only in memory
+    until flushed; stop() drains the queue on shutdown.
+
+    The requests were already answered with 202, so a failed flush is not
+    simply dropped: errors are retried with exponential backoff, and a
+    constraint violation (e.g. a movie deleted after its existence check)
+    makes the batch go in row by row, so only the offending ratings are lost.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_size: int = RATING_BUFFER_MAX_SIZE,
+        flush_interval_ms: int = RATING_BUFFER_FLUSH_MS,
+        max_batch: int = RATING_BUFFER_MAX_BATCH,
+        sync_threshold: int = RATING_BUFFER_SYNC_THRESHOLD,
+        put_timeout_ms: int = RATING_BUFFER_PUT_TIMEOUT_MS,
+        retries: int = RATING_BUFFER_FLUSH_RETRIES,
+        retry_backoff_ms: int = RATING_BUFFER_RETRY_BACKOFF_MS,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch = max_batch
+        self.sync_threshold = sync_threshold
+        self.put_timeout = put_timeout_ms / 1000
+        self.retries = retries
+        self.retry_backoff = retry_backoff_ms / 1000
+        self._queue: "queue.Queue[Tuple[int, int]]" = queue.Queue(maxsize=max_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # held across submit's running check and its put, and by stop() while it
+        # closes the buffer: nothing is enqueued once the final drain may have run
+        self._accept_lock = threading.Lock()
+
+        # bumped by request threads (queued, sync_fallbacks, rejected) and by the flusher
+        self._counts_lock = threading.Lock()
+        self.queued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.retried = 0
+        self.row_fallbacks = 0
+        self.sync_fallbacks = 0
+        self.rejected = 0
+        self.flush_seconds = Histogram()
+        self.batch_sizes = Histogram(buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000))
+
+    @property
+    def depth(self) -> int:
+        """Ratings waiting in the queue."""
+        return self._queue.qsize()
+
+    @property
+    def pending(self) -> int:
+        """Ratings accepted but not yet written (queue plus the batch being collected)."""
+        with self._counts_lock:
+            return self.queued - self.flushed - self.dropped
+
+    def submit(self, movie_id: int, score: int) -> bool:
+        """
+        Queue one rating. Returns False when the caller should write it
+        synchronously (pending ratings at the sync threshold, or flusher not running);
+        raises RatingBufferFull if the queue stays full for the put timeout.
+        """
+        with self._accept_lock:
+            if self._thread is None or self._stop.is_set() or self.pending >= self.sync_threshold:
+                with self._counts_lock:
+                    self.sync_fallbacks += 1
+                return False
+            try:
+                self._queue.put((movie_id, score), timeout=self.put_timeout)
+            except queue.Full:
+                with self._counts_lock:
+                    self.rejected += 1
+                raise RatingBufferFull()
+            with self._counts_lock:
+                self.queued += 1
+        return True
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rating-buffer-flusher", daemon=True)
+        self._thread.start()
+        logger.info(
+            "Rating buffer started (flush_ms=%.0f, max_batch=%s, max_size=%s, sync_threshold=%s)",
+            self.flush_interval * 1000, self.max_batch, self._queue.maxsize, self.sync_threshold,
+        )
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """
+        Stop accepting ratings and flush everything still queued. If the
+        flusher does not finish within `timeout` the buffer stays marked as
+        running (it is still writing); call stop() again to keep waiting.
+        """
+        if self._thread is None:
+            return
+        with self._accept_lock:
+            self._stop.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error("Rating buffer did not drain in %ss (depth=%s)", timeout, self.depth)
+            return
+        # the flusher has exited; write whatever it did not see, on this thread
+        while True:
+            batch = self._collect()
+            if not batch:
+                break
+            self._flush(batch)
+        self._thread = None
+        logger.info("Rating buffer stopped (flushed=%s, dropped=%s)", self.flushed, self.dropped)
+
+    def _collect(self) -> List[Tuple[int, int]]:
+        """Wait for a first rating, then gather more until the window closes or the batch is full."""
+        draining = self._stop.is_set()
+        try:
+            batch = [self._queue.get(timeout=0 if draining else self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + (0 if draining else self.flush_interval)
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if batch:
+                self._flush(batch)
+            elif self._stop.is_set():
+                return
+
+    def _write(self, batch: List[Tuple[int, int]]) -> List[Optional[int]]:
+        """add_ratings_bulk, retried with exponential backoff; row by row after a constraint error."""
+        for attempt in range(self.retries + 1):
+            try:
+                db = self.session_factory()
+                try:
+                    return MovieRepository(db).add_ratings_bulk(batch)
+                finally:
+                    db.close()
+            except IntegrityError:
+                # retrying the same batch would fail the same way
+                logger.warning("Rating buffer batch of %s violated a constraint, inserting row by row", len(batch))
+                with self._counts_lock:
+                    self.row_fallbacks += 1
+                return self._write_rows(batch)
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                delay = self.retry_backoff * 2 ** attempt
+                with self._counts_lock:
+                    self.retried += 1
+                logger.warning(
+                    "Rating buffer flush failed (attempt %s of %s), retrying in %.2fs",
+                    attempt + 1, self.retries + 1, delay, exc_info=True,
+                )
+                time.sleep(delay)
+
+    def _write_rows(self, batch: List[Tuple[int, int]]) -> List[Optional[int]]:
+        rating_ids: List[Optional[int]] = []
+        for movie_id, score in batch:
+            try:
+                db = self.session_factory()
+                try:
+                    rating_ids.append(MovieRepository(db).add_ratings_bulk([(movie_id, score)])[0])
+                finally:
+                    db.close()
+            except Exception:
+                logger.error("Rating buffer could not write rating (movie_id=%s)", movie_id, exc_info=True)
+                rating_ids.append(None)
+        return rating_ids
+
+    def _flush(self, batch: List[Tuple[int, int]]) -> None:
+        start = time.perf_counter()
+        try:
+            rating_ids = self._write(batch)
+        except Exception:
+            with self._counts_lock:
+                self.dropped += len(batch)
+            logger.error(
+                "Rating buffer flush failed after %s attempts, %s ratings dropped",
+                self.retries + 1, len(batch), exc_info=True,
+            )
+            return
+
+        written = {movie_id for (movie_id, _), rating_id in zip(batch, rating_ids) if rating_id is not None}
+        if movie_cache is not None:
+            movie_cache.invalidate_many(written)
+        if written:
+            genre_list_cache.clear()
+
+        lost = sum(1 for rating_id in rating_ids if rating_id is None)
+        with self._counts_lock:
+            self.flushed += len(batch) - lost
+            self.dropped += lost
+        if lost:
+            logger.warning("Rating buffer dropped %s ratings that could not be written (e.g. movie deleted)", lost)
+        self.flush_seconds.observe(time.perf_counter() - start)
+        self.batch_sizes.observe(len(batch))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "running": self._thread is not None,
+            "depth": self.depth,
+            "pending": self.pending,
+            "max_size": self._queue.maxsize,
+            "sync_threshold": self.sync_threshold,
+            "queued": self.queued,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "retried": self.retried,
+            "row_fallbacks": self.row_fallbacks,
+            "sync_fallbacks": self.sync_fallbacks,
+            "rejected": self.rejected,
+            "flush_seconds": self.flush_seconds.snapshot(),
+            "batch_sizes": self.batch_sizes.snapshot(),
+        }
+
+
+# Process-wide buffer; started/stopped by the app lifespan when enabled
+rating_buffer: Optional[RatingBuffer] = RatingBuffer(SessionLocal) if RATING_BUFFER_ENABLED else None
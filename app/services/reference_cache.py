@@ -0,0 +1,194 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import (
+    REFERENCE_CACHE_CHECK_SECONDS,
+    REFERENCE_CACHE_ENABLED,
+    REFERENCE_CACHE_TTL_SECONDS,
+)
+from app.core.logger import get_logger
+from app.db.database import SessionLocal
+from app.models.models import Director, Genre
+from app.repositories.director_repository import DirectorRepository
+from app.repositories.genre_repository import GenreRepository
+
+logger = get_logger("movie_rating")
+
+# (genres count, max id, directors count, max id)
+Fingerprint = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    """Immutable snapshot; readers grab the current one without locking."""
+
+    genres: Dict[int, str]
+    directors: Dict[int, str]
+    fingerprint: Fingerprint
+    loaded_at: float
+
+
+class ReferenceCache:
+    """
+    Process-local copy of genres and directors (id -> name).
+
+    Loaded at startup. A background thread then runs a cheap fingerprint
+    query (row count and max id per table) every `check_interval` seconds and
+    reloads when it changed, or unconditionally after `ttl` seconds (renames
+    do not move the fingerprint). ORM writes to either table in this process
+    invalidate the snapshot on commit; until it is reloaded current() returns
+    None and callers fall back to the database, so a reader never sees data
+    older than this process' own writes.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], ttl: float, check_interval: float):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._data: Optional[ReferenceData] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.loads = 0
+        self.checks = 0
+        self.invalidations = 0
+        self.failures = 0
+
+    def current(self) -> Optional[ReferenceData]:
+        return self._data
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data = None
+            self.invalidations += 1
+        self._wake.set()
+
+    def refresh(self, force: bool = False) -> None:
+        """Reload if forced, expired, missing or the fingerprint moved."""
+        with self._lock:
+            generation = self._generation
+        data = self._data
+        db = self.session_factory()
+        try:
+            fingerprint = GenreRepository.fingerprint(db) + DirectorRepository.fingerprint(db)
+            self.checks += 1
+            expired = data is None or time.monotonic() - data.loaded_at >= self.ttl
+            if not force and not expired and fingerprint == data.fingerprint:
+                return
+            fresh = ReferenceData(
+                genres=GenreRepository.get_names(db),
+                directors=DirectorRepository.get_names(db),
+                fingerprint=fingerprint,
+                loaded_at=time.monotonic(),
+            )
+        finally:
+            db.close()
+        with self._lock:
+            # a write committed while we were reading: keep the snapshot empty, the
+            # pending wake-up reloads it
+            if self._generation == generation:
+                self._data = fresh
+                self.loads += 1
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        try:
+            self.refresh(force=True)
+        except Exception:
+            # not fatal: callers use the database until the refresher succeeds
+            self.failures += 1
+            logger.error("Reference data cache initial load failed", exc_info=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reference-cache-refresher", daemon=True)
+        self._thread.start()
+        data = self._data
+        logger.info(
+            "Reference data cache started (genres=%s, directors=%s, check_s=%s, ttl_s=%s)",
+            len(data.genres) if data else None, len(data.directors) if data else None,
+            self.check_interval, self.ttl,
+        )
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.check_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.refresh()
+            except Exception:
+                self.failures += 1
+                logger.error("Reference data cache refresh failed", exc_info=True)
+
+    def stats(self) -> Dict[str, Any]:
+        data = self._data
+        return {
+            "loaded": data is not None,
+            "genres": len(data.genres) if data else None,
+            "directors": len(data.directors) if data else None,
+            "age_seconds": round(time.monotonic() - data.loaded_at, 1) if data else None,
+            "check_seconds": self.check_interval,
+            "ttl_seconds": self.ttl,
+            "loads": self.loads,
+            "checks": self.checks,
+            "invalidations": self.invalidations,
+            "failures": self.failures,
+        }
+
+
+# Process-wide cache (None when REFERENCE_CACHE_ENABLED is off); started by the app lifespan
+reference_cache: Optional[ReferenceCache] = (
+    ReferenceCache(SessionLocal, REFERENCE_CACHE_TTL_SECONDS, REFERENCE_CACHE_CHECK_SECONDS)
+    if REFERENCE_CACHE_ENABLED else None
+)
+
+_REFERENCE_TABLES = (Genre.__table__, Director.__table__)
+
+
+def _mark_if_reference_write(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (Genre, Director)):
+            session.info["reference_data_written"] = True
+            return
+
+
+def _mark_if_reference_dml(orm_execute_state: ORMExecuteState) -> None:
+    # bulk insert/update/delete statements bypass the flush
+    if orm_execute_state.is_select:
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None and table in _REFERENCE_TABLES:
+        orm_execute_state.session.info["reference_data_written"] = True
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop("reference_data_written", False) and reference_cache is not None:
+        reference_cache.invalidate()
+
+
+def _forget_after_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop("reference_data_written", None)
+
+
+if reference_cache is not None:
+    event.listen(Session, "after_flush", _mark_if_reference_write)
+    event.listen(Session, "do_orm_execute", _mark_if_reference_dml)
+    event.listen(Session, "after_commit", _invalidate_after_commit)
+    event.listen(Session, "after_soft_rollback", _forget_after_rollback)
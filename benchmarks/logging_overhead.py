@@ -0,0 +1,148 @@
+"""Logging cost on the request thread.
+
+Emits the two INFO lines a typical request logs ("Fetching movies list" and
+"Request DB stats") through four pipelines and times each call on the
+calling thread:
+
+* legacy   - StreamHandler + RotatingFileHandler called synchronously, with
+  eager f-string messages (what get_logger used to do)
+* queue    - BackgroundQueueHandler with lazy %-args; JSON formatting and
+  file I/O run on the QueueListener thread
+* sampled  - queue pipeline keeping LOG_INFO_SAMPLE_RATE=0.1 of INFO lines
+* disabled - level WARNING, comparing an f-string call with a %-args call
+  (the eager f-string still pays for formatting)
+
+The file handler rotates at --max-bytes so rotation stalls show up in the
+tail percentiles. Everything is written under a temporary directory.
+
+    python -m benchmarks.logging_overhead
+    python -m benchmarks.logging_overhead --requests 50000 --max-bytes 1048576
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import statistics
+import tempfile
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+
+from app.core.logger import (
+    TEXT_FORMAT,
+    BackgroundQueueHandler,
+    HotLineFilter,
+    JsonFormatter,
+)
+
+PARAMS = dict(page=3, page_size=20, title=None, release_year=2010, genre="Drama", cursor=None, count="exact")
+FIELDS = {"method": "GET", "route": "/api/v1/movies/", "status": 200, "db_queries": 2, "db_time_ms": 1.734}
+
+
+def output_handlers(directory: str, name: str, formatter: logging.Formatter, max_bytes: int) -> list:
+    console = logging.StreamHandler(open(os.devnull, "w"))
+    file_handler = RotatingFileHandler(os.path.join(directory, f"{name}.log"), maxBytes=max_bytes, backupCount=3)
+    for handler in (console, file_handler):
+        handler.setFormatter(formatter)
+    return [console, file_handler]
+
+
+def eager_request(logger: logging.Logger) -> None:
+    p = PARAMS
+    logger.info(
+        "Fetching movies list "
+        f"(page={p['page']}, page_size={p['page_size']}, title={p['title']}, "
+        f"release_year={p['release_year']}, genre={p['genre']}, cursor={p['cursor']}, count={p['count']}, "
+        "route=/api/v1/movies)"
+    )
+    f = FIELDS
+    logger.info(
+        f"Request DB stats (method={f['method']}, route={f['route']}, status={f['status']}, "
+        f"db_queries={f['db_queries']}, db_time_ms={f['db_time_ms']})"
+    )
+
+
+def lazy_request(logger: logging.Logger) -> None:
+    p = PARAMS
+    logger.info(
+        "Fetching movies list (page=%s, page_size=%s, title=%s, release_year=%s, genre=%s, "
+        "cursor=%s, count=%s, route=/api/v1/movies)",
+        p["page"], p["page_size"], p["title"], p["release_year"], p["genre"], p["cursor"], p["count"],
+    )
+    if logger.isEnabledFor(logging.INFO):
+        f = FIELDS
+        logger.info(
+            "Request DB stats (method=%s, route=%s, status=%s, db_queries=%s, db_time_ms=%s)",
+            f["method"], f["route"], f["status"], f["db_queries"], f["db_time_ms"],
+            extra=dict(f),
+        )
+
+
+def time_requests(emit, logger: logging.Logger, requests: int) -> dict:
+    for _ in range(100):  # warm-up
+        emit(logger)
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        emit(logger)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    samples.sort()
+    return {
+        "p50_us": round(statistics.median(samples), 2),
+        "p99_us": round(samples[int(len(samples) * 0.99) - 1], 2),
+        "max_us": round(samples[-1], 1),
+        "mean_us": round(statistics.fmean(samples), 2),
+    }
+
+
+def make_logger(name: str, level: int) -> logging.Logger:
+    logger = logging.getLogger(f"benchmarks.logging.{name}")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(level)
+    return logger
+
+
+def run(args, directory: str) -> dict:
+    results = {}
+
+    logger = make_logger("legacy", logging.INFO)
+    for handler in output_handlers(directory, "legacy", logging.Formatter(TEXT_FORMAT), args.max_bytes):
+        logger.addHandler(handler)
+    results["legacy"] = time_requests(eager_request, logger, args.requests)
+
+    for name, sample_rate in (("queue", 1.0), ("sampled", 0.1)):
+        logger = make_logger(name, logging.INFO)
+        handler = BackgroundQueueHandler(queue.Queue(args.queue_size))
+        handler.addFilter(HotLineFilter(sample_rate=sample_rate))
+        listener = QueueListener(
+            handler.queue, *output_handlers(directory, name, JsonFormatter(), args.max_bytes)
+        )
+        listener.start()
+        logger.addHandler(handler)
+        results[name] = time_requests(lazy_request, logger, args.requests)
+        drain_start = time.perf_counter()
+        listener.stop()  # waits for the writer to empty the queue
+        results[name]["drain_ms"] = round((time.perf_counter() - drain_start) * 1000, 1)
+        results[name]["dropped"] = handler.dropped
+
+    logger = make_logger("disabled", logging.WARNING)
+    results["disabled_fstring"] = time_requests(eager_request, logger, args.requests)
+    results["disabled_lazy"] = time_requests(lazy_request, logger, args.requests)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--max-bytes", type=int, default=5 * 1024 * 1024, help="rotation size of the log file")
+    parser.add_argument("--queue-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(args, directory)
+    print(json.dumps({"requests": args.requests, "lines_per_request": 2, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Per-item serialization cost of a list page.
+
+Builds 100-item pages from transient Movie/Director/Genre objects (no
+database involved) and times the two response paths:
+
+* legacy - MovieResponse(...) validated per item, .model_dump() into dicts,
+  then FastAPI's jsonable_encoder + json.dumps (what returning a dict from a
+  route costs)
+* fast   - MovieService._movie_to_response (model_construct) rendered by
+  FastJSONResponse in one pydantic-core pass
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --page-size 100 --repeat 500
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
+from app.models.models import Director, Genre, Movie
+from app.schemas.schemas import DirectorInMovieResponse, MovieResponse
+from app.services.movie_service import MovieService
+
+
+def make_rows(page_size: int, rng: random.Random) -> list:
+    genres = [Genre(id=i, name=name) for i, name in enumerate(["Action", "Drama", "Comedy", "Sci-Fi"], 1)]
+    rows = []
+    for i in range(1, page_size + 1):
+        director = Director(id=i, name=f"Director {i}")
+        movie = Movie(
+            id=i,
+            title=f"Movie {i}",
+            release_year=1950 + i % 70,
+            cast="Actor One, Actor Two, Actor Three",
+            director_id=i,
+            director=director,
+            genres=rng.sample(genres, 2),
+        )
+        rows.append((movie, round(rng.uniform(1, 10), 2), rng.randint(0, 10_000)))
+    return rows
+
+
+def envelope(items: list, page_size: int) -> dict:
+    return {
+        "status": "success",
+        "data": {
+            "page": 1,
+            "page_size": page_size,
+            "next_cursor": None,
+            "total_items": 1_000_000,
+            "count_strategy": "exact",
+            "items": items,
+        },
+    }
+
+
+def legacy_page(rows: list, page_size: int) -> bytes:
+    items = [
+        MovieResponse(
+            id=movie.id,
+            title=movie.title,
+            release_year=movie.release_year,
+            cast=movie.cast or "",
+            director=DirectorInMovieResponse.model_validate(movie.director),
+            genres=[g.name for g in movie.genres],
+            average_rating=avg,
+            ratings_count=cnt,
+        ).model_dump()
+        for movie, avg, cnt in rows
+    ]
+    return JSONResponse(jsonable_encoder(envelope(items, page_size))).body
+
+
+def fast_page(rows: list, page_size: int) -> bytes:
+    service = MovieService(movie_repo=None, director_repo=None, genre_repo=None)
+    items = [service._movie_to_response(*row) for row in rows]
+    return FastJSONResponse(envelope(items, page_size)).body
+
+
+def time_us(fn, rows: list, page_size: int, repeat: int) -> float:
+    fn(rows, page_size)  # warm-up (schema/serializer caches)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows, page_size)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rows = make_rows(args.page_size, random.Random(args.seed))
+    assert json.loads(legacy_page(rows, args.page_size)) == json.loads(fast_page(rows, args.page_size))
+
+    result = {"page_size": args.page_size}
+    for name, fn in (("legacy", legacy_page), ("fast", fast_page)):
+        page_us = time_us(fn, rows, args.page_size, args.repeat)
+        result[f"{name}_page_us"] = round(page_us, 1)
+        result[f"{name}_per_item_us"] = round(page_us / args.page_size, 2)
+    result["speedup"] = round(result["legacy_page_us"] / result["fast_page_us"], 2)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
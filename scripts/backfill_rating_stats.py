@@ -0,0 +1,29 @@
+from sqlalchemy import func, select
+
+from app.core.config import LEADERBOARD_PRIOR_MEAN, LEADERBOARD_PRIOR_VOTES
+from app.db.database import SessionLocal
+from app.models.models import MovieRatingStats
+from app.repositories.movie_repository import MovieRepository
+
+
+def backfill_rating_stats():
+    """Rebuilds movie_rating_stats and leaderboard scores from movie_ratings (safe to re-run)."""
+    db = SessionLocal()
+    try:
+        written = MovieRepository(db).rebuild_rating_stats()
+        print(f"Rating stats rebuilt for {written} movies.")
+        total, count = db.execute(
+            select(func.sum(MovieRatingStats.ratings_sum), func.sum(MovieRatingStats.ratings_count))
+        ).one()
+        if count:
+            # a prior mean close to the catalog mean keeps damping neutral
+            print(
+                f"Catalog mean score {total / count:.2f} "
+                f"(LEADERBOARD_PRIOR_MEAN={LEADERBOARD_PRIOR_MEAN}, LEADERBOARD_PRIOR_VOTES={LEADERBOARD_PRIOR_VOTES})."
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill_rating_stats()
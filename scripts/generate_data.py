@@ -0,0 +1,352 @@
+"""Deterministic, production-scale synthetic data generator.
+
+Fills genres, directors, movies, movie_genres, movie_ratings and
+movie_rating_stats with skewed data: a few directors make many movies, a few
+genres cover most of the catalog, and ratings per movie follow a Zipf-like
+(Pareto) tail. Schema must exist already (alembic upgrade head).
+
+    python -m scripts.generate_data --movies 1000000 --ratings-per-movie 20 --workers 8
+    python -m scripts.generate_data --reset --movies 50000 --database-url sqlite:///./dev.db
+
+Work is split into chunks (directors, then movies together with their genre
+links, ratings and aggregates). Each chunk is written in one transaction
+together with a row in `datagen_chunks`, so an interrupted run resumes with
+the chunks that are still missing. Rows carry explicit ids and every chunk
+has its own seeded RNG: the same arguments always produce the same dataset,
+whatever the worker count or restart history.
+
+PostgreSQL is loaded with COPY; other databases with batched executemany.
+"""
+import argparse
+import bisect
+import csv
+import hashlib
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.database import SQLALCHEMY_DATABASE_URL
+from app.models.models import SCORE_COLUMNS, Director, Genre, Movie, MovieRatingStats, Rating, movie_genres
+from app.repositories.movie_repository import bayesian_score
+
+GENRES = [
+    "Drama", "Comedy", "Action", "Thriller", "Romance", "Crime", "Adventure", "Horror",
+    "Sci-Fi", "Fantasy", "Mystery", "Animation", "Family", "Documentary", "War",
+    "History", "Music", "Western", "Biography", "Sport",
+]
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Karen",
+    "Daniel", "Nancy", "Matthew", "Lisa", "Anthony", "Sofia", "Mark", "Yuki", "Ali", "Leila",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee",
+    "Thompson", "White", "Harris", "Clark", "Lewis", "Robinson", "Walker", "Young", "Tanaka", "Rahimi",
+]
+TITLE_ADJECTIVES = [
+    "Silent", "Broken", "Last", "Hidden", "Dark", "Golden", "Lost", "Crimson", "Eternal", "Midnight",
+    "Frozen", "Burning", "Wild", "Secret", "Final", "Distant", "Fallen", "Iron", "Hollow", "Endless",
+]
+TITLE_NOUNS = [
+    "Harbor", "Kingdom", "River", "Empire", "Promise", "Garden", "Signal", "Horizon", "Witness", "Storm",
+    "Frontier", "Letter", "Machine", "Shadow", "Island", "Country", "Summer", "Code", "Road", "Hour",
+]
+SEQUELS = ["", "", "", "", " II", " III", ": Origins", ": Reckoning"]
+# scores lean towards 6-8, as real ratings do
+SCORE_WEIGHTS = [2, 2, 3, 5, 8, 12, 16, 15, 10, 6]
+SCORES = list(range(1, 11))
+
+CHUNK_TABLE = "datagen_chunks"
+
+
+class ZipfSampler:
+    """Picks 1..n with P(k) proportional to 1 / k**s (inverse CDF by bisection)."""
+
+    def __init__(self, n: int, s: float):
+        self.cdf = list(itertools.accumulate(1 / k ** s for k in range(1, n + 1)))
+
+    def sample(self, rng: random.Random) -> int:
+        return bisect.bisect_left(self.cdf, rng.random() * self.cdf[-1]) + 1
+
+
+def chunk_rng(seed: int, kind: str, index: int) -> random.Random:
+    digest = hashlib.sha256(f"{seed}:{kind}:{index}".encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+# --- row generation ----------------------------------------------------------
+
+def director_rows(args, index: int) -> Dict[str, List[tuple]]:
+    rng = chunk_rng(args.seed, "directors", index)
+    start = index * args.chunk_size + 1
+    end = min(start + args.chunk_size, args.directors + 1)
+    return {
+        "directors": [
+            (director_id, person_name(rng), rng.randint(1920, 2000), None)
+            for director_id in range(start, end)
+        ]
+    }
+
+
+def movie_rows(args, index: int, director_sampler: ZipfSampler, genre_sampler: ZipfSampler) -> Dict[str, List[tuple]]:
+    rng = chunk_rng(args.seed, "movies", index)
+    start = index * args.chunk_size + 1
+    end = min(start + args.chunk_size, args.movies + 1)
+    # Pareto tail scaled so the mean stays at --ratings-per-movie
+    alpha = args.ratings_alpha
+    scale = args.ratings_per_movie * (alpha - 1) / alpha
+    cap = args.max_ratings_per_movie
+
+    movies, links, ratings, stats = [], [], [], []
+    for movie_id in range(start, end):
+        title = f"The {rng.choice(TITLE_ADJECTIVES)} {rng.choice(TITLE_NOUNS)}{rng.choice(SEQUELS)}"
+        cast = ", ".join(person_name(rng) for _ in range(rng.randint(2, 5)))
+        # catalog grows over time: recent years are more common
+        release_year = 2025 - min(95, int(rng.expovariate(1 / 15)))
+        movies.append((movie_id, title, release_year, cast, director_sampler.sample(rng)))
+
+        genre_ids = set()
+        for _ in range(rng.choice((1, 1, 2, 2, 2, 3))):
+            genre_ids.add(genre_sampler.sample(rng))
+
+        count = min(cap, round(scale * rng.paretovariate(alpha))) if args.ratings_per_movie else 0
+        scores = rng.choices(SCORES, weights=SCORE_WEIGHTS, k=count)
+        ratings.extend((score, movie_id) for score in scores)
+        score = bayesian_score(sum(scores), count)
+        links.extend((movie_id, genre_id, score) for genre_id in sorted(genre_ids))
+        stats.append((
+            movie_id, sum(scores), count, min(scores) if scores else None, max(scores) if scores else None, score,
+            *(scores.count(value) for value in SCORES),
+        ))
+    return {"movies": movies, "movie_genres": links, "movie_ratings": ratings, "movie_rating_stats": stats}
+
+
+# column order of the tuples built above
+COLUMNS = {
+    "genres": ("id", "name", "description"),
+    "directors": ("id", "name", "birth_year", "description"),
+    "movies": ("id", "title", "release_year", "cast", "director_id"),
+    "movie_genres": ("movie_id", "genre_id", "bayesian_score"),
+    "movie_ratings": ("score", "movie_id"),
+    "movie_rating_stats": (
+        "movie_id", "ratings_sum", "ratings_count", "min_score", "max_score", "bayesian_score",
+        *SCORE_COLUMNS.values(),
+    ),
+}
+TABLES = {
+    "genres": Genre.__table__,
+    "directors": Director.__table__,
+    "movies": Movie.__table__,
+    "movie_genres": movie_genres,
+    "movie_ratings": Rating.__table__,
+    "movie_rating_stats": MovieRatingStats.__table__,
+}
+
+
+# --- writing -----------------------------------------------------------------
+
+def copy_rows(conn: Connection, table: str, rows: Sequence[tuple]) -> None:
+    """COPY FROM STDIN through the raw psycopg2 cursor (CSV, empty unquoted field = NULL)."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    columns = ", ".join(f'"{column}"' for column in COLUMNS[table])
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def insert_rows(conn: Connection, table: str, rows: Sequence[tuple], batch: int = 10_000) -> None:
+    columns = COLUMNS[table]
+    for offset in range(0, len(rows), batch):
+        conn.execute(
+            insert(TABLES[table]),
+            [dict(zip(columns, row)) for row in rows[offset:offset + batch]],
+        )
+
+
+def write_chunk(engine: Engine, use_copy: bool, kind: str, index: int, config: str,
+                tables: Dict[str, List[tuple]]) -> int:
+    written = 0
+    with engine.begin() as conn:
+        for table, rows in tables.items():
+            if rows:
+                (copy_rows if use_copy else insert_rows)(conn, table, rows)
+                written += len(rows)
+        conn.execute(
+            text(f"INSERT INTO {CHUNK_TABLE} (kind, chunk, config) VALUES (:kind, :chunk, :config)"),
+            {"kind": kind, "chunk": index, "config": config},
+        )
+    return written
+
+
+# --- worker processes --------------------------------------------------------
+
+_worker: Dict[str, object] = {}
+
+
+def _init_worker(args) -> None:
+    engine = create_engine(args.database_url)
+    _worker.update(
+        args=args,
+        engine=engine,
+        use_copy=use_copy(args, engine),
+        directors=ZipfSampler(args.directors, args.zipf_s),
+        genres=ZipfSampler(len(GENRES), args.zipf_s),
+    )
+
+
+def _run_chunk(task: Tuple[str, int]) -> Tuple[str, int, int, float]:
+    kind, index = task
+    args = _worker["args"]
+    start = time.perf_counter()
+    if kind == "directors":
+        tables = director_rows(args, index)
+    else:
+        tables = movie_rows(args, index, _worker["directors"], _worker["genres"])
+    written = write_chunk(_worker["engine"], _worker["use_copy"], kind, index, config_key(args), tables)
+    return kind, index, written, time.perf_counter() - start
+
+
+def use_copy(args, engine: Engine) -> bool:
+    if args.method == "auto":
+        return engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+    return args.method == "copy"
+
+
+# --- orchestration -----------------------------------------------------------
+
+def config_key(args) -> str:
+    """Fingerprint of everything that shapes the data; resuming requires a match."""
+    shape = {key: getattr(args, key) for key in (
+        "movies", "directors", "ratings_per_movie", "ratings_alpha", "max_ratings_per_movie",
+        "zipf_s", "chunk_size", "seed",
+    )}
+    return hashlib.sha256(json.dumps(shape, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def prepare(engine: Engine, args) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {CHUNK_TABLE} ("
+            "kind VARCHAR(20) NOT NULL, chunk INTEGER NOT NULL, config VARCHAR(16) NOT NULL, "
+            "PRIMARY KEY (kind, chunk))"
+        ))
+        if args.reset:
+            tables = ["movie_ratings", "movie_rating_stats", "movie_genres", "movies", "directors", "genres",
+                      CHUNK_TABLE]
+            if engine.dialect.name == "postgresql":
+                conn.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY"))
+            else:
+                for table in tables:
+                    conn.execute(text(f"DELETE FROM {table}"))
+
+        other = conn.execute(
+            text(f"SELECT DISTINCT config FROM {CHUNK_TABLE} WHERE config <> :config"),
+            {"config": config_key(args)},
+        ).first()
+        if other:
+            raise SystemExit(
+                f"{CHUNK_TABLE} holds chunks of a run with different arguments ({other[0]}); "
+                "rerun with the same arguments to resume, or pass --reset"
+            )
+
+        done = conn.execute(text(f"SELECT 1 FROM {CHUNK_TABLE} WHERE kind = 'genres'")).first()
+    if not done:
+        write_chunk(engine, False, "genres", 0, config_key(args), {
+            "genres": [(i, name, f"Movies belonging to {name} category") for i, name in enumerate(GENRES, 1)],
+        })
+
+
+def pending_chunks(engine: Engine, kind: str, total_rows: int, chunk_size: int) -> List[Tuple[str, int]]:
+    with engine.connect() as conn:
+        done = {row[0] for row in conn.execute(
+            text(f"SELECT chunk FROM {CHUNK_TABLE} WHERE kind = :kind"), {"kind": kind}
+        )}
+    chunks = (total_rows + chunk_size - 1) // chunk_size
+    return [(kind, index) for index in range(chunks) if index not in done]
+
+
+def run_phase(args, tasks: List[Tuple[str, int]], workers: int) -> None:
+    if not tasks:
+        return
+    started, rows = time.perf_counter(), 0
+    if workers > 1:
+        with multiprocessing.get_context("spawn").Pool(workers, _init_worker, (args,)) as pool:
+            results: Iterable = pool.imap_unordered(_run_chunk, tasks)
+            rows = report(results, len(tasks), started)
+    else:
+        _init_worker(args)
+        rows = report(map(_run_chunk, tasks), len(tasks), started)
+    print(f"{tasks[0][0]}: {rows:,} rows in {time.perf_counter() - started:.1f}s")
+
+
+def report(results: Iterable, total: int, started: float) -> int:
+    rows = 0
+    for done, (kind, index, written, seconds) in enumerate(results, 1):
+        rows += written
+        rate = rows / max(time.perf_counter() - started, 1e-9)
+        print(f"  {kind} chunk {index}: {written:,} rows in {seconds:.1f}s [{done}/{total}, {rate:,.0f} rows/s]")
+    return rows
+
+
+def finish(engine: Engine) -> None:
+    """Move id sequences past the explicit ids and refresh planner statistics."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for table in ("genres", "directors", "movies"):
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+            ))
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URL)
+    parser.add_argument("--movies", type=int, default=100_000)
+    parser.add_argument("--directors", type=int, help="default: movies / 8")
+    parser.add_argument("--ratings-per-movie", type=float, default=20, help="mean; the tail is Pareto")
+    parser.add_argument("--ratings-alpha", type=float, default=1.5, help="Pareto shape of ratings per movie")
+    parser.add_argument("--max-ratings-per-movie", type=int, default=200_000)
+    parser.add_argument("--zipf-s", type=float, default=1.05, help="skew of director / genre popularity")
+    parser.add_argument("--chunk-size", type=int, default=20_000, help="movies (or directors) per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--method", choices=("auto", "copy", "executemany"), default="auto")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="empty the catalog tables and start over")
+    args = parser.parse_args(argv)
+    args.directors = args.directors or max(1, args.movies // 8)
+
+    engine = create_engine(args.database_url)
+    workers = 1 if engine.dialect.name == "sqlite" else max(1, args.workers)  # SQLite has one writer
+    started = time.perf_counter()
+    prepare(engine, args)
+    print(f"config {config_key(args)}: {args.movies:,} movies, {args.directors:,} directors, "
+          f"~{int(args.movies * args.ratings_per_movie):,} ratings, {workers} worker(s), "
+          f"{'COPY' if use_copy(args, engine) else 'executemany'}")
+
+    # movies reference directors, so directors must be complete first
+    run_phase(args, pending_chunks(engine, "directors", args.directors, args.chunk_size), workers)
+    run_phase(args, pending_chunks(engine, "movies", args.movies, args.chunk_size), workers)
+    finish(engine)
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
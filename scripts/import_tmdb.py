@@ -0,0 +1,250 @@
+"""Streaming, idempotent TMDB 5000 importer (replaces the load in seeddb.sql).
+
+    python -m scripts.import_tmdb --movies-csv tmdb_5000_movies.csv --credits-csv tmdb_5000_credits.csv
+    python -m scripts.import_tmdb ... --min-votes 100 --limit 1000 --chunk-size 500
+
+Genres, directors and movies are upserted by their TMDB ids (the tmdb_id
+columns), so re-running against a live database updates changed rows in
+place and leaves everything else alone. Nothing is deleted, sequences are
+untouched, and existing ratings survive.
+
+Memory stays bounded by the chunk size. The credits file is streamed once and
+reduced to (director, top-billed cast) per movie, then the movies file is
+streamed in chunks; JSON columns are decoded cell by cell. Each chunk commits
+on its own, so an interrupted import can simply be started again.
+
+Movies without a director in the credits are skipped; a missing release date
+falls back to 2000, as seeddb.sql did. PostgreSQL and SQLite are supported
+(both have INSERT ... ON CONFLICT).
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import create_engine, delete, func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from app.db.database import SQLALCHEMY_DATABASE_URL
+from app.models.models import Director, Genre, Movie, MovieRatingStats, movie_genres
+from app.repositories.movie_repository import sync_genre_scores
+
+# crew / cast cells of popular movies exceed csv's default 128 KiB field limit
+csv.field_size_limit(sys.maxsize)
+
+DEFAULT_RELEASE_YEAR = 2000
+
+# tmdb movie id -> (director tmdb id, director name, cast string)
+Credits = Dict[int, Tuple[int, str, str]]
+
+
+def upsert(conn: Connection):
+    dialects = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+    if conn.dialect.name not in dialects:
+        raise SystemExit(f"{conn.dialect.name} has no INSERT ... ON CONFLICT support")
+    return dialects[conn.dialect.name]
+
+
+def read_credits(path: str, cast_size: int) -> Credits:
+    """One pass over the credits file, keeping only what a movie row needs."""
+    credits: Credits = {}
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            director = next(
+                (c for c in json.loads(row["crew"] or "[]") if c.get("job") == "Director" and c.get("name")),
+                None,
+            )
+            if director is None:
+                continue
+            cast = sorted(
+                (c for c in json.loads(row["cast"] or "[]") if c.get("name")),
+                key=lambda c: c.get("order", 999_999),
+            )[:cast_size]
+            credits[int(row["movie_id"])] = (
+                int(director["id"]),
+                director["name"].strip(),
+                ", ".join(c["name"] for c in cast),
+            )
+    return credits
+
+
+def read_movies(path: str, credits: Credits, min_votes: int, stats: Dict[str, int]) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            stats["read"] += 1
+            tmdb_id = int(row["id"])
+            if int(row["vote_count"] or 0) < min_votes:
+                stats["filtered"] += 1
+                continue
+            if tmdb_id not in credits:
+                stats["skipped"] += 1
+                continue
+            director_tmdb_id, director_name, cast = credits[tmdb_id]
+            year = (row["release_date"] or "").split("-", 1)[0]
+            yield {
+                "tmdb_id": tmdb_id,
+                "title": row["title"].strip(),
+                "release_year": int(year) if year.isdigit() else DEFAULT_RELEASE_YEAR,
+                # MovieCreate requires a non-empty cast
+                "cast": cast or "Unknown",
+                "director": (director_tmdb_id, director_name),
+                "genres": [(int(g["id"]), g["name"].strip()) for g in json.loads(row["genres"] or "[]")],
+            }
+
+
+def chunked(rows: Iterator[dict], size: int, limit: Optional[int]) -> Iterator[List[dict]]:
+    chunk, total = [], 0
+    for row in rows:
+        if limit is not None and total >= limit:
+            break
+        chunk.append(row)
+        total += 1
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def upsert_genres(conn: Connection, genres: Dict[int, str]) -> Dict[int, int]:
+    """tmdb genre id -> genres.id. Genres are matched by name, so hand-made ones get their tmdb_id attached."""
+    stmt = upsert(conn)(Genre).values([
+        {"name": name, "tmdb_id": tmdb_id, "description": "Imported from TMDB genres"}
+        for tmdb_id, name in genres.items()
+    ])
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=[Genre.name],
+        set_={"tmdb_id": stmt.excluded.tmdb_id},
+        where=Genre.tmdb_id.is_distinct_from(stmt.excluded.tmdb_id),
+    ))
+    return dict(conn.execute(select(Genre.tmdb_id, Genre.id).where(Genre.tmdb_id.in_(genres))).all())
+
+
+def upsert_directors(conn: Connection, directors: Dict[int, str]) -> Dict[int, int]:
+    stmt = upsert(conn)(Director).values([
+        {"tmdb_id": tmdb_id, "name": name, "description": "Imported from TMDB credits as Director"}
+        for tmdb_id, name in directors.items()
+    ])
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=[Director.tmdb_id],
+        set_={"name": stmt.excluded.name},
+        where=Director.name.is_distinct_from(stmt.excluded.name),
+    ))
+    return dict(conn.execute(select(Director.tmdb_id, Director.id).where(Director.tmdb_id.in_(directors))).all())
+
+
+def import_chunk(conn: Connection, chunk: List[dict], genre_ids: Dict[int, int]) -> Dict[str, int]:
+    new_genres = {tmdb_id: name for row in chunk for tmdb_id, name in row["genres"] if tmdb_id not in genre_ids}
+    if new_genres:
+        genre_ids.update(upsert_genres(conn, new_genres))
+    director_ids = upsert_directors(conn, {row["director"][0]: row["director"][1] for row in chunk})
+
+    tmdb_ids = [row["tmdb_id"] for row in chunk]
+    existing = set(conn.scalars(select(Movie.id).where(Movie.tmdb_id.in_(tmdb_ids))))
+
+    # unchanged movies are not touched, so their version (and ETag) survives a re-run
+    stmt = upsert(conn)(Movie).values([
+        {
+            "tmdb_id": row["tmdb_id"],
+            "title": row["title"],
+            "release_year": row["release_year"],
+            "cast": row["cast"],
+            "director_id": director_ids[row["director"][0]],
+        }
+        for row in chunk
+    ])
+    excluded = stmt.excluded
+    result = conn.execute(stmt.on_conflict_do_update(
+        index_elements=[Movie.tmdb_id],
+        set_={
+            "title": excluded.title,
+            "release_year": excluded.release_year,
+            "cast": excluded.cast,
+            "director_id": excluded.director_id,
+            "version": Movie.version + 1,
+            "updated_at": func.now(),
+        },
+        where=or_(
+            Movie.title.is_distinct_from(excluded.title),
+            Movie.release_year.is_distinct_from(excluded.release_year),
+            Movie.cast.is_distinct_from(excluded.cast),
+            Movie.director_id.is_distinct_from(excluded.director_id),
+        ),
+    ))
+    movie_ids = dict(conn.execute(
+        select(Movie.tmdb_id, Movie.id).where(Movie.tmdb_id.in_(tmdb_ids))
+    ).all())
+
+    # genre links: only rewrite the ones that differ
+    wanted = {(movie_ids[row["tmdb_id"]], genre_ids[g]) for row in chunk for g, _ in row["genres"]}
+    current = set(conn.execute(
+        select(movie_genres.c.movie_id, movie_genres.c.genre_id)
+        .where(movie_genres.c.movie_id.in_(movie_ids.values()))
+    ).all())
+    if current - wanted:
+        conn.execute(delete(movie_genres).where(
+            tuple_(movie_genres.c.movie_id, movie_genres.c.genre_id).in_(list(current - wanted))
+        ))
+    if wanted - current:
+        conn.execute(insert(movie_genres), [
+            {"movie_id": movie_id, "genre_id": genre_id} for movie_id, genre_id in wanted - current
+        ])
+    relinked = {movie_id for movie_id, _ in (current ^ wanted) if movie_id in existing}
+    if relinked:
+        # new links of already rated movies need their leaderboard score
+        conn.execute(sync_genre_scores(relinked))
+        conn.execute(
+            update(Movie).where(Movie.id.in_(relinked))
+            .values(version=Movie.version + 1, updated_at=func.now())
+        )
+
+    # every movie has an aggregate row (see MovieRepository.create)
+    stats_stmt = upsert(conn)(MovieRatingStats).values([
+        {"movie_id": movie_id, "ratings_sum": 0, "ratings_count": 0} for movie_id in movie_ids.values()
+    ])
+    conn.execute(stats_stmt.on_conflict_do_nothing(index_elements=[MovieRatingStats.movie_id]))
+
+    return {"upserted": len(chunk), "changed": max(result.rowcount, 0), "relinked": len(relinked)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies-csv", default="tmdb_5000_movies.csv")
+    parser.add_argument("--credits-csv", default="tmdb_5000_credits.csv")
+    parser.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URL)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--limit", type=int, help="stop after this many movies")
+    parser.add_argument("--min-votes", type=int, default=0, help="skip movies with fewer TMDB votes")
+    parser.add_argument("--cast-size", type=int, default=3, help="top-billed actors kept in movies.cast")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    credits = read_credits(args.credits_csv, args.cast_size)
+    print(f"credits: {len(credits):,} movies with a director ({time.perf_counter() - started:.1f}s)")
+
+    engine = create_engine(args.database_url)
+    stats = {"read": 0, "filtered": 0, "skipped": 0}
+    totals = {"upserted": 0, "changed": 0, "relinked": 0}
+    with engine.connect() as conn:
+        genre_ids = dict(conn.execute(select(Genre.tmdb_id, Genre.id).where(Genre.tmdb_id.isnot(None))).all())
+
+    rows = read_movies(args.movies_csv, credits, args.min_votes, stats)
+    for chunk in chunked(rows, args.chunk_size, args.limit):
+        with engine.begin() as conn:
+            for key, value in import_chunk(conn, chunk, genre_ids).items():
+                totals[key] += value
+        elapsed = time.perf_counter() - started
+        print(
+            f"  {totals['upserted']:,} movies ({totals['changed']:,} new/changed, "
+            f"{totals['relinked']:,} relinked) from {stats['read']:,} rows "
+            f"[{totals['upserted'] / elapsed:,.0f} movies/s]"
+        )
+
+    print(json.dumps({**stats, **totals, "seconds": round(time.perf_counter() - started, 1)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Rebuild the per-movie score histograms from movie_ratings.
+
+The counters in movie_rating_stats (score_1 .. score_10) are incremented with
+every rating write. This recounts them from the raw table, e.g. after ratings
+were loaded or deleted outside the API. The movie id range is cut into
+chunks that worker processes recount independently, each in its own short
+transaction; only rows that drifted are written, and rating writes to a
+chunk wait for it instead of being lost, so the API can stay up.
+
+    python -m scripts.reconcile_score_histograms --workers 8
+    python -m scripts.reconcile_score_histograms --chunk-size 5000 --database-url sqlite:///./dev.db
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.database import SQLALCHEMY_DATABASE_URL
+from app.models.models import MovieRatingStats
+from app.repositories.movie_repository import MovieRepository
+
+_worker: Dict[str, Engine] = {}
+
+
+def _init_worker(database_url: str) -> None:
+    _worker["engine"] = create_engine(database_url)
+
+
+def _reconcile_chunk(bounds: Tuple[int, int]) -> Tuple[int, int, int, float]:
+    first_id, last_id = bounds
+    started = time.perf_counter()
+    with Session(_worker["engine"]) as session:
+        corrected = MovieRepository(session).rebuild_score_histograms(first_id, last_id)
+    return first_id, last_id, corrected, time.perf_counter() - started
+
+
+def id_chunks(engine: Engine, chunk_size: int) -> List[Tuple[int, int]]:
+    """Inclusive (first, last) movie id ranges covering movie_rating_stats."""
+    with engine.connect() as conn:
+        low, high = conn.execute(
+            select(func.min(MovieRatingStats.movie_id), func.max(MovieRatingStats.movie_id))
+        ).one()
+    if low is None:
+        return []
+    return [(start, min(start + chunk_size - 1, high)) for start in range(low, high + 1, chunk_size)]
+
+
+def report(results: Iterable, total: int) -> int:
+    corrected = 0
+    for done, (first_id, last_id, fixed, seconds) in enumerate(results, 1):
+        corrected += fixed
+        print(f"  movies {first_id}-{last_id}: {fixed:,} corrected in {seconds:.2f}s [{done}/{total}]")
+    return corrected
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URL)
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="movie ids per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    workers = 1 if engine.dialect.name == "sqlite" else max(1, args.workers)  # SQLite has one writer
+    tasks = id_chunks(engine, args.chunk_size)
+    engine.dispose()
+    if not tasks:
+        print("movie_rating_stats is empty, nothing to reconcile.")
+        return
+
+    started = time.perf_counter()
+    print(f"{len(tasks)} chunk(s) of {args.chunk_size:,} movie ids, {workers} worker(s)")
+    if workers > 1:
+        with multiprocessing.get_context("spawn").Pool(workers, _init_worker, (args.database_url,)) as pool:
+            corrected = report(pool.imap_unordered(_reconcile_chunk, tasks), len(tasks))
+    else:
+        _init_worker(args.database_url)
+        corrected = report(map(_reconcile_chunk, tasks), len(tasks))
+    print(f"Score histograms reconciled: {corrected:,} movies corrected in {time.perf_counter() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
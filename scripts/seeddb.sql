@@ -3,12 +3,14 @@
 -- Loads 1000 REAL movies (titles, directors, cast, genres) from TMDB 5000 dataset.
 -- Requires: tmdb_5000_movies.csv and tmdb_5000_credits.csv in the same directory.
 -- Run with psql: psql -U movieuser -d moviedb -h localhost -f script.sql
+-- Destructive (empties every table). For re-runnable loads use: python -m scripts.import_tmdb
 
 BEGIN;
 
 ------------------------------- 1. Cleanup Existing Data -----------------------------
 -- Delete existing data from final tables to ensure a clean run.
 DELETE FROM movie_ratings;
+DELETE FROM movie_rating_stats;
 DELETE FROM movie_genres;
 DELETE FROM movies;
 DELETE FROM directors;
@@ -222,4 +224,43 @@ SELECT
     (floor(random() * 10) + 1)::INT AS score  -- Random score 1-10
 FROM movies m,
 LATERAL generate_series(1, (1 + floor(random() * 40))::INT) AS s(i);
+
+------------------------------- 10. Build per-movie rating aggregates -----------------------------
+-- bayesian_score is the leaderboard's damped average with the default prior
+-- (LEADERBOARD_PRIOR_MEAN = 5.5, LEADERBOARD_PRIOR_VOTES = 10); rerun
+-- scripts.backfill_rating_stats when the app uses other values
+INSERT INTO movie_rating_stats (
+    movie_id, ratings_sum, ratings_count, min_score, max_score,
+    score_1, score_2, score_3, score_4, score_5, score_6, score_7, score_8, score_9, score_10,
+    bayesian_score
+)
+SELECT
+    m.id,
+    COALESCE(SUM(r.score), 0),
+    COUNT(r.id),
+    MIN(r.score),
+    MAX(r.score),
+    -- score histogram: ratings per score
+    COUNT(r.id) FILTER (WHERE r.score = 1),
+    COUNT(r.id) FILTER (WHERE r.score = 2),
+    COUNT(r.id) FILTER (WHERE r.score = 3),
+    COUNT(r.id) FILTER (WHERE r.score = 4),
+    COUNT(r.id) FILTER (WHERE r.score = 5),
+    COUNT(r.id) FILTER (WHERE r.score = 6),
+    COUNT(r.id) FILTER (WHERE r.score = 7),
+    COUNT(r.id) FILTER (WHERE r.score = 8),
+    COUNT(r.id) FILTER (WHERE r.score = 9),
+    COUNT(r.id) FILTER (WHERE r.score = 10),
+    CASE WHEN COUNT(r.id) > 0
+         THEN (CAST(SUM(r.score) AS FLOAT) + 5.5 * 10) / (COUNT(r.id) + 10)
+    END
+FROM movies m
+LEFT JOIN movie_ratings r ON r.movie_id = m.id
+GROUP BY m.id;
+
+-- per-genre leaderboards read a copy of the score on every genre link
+UPDATE movie_genres
+SET bayesian_score = (
+    SELECT s.bayesian_score FROM movie_rating_stats s WHERE s.movie_id = movie_genres.movie_id
+);
 COMMIT;
@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+# The app reads its configuration at import time: point it at a throwaway
+# SQLite database before anything under app/ is imported
+_TMP_DIR = tempfile.mkdtemp(prefix="movie-rating-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR}/test.db"
+os.environ["LOG_FILE"] = os.path.join(_TMP_DIR, "app.log")
+os.environ["DB_ASYNC"] = "false"
+os.environ["RATING_BUFFER_ENABLED"] = "false"
+os.environ["INTERNAL_API_TOKEN"] = "test-internal-token"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.db.database import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.models import Director, Genre  # noqa: E402
+from app.services.movie_cache import movie_cache  # noqa: E402
+from app.services.movie_service import estimated_count_cache, genre_list_cache  # noqa: E402
+from app.services.reference_cache import reference_cache  # noqa: E402
+
+
+def _reset_caches() -> None:
+    # process-wide caches outlive a test, and SQLite hands out the same ids again
+    if movie_cache is not None:
+        movie_cache.backend.clear()
+    if reference_cache is not None:
+        reference_cache.invalidate()
+    estimated_count_cache.clear()
+    genre_list_cache.clear()
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    _reset_caches()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def director(db) -> Director:
+    director = Director(name="Christopher Nolan", birth_year=1970)
+    db.add(director)
+    db.commit()
+    return director
+
+
+@pytest.fixture
+def genres(db) -> list:
+    genres = [Genre(name="Action"), Genre(name="Drama"), Genre(name="Sci-Fi")]
+    db.add_all(genres)
+    db.commit()
+    return genres
+
+
+@pytest.fixture
+def create_movie(client, director, genres):
+    """POST a movie and return its id."""
+
+    def create(title: str = "Inception", release_year: int = 2010, genre_ids=None) -> int:
+        response = client.post(
+            "/api/v1/movies/",
+            json={
+                "title": title,
+                "director_id": director.id,
+                "release_year": release_year,
+                "cast": "Leonardo DiCaprio",
+                "genres": [genres[0].id] if genre_ids is None else genre_ids,
+            },
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    return create
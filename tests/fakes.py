@@ -0,0 +1,46 @@
+import threading
+from typing import Any, Dict, Hashable, Optional, Union
+
+from app.core.cache import CacheBackend
+
+
+class FakeSharedCache(CacheBackend):
+    """
+    In-memory stand-in for an out-of-process backend such as Redis: one
+    instance can be shared by several MovieCache objects (one per simulated
+    worker), and, like Redis, it only accepts str/bytes values.
+    """
+
+    shared = True
+
+    def __init__(self):
+        self._data: Dict[Hashable, Union[str, bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not isinstance(value, (str, bytes)):
+            raise TypeError(f"shared backends store str/bytes, got {type(value).__name__}")
+        with self._lock:
+            self._data[key] = value
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
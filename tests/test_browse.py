@@ -0,0 +1,102 @@
+import pytest
+
+from app.db.database import SessionLocal
+from app.models.models import Director
+from app.services.rating_buffer import RatingBuffer
+
+
+@pytest.fixture
+def catalog(client, db, director, create_movie, genres):
+    action, drama, _ = genres
+    inception = create_movie(title="Inception", genre_ids=[action.id, drama.id])
+    memento = create_movie(title="Memento", release_year=2000, genre_ids=[drama.id])
+    for movie_id, score in [(inception, 9), (inception, 7), (memento, 5)]:
+        client.post(f"/api/v1/movies/{movie_id}/ratings", json={"score": score})
+    other = Director(name="Greta Gerwig", birth_year=1983)
+    db.add(other)
+    db.commit()
+    return {"inception": inception, "memento": memento, "director": director, "other": other}
+
+
+def data(response) -> dict:
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def test_directors_page_carries_aggregates(client, catalog):
+    page = data(client.get("/api/v1/directors/"))
+
+    assert page["total_items"] == 2
+    nolan, gerwig = page["items"]
+    assert (nolan["name"], nolan["movies_count"], nolan["ratings_count"], nolan["average_rating"]) == (
+        "Christopher Nolan", 2, 3, 7.0,
+    )
+    assert (gerwig["movies_count"], gerwig["ratings_count"], gerwig["average_rating"]) == (0, 0, None)
+
+
+def test_genres_page_carries_aggregates(client, catalog):
+    items = data(client.get("/api/v1/genres/"))["items"]
+
+    summary = {item["name"]: (item["movies_count"], item["ratings_count"], item["average_rating"]) for item in items}
+    assert summary == {"Action": (1, 2, 8.0), "Drama": (2, 3, 7.0), "Sci-Fi": (0, 0, None)}
+
+
+def test_browse_pages_count_past_the_first_page(client, catalog):
+    second = data(client.get("/api/v1/directors/", params={"page": 2, "page_size": 1}))
+    assert ([item["name"] for item in second["items"]], second["total_items"]) == (["Greta Gerwig"], 2)
+
+    past = data(client.get("/api/v1/genres/", params={"page": 3, "page_size": 2}))
+    assert (past["items"], past["total_items"]) == ([], 3)
+
+
+def test_movies_by_director_and_genre(client, catalog, genres):
+    nolan = catalog["director"].id
+    movies = data(client.get(f"/api/v1/directors/{nolan}/movies", params={"page_size": 1}))
+    assert [item["title"] for item in movies["items"]] == ["Inception"]
+    assert movies["total_items"] == 2 and movies["next_cursor"] is not None
+
+    filtered = data(client.get(f"/api/v1/directors/{nolan}/movies", params={"release_year": 2000}))
+    assert [item["id"] for item in filtered["items"]] == [catalog["memento"]]
+    assert data(client.get(f"/api/v1/directors/{catalog['other'].id}/movies"))["items"] == []
+
+    drama = data(client.get(f"/api/v1/genres/{genres[1].id}/movies"))
+    assert [item["title"] for item in drama["items"]] == ["Inception", "Memento"]
+    assert data(client.get(f"/api/v1/genres/{genres[2].id}/movies"))["total_items"] == 0
+
+
+def test_unknown_director_or_genre_is_a_404(client, catalog):
+    response = client.get("/api/v1/directors/999/movies")
+    assert response.status_code == 404
+    assert response.json()["detail"]["error"]["message"] == "Director not found"
+
+    response = client.get("/api/v1/genres/999/movies")
+    assert response.status_code == 404
+    assert response.json()["detail"]["error"]["message"] == "Genre not found"
+
+
+def test_genre_pages_follow_movie_and_rating_writes(client, catalog, genres):
+    def drama():
+        items = data(client.get("/api/v1/genres/"))["items"]
+        return next((item["movies_count"], item["ratings_count"]) for item in items if item["name"] == "Drama")
+
+    assert drama() == (2, 3)
+    client.post(f"/api/v1/movies/{catalog['memento']}/ratings", json={"score": 8})
+    assert drama() == (2, 4)
+
+    client.post("/api/v1/movies/ratings:batch", json={"items": [{"movie_id": catalog["memento"], "score": 2}]})
+    assert drama() == (2, 5)
+
+    RatingBuffer(SessionLocal)._flush([(catalog["memento"], 6)])
+    assert drama() == (2, 6)
+
+    created = client.post("/api/v1/movies:batch", json={"items": [
+        {"title": "Oppenheimer", "director_id": catalog["director"].id, "release_year": 2023, "cast": "x",
+         "genres": [genres[1].id]},
+    ]}).json()["data"]["items"][0]["id"]
+    assert drama() == (3, 6)
+
+    client.put(f"/api/v1/movies/{created}/", json={"genres": [genres[0].id]})
+    assert drama() == (2, 6)
+
+    client.delete(f"/api/v1/movies/{catalog['memento']}/")
+    assert drama() == (1, 2)
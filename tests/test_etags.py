@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+
+from app.core.http_cache import Validators, is_not_modified, make_etag
+
+
+def test_if_none_match_uses_weak_comparison():
+    validators = Validators(etag=make_etag("movie", 1, 3))
+
+    assert validators.etag.startswith('W/"')
+    assert is_not_modified({"if-none-match": validators.etag}, validators)
+    assert is_not_modified({"if-none-match": f'"other", {validators.etag.removeprefix("W/")}'}, validators)
+    assert is_not_modified({"if-none-match": "*"}, validators)
+    assert not is_not_modified({"if-none-match": make_etag("movie", 1, 4)}, validators)
+
+
+def test_if_modified_since_is_ignored_when_if_none_match_is_sent():
+    validators = Validators(etag='W/"a"', last_modified=datetime(2024, 5, 1, 12, 0, 0, 500000))
+    since = "Wed, 01 May 2024 12:00:00 GMT"
+
+    assert is_not_modified({"if-modified-since": since}, validators)  # sub-second part ignored
+    assert not is_not_modified({"if-modified-since": since, "if-none-match": 'W/"b"'}, validators)
+    assert not is_not_modified({"if-modified-since": "yesterday"}, validators)
+    assert validators.headers()["Last-Modified"] == "Wed, 01 May 2024 12:00:00 GMT"
+    aware = Validators(etag='W/"a"', last_modified=datetime(2024, 5, 1, 12, tzinfo=timezone.utc))
+    assert aware.headers() == validators.headers()
+
+
+def test_movie_etag_changes_after_rating_and_update(client, create_movie):
+    movie_id = create_movie()
+    etag = client.get(f"/api/v1/movies/{movie_id}").headers["etag"]
+
+    assert client.get(f"/api/v1/movies/{movie_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post(f"/api/v1/movies/{movie_id}/ratings", json={"score": 8})
+    response = client.get(f"/api/v1/movies/{movie_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["ratings_count"] == 1
+    assert response.headers["etag"] != etag
+    etag = response.headers["etag"]
+
+    client.put(f"/api/v1/movies/{movie_id}/", json={"title": "Inception (Director's Cut)"})
+    response = client.get(f"/api/v1/movies/{movie_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Inception (Director's Cut)"
+    assert response.headers["etag"] != etag
+
+
+def test_movie_etag_changes_after_batch_writes(client, create_movie):
+    movie_id = create_movie()
+    etag = client.get(f"/api/v1/movies/{movie_id}").headers["etag"]
+
+    client.post("/api/v1/movies/ratings:batch", json={"items": [{"movie_id": movie_id, "score": 6}]})
+    response = client.get(f"/api/v1/movies/{movie_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    client.put("/api/v1/movies:batch", json={"items": [{"id": movie_id, "release_year": 2011}]})
+    response = client.get(f"/api/v1/movies/{movie_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["release_year"] == 2011
+
+
+def test_list_etag_changes_after_writes(client, create_movie):
+    movie_ids = [create_movie(title=f"Movie {i}") for i in range(3)]
+    url = "/api/v1/movies/?page_size=2"
+    etag = client.get(url).headers["etag"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/v1/movies/?page_size=3", headers={"If-None-Match": etag}).status_code == 200
+
+    client.post(f"/api/v1/movies/{movie_ids[0]}/ratings", json={"score": 10})
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    client.delete(f"/api/v1/movies/{movie_ids[0]}/")
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert movie_ids[0] not in [item["id"] for item in response.json()["data"]["items"]]
+    etag = response.headers["etag"]
+
+    create_movie(title="Movie 3")
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_list_has_no_last_modified(client, create_movie):
+    create_movie()
+
+    response = client.get("/api/v1/movies/")
+
+    assert "etag" in response.headers
+    assert "last-modified" not in response.headers
@@ -0,0 +1,98 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from app.models.models import Movie, MovieRatingStats
+
+PLAIN = {"Accept-Encoding": "identity"}
+
+
+@pytest.fixture
+def catalog(client, create_movie, genres):
+    ids = [
+        create_movie(title="Inception", genre_ids=[genres[2].id, genres[0].id]),
+        create_movie(title="Memento", release_year=2000, genre_ids=[genres[1].id]),
+        create_movie(title='Tenet, "the" sequel', release_year=2020),
+    ]
+    for score in (8, 10):
+        client.post(f"/api/v1/movies/{ids[0]}/ratings", json={"score": score})
+    return ids
+
+
+def export(client, headers=PLAIN, **params):
+    response = client.get("/api/v1/movies/export", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_ndjson_export_has_one_object_per_movie(client, catalog):
+    response = export(client)
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="movies.ndjson"'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == catalog
+    first = rows[0]
+    assert (first["director"], first["genres"], first["ratings_count"], first["average_rating"]) == (
+        "Christopher Nolan", ["Action", "Sci-Fi"], 2, 9.0,
+    )
+    assert (rows[1]["ratings_count"], rows[1]["average_rating"]) == (0, None)
+
+
+def test_csv_export_with_selected_fields(client, catalog):
+    response = export(client, format="csv", fields="title,id,genres,title")
+
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows == [
+        ["title", "id", "genres"],
+        ["Inception", str(catalog[0]), "Action|Sci-Fi"],
+        ["Memento", str(catalog[1]), "Drama"],
+        ['Tenet, "the" sequel', str(catalog[2]), "Action"],
+    ]
+
+
+def test_gzip_is_negotiated(client, catalog):
+    plain = export(client, format="csv").content
+
+    with client.stream("GET", "/api/v1/movies/export", params={"format": "csv"},
+                       headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(raw) == plain
+
+    refused = export(client, headers={"Accept-Encoding": "gzip;q=0"}, format="csv")
+    assert "content-encoding" not in refused.headers
+    assert refused.content == plain
+
+
+def test_since_keeps_movies_whose_row_or_ratings_changed(client, db, catalog):
+    old = datetime(2020, 1, 1)
+    db.execute(update(Movie).values(updated_at=old))
+    db.execute(update(MovieRatingStats).values(updated_at=old))
+    db.commit()
+    client.post(f"/api/v1/movies/{catalog[1]}/ratings", json={"score": 7})
+    client.put(f"/api/v1/movies/{catalog[2]}/", json={"title": "Tenet"})
+
+    rows = [json.loads(line) for line in export(client, since="2024-01-01T00:00:00", fields="id").text.splitlines()]
+    assert rows == [{"id": catalog[1]}, {"id": catalog[2]}]
+    assert export(client, since="2999-01-01T00:00:00").text == ""
+
+
+@pytest.mark.parametrize("fields", ["id,budget", ",", "director_name"])
+def test_unknown_fields_are_a_400(client, catalog, fields):
+    response = client.get("/api/v1/movies/export", params={"fields": fields})
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["status"] == "failure"
+
+
+def test_export_of_an_empty_catalog(client):
+    assert export(client).text == ""
+    assert export(client, format="csv", fields="id,title").text == "id,title\r\n"
@@ -0,0 +1,30 @@
+import json
+import logging
+
+from app.core.logger import JsonFormatter
+
+CALLER_FIELDS = {"file", "line", "func", "thread", "process"}
+
+
+def make_record() -> logging.LogRecord:
+    logger = logging.getLogger("tests.logger")
+    return logger.makeRecord(
+        logger.name, logging.INFO, __file__, 12, "Rating movie (movie_id=%s)", (7,), None,
+        func="rate", extra={"route": "/api/v1/movies/{movie_id}/ratings"},
+    )
+
+
+def test_json_lines_carry_extra_fields_but_no_caller_info_by_default():
+    entry = json.loads(JsonFormatter().format(make_record()))
+
+    assert (entry["level"], entry["logger"], entry["message"]) == ("INFO", "tests.logger", "Rating movie (movie_id=7)")
+    assert entry["route"] == "/api/v1/movies/{movie_id}/ratings"
+    assert not CALLER_FIELDS & entry.keys()
+
+
+def test_caller_info_adds_the_call_site():
+    entry = json.loads(JsonFormatter(caller_info=True).format(make_record()))
+
+    assert (entry["file"], entry["line"], entry["func"]) == (__file__, 12, "rate")
+    assert entry["thread"] == "MainThread"
+    assert CALLER_FIELDS <= entry.keys()
@@ -0,0 +1,96 @@
+import pytest
+
+import app.dependencies
+from app.core.metrics import Histogram, PrometheusText
+
+MOVIE_ROUTE = 'method="GET",route="/api/v1/movies/{movie_id}"'
+AUTH = {"Authorization": "Bearer test-internal-token"}
+INTERNAL_PATHS = ["/metrics", "/internal/db-pool", "/internal/rating-buffer", "/internal/cache"]
+
+
+def scrape(client) -> dict:
+    """{'name{labels}': value} for every sample line of /metrics."""
+    response = client.get("/metrics", headers=AUTH)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == PrometheusText.content_type
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+def test_requests_are_counted_per_route_template(client, create_movie):
+    movie_id = create_movie()
+    before = scrape(client)
+
+    client.get(f"/api/v1/movies/{movie_id}")
+    client.get(f"/api/v1/movies/{movie_id}")
+    client.get("/api/v1/movies/999")
+    after = scrape(client)
+
+    def delta(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    assert delta(f"http_requests_total{{{MOVIE_ROUTE},status=\"200\"}}") == 2
+    assert delta(f"http_requests_total{{{MOVIE_ROUTE},status=\"404\"}}") == 1
+    assert delta(f"http_request_duration_seconds_count{{{MOVIE_ROUTE}}}") == 3
+    assert delta(f'http_request_duration_seconds_bucket{{{MOVIE_ROUTE},le="+Inf"}}') == 3
+    assert delta(f"http_request_db_queries_count{{{MOVIE_ROUTE}}}") == 3
+    assert not any(f'route="/api/v1/movies/{movie_id}"' in name for name in after)
+
+
+def test_pool_cache_and_log_families_are_exported(client, create_movie):
+    client.get(f"/api/v1/movies/{create_movie()}")
+
+    samples = scrape(client)
+
+    # SQLite keeps SQLAlchemy's own pool: no checkouts recorded, but the counters are exported
+    assert samples['db_pool_checkouts_total{pool="sync"}'] == 0
+    assert 'cache_entries{cache="movie_detail"}' in samples
+    assert 'cache_hits_total{cache="genre_list"}' in samples
+    assert "log_records_dropped_total" in samples
+    assert not any(name.startswith("rating_buffer_") for name in samples)  # disabled in the tests
+
+
+def test_prometheus_text_format():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 2):
+        histogram.observe(value)
+    out = PrometheusText()
+    out.counter("requests_total", "Requests.", [({"path": 'a"b'}, 3), ({"path": "skipped"}, None)])
+    out.gauge("empty", "No samples, no family.", [])
+    out.histogram("latency_seconds", "Latency.", [({}, histogram)])
+
+    assert out.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{path="a\\"b"} 3',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 2.55",
+        "latency_seconds_count 3",
+    ]
+
+
+@pytest.mark.parametrize("path", INTERNAL_PATHS)
+def test_internal_routes_need_the_token(client, path):
+    assert client.get(path, headers=AUTH).status_code == 200
+
+    for headers in ({}, {"Authorization": "Bearer wrong"}, {"Authorization": "test-internal-token"}):
+        response = client.get(path, headers=headers)
+        assert response.status_code == 401, headers
+        assert response.headers["www-authenticate"] == "Bearer"
+        assert response.json()["detail"]["error"]["code"] == 401
+
+
+@pytest.mark.parametrize("path", INTERNAL_PATHS)
+def test_internal_routes_are_hidden_without_a_configured_token(client, monkeypatch, path):
+    monkeypatch.setattr(app.dependencies, "INTERNAL_API_TOKEN", "")
+
+    assert client.get(path, headers=AUTH).status_code == 404
+    assert client.get(path, headers={"Authorization": "Bearer "}).status_code == 404
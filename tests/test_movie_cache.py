@@ -0,0 +1,115 @@
+import pytest
+
+from app.core.cache import CacheBackend, LRUCache
+from app.core.http_cache import Validators
+from app.schemas.schemas import DirectorInMovieResponse, MovieResponse
+from app.services.movie_cache import MovieCache, movie_cache
+from tests.fakes import FakeSharedCache
+
+
+def movie(movie_id: int = 1, title: str = "Inception") -> MovieResponse:
+    return MovieResponse(
+        id=movie_id,
+        title=title,
+        release_year=2010,
+        cast="Leonardo DiCaprio",
+        director=DirectorInMovieResponse(id=1, name="Christopher Nolan"),
+        genres=["Action", "Sci-Fi"],
+        average_rating=8.5,
+        ratings_count=2,
+    )
+
+
+class CountingLoader:
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.values[min(self.calls, len(self.values)) - 1]
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_shared_backend_stores_json_and_returns_equal_models():
+    backend = FakeSharedCache()
+    cache = MovieCache(backend)
+    loader = CountingLoader(movie())
+
+    first = cache.get_or_load(1, loader)
+    second = cache.get_or_load(1, loader)
+
+    assert loader.calls == 1
+    assert isinstance(backend._data["movie:1:response"], str)
+    assert second == first and second is not first
+
+    validators = Validators(etag='"abc"')
+    assert cache.get_or_load_validators(1, lambda: validators) == validators
+    assert cache.get_or_load_validators(1, lambda: None) == validators
+
+
+def test_local_backend_returns_the_cached_object():
+    cache = MovieCache(LRUCache(max_entries=10, ttl=60))
+    loader = CountingLoader(movie())
+
+    assert cache.get_or_load(1, loader) is cache.get_or_load(1, loader)
+    assert loader.calls == 1
+
+
+def test_invalidation_on_one_worker_reaches_the_others():
+    backend = FakeSharedCache()
+    worker_a, worker_b = MovieCache(backend), MovieCache(backend)
+    worker_a.get_or_load(1, lambda: movie(title="Old"))
+    worker_a.get_or_load(2, lambda: movie(2))
+
+    worker_b.invalidate(1)
+
+    assert worker_a.get_or_load(1, lambda: movie(title="New")).title == "New"
+    assert worker_a.get_or_load(2, lambda: movie(2, title="Reloaded")).title == "Inception"
+
+
+def test_load_racing_an_invalidation_is_not_stored():
+    cache = MovieCache(LRUCache(max_entries=10, ttl=60))
+
+    def stale_loader():
+        cache.invalidate(1)  # a write commits while the load is reading
+        return movie(title="Stale")
+
+    assert cache.get_or_load(1, stale_loader).title == "Stale"
+    assert cache.get_or_load(1, lambda: movie(title="Fresh")).title == "Fresh"
+
+
+@pytest.mark.parametrize("backend", [FakeSharedCache(), LRUCache(max_entries=10, ttl=60)], ids=["shared", "lru"])
+def test_hit_and_miss_counters(backend):
+    cache = MovieCache(backend)
+
+    cache.get_or_load(1, movie)
+    cache.get_or_load(1, movie)
+    cache.get_or_load(1, movie)
+    cache.invalidate(1)
+    cache.get_or_load(1, movie)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (2, 2, 1)
+    assert stats["backend"] == type(backend).__name__
+
+
+def test_api_writes_invalidate_the_cached_movie(client, create_movie):
+    movie_id = create_movie()
+    client.get(f"/api/v1/movies/{movie_id}")
+    hits = movie_cache.backend.hits
+    assert client.get(f"/api/v1/movies/{movie_id}").status_code == 200
+    assert movie_cache.backend.hits > hits  # served from the cache
+
+    client.post(f"/api/v1/movies/{movie_id}/ratings", json={"score": 9})
+    assert client.get(f"/api/v1/movies/{movie_id}").json()["ratings_count"] == 1
+
+    client.put(f"/api/v1/movies/{movie_id}/", json={"title": "Renamed"})
+    assert client.get(f"/api/v1/movies/{movie_id}").json()["title"] == "Renamed"
+
+    client.delete(f"/api/v1/movies/{movie_id}/")
+    assert client.get(f"/api/v1/movies/{movie_id}").status_code == 404
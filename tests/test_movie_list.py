@@ -0,0 +1,93 @@
+from app.core.pagination import encode_cursor
+
+
+def item_ids(response) -> list:
+    return [item["id"] for item in response.json()["data"]["items"]]
+
+
+def test_cursor_pages_cover_the_list_once(client, create_movie):
+    movie_ids = [create_movie(title=f"Movie {i}") for i in range(5)]
+
+    seen, params = [], {"page_size": 2}
+    while True:
+        response = client.get("/api/v1/movies/", params=params)
+        assert response.status_code == 200, response.text
+        data = response.json()["data"]
+        seen += item_ids(response)
+        if data["next_cursor"] is None:
+            break
+        params = {"page_size": 2, "cursor": data["next_cursor"]}
+        assert len(data["items"]) == 2
+
+    assert seen == movie_ids
+    assert data["page"] is None  # a cursor page has no page number
+
+
+def test_cursor_overrides_page_and_keeps_filters(client, create_movie):
+    movie_ids = [create_movie(title=f"Movie {i}", release_year=2000 + i % 2) for i in range(6)]
+    cursor = encode_cursor(movie_ids[1])
+
+    response = client.get("/api/v1/movies/", params={"cursor": cursor, "page": 3, "release_year": 2000})
+
+    assert item_ids(response) == [movie_ids[2], movie_ids[4]]
+    assert response.json()["data"]["next_cursor"] is None
+
+
+def test_offset_page_hands_out_a_cursor_for_the_next_one(client, create_movie):
+    movie_ids = [create_movie(title=f"Movie {i}") for i in range(3)]
+
+    first = client.get("/api/v1/movies/", params={"page_size": 2}).json()["data"]
+    second = client.get("/api/v1/movies/", params={"page_size": 2, "cursor": first["next_cursor"]})
+
+    assert [item["id"] for item in first["items"]] == movie_ids[:2]
+    assert item_ids(second) == movie_ids[2:]
+
+
+def test_bad_cursor_is_a_400(client, create_movie):
+    create_movie()
+
+    for cursor in ("not-a-cursor", encode_cursor(1)[:-2] + "!!", "eyJpZCI6IngifQ"):  # last: {"id":"x"}
+        response = client.get("/api/v1/movies/", params={"cursor": cursor})
+        assert response.status_code == 400, cursor
+        assert response.json()["detail"]["error"]["message"] == "Invalid cursor"
+
+    response = client.get("/api/v1/movies/", params={"cursor": "not-a-cursor"}, headers={"If-None-Match": '"x"'})
+    assert response.status_code == 400
+
+
+def test_count_modes(client, create_movie):
+    for i in range(3):
+        create_movie(title=f"Movie {i}")
+
+    for count, expected in [("exact", 3), ("estimated", 3), ("none", None)]:
+        data = client.get("/api/v1/movies/", params={"page_size": 2, "count": count}).json()["data"]
+        assert (data["total_items"], data["count_strategy"]) == (expected, count)
+        assert len(data["items"]) == 2 and data["next_cursor"] is not None
+
+    assert client.get("/api/v1/movies/", params={"count": "approximate"}).status_code == 422
+
+
+def test_exact_count_past_the_last_page_and_after_a_cursor(client, create_movie):
+    for i in range(3):
+        create_movie(title=f"Movie {i}", release_year=2000 + i % 2)
+
+    data = client.get("/api/v1/movies/", params={"page": 5, "release_year": 2000}).json()["data"]
+    assert (data["items"], data["total_items"]) == ([], 2)
+
+    cursor = client.get("/api/v1/movies/", params={"page_size": 1}).json()["data"]["next_cursor"]
+    data = client.get("/api/v1/movies/", params={"page_size": 1, "cursor": cursor}).json()["data"]
+    assert data["total_items"] == 3  # the whole filtered set, not just what follows the cursor
+
+
+def test_estimated_count_is_reused_per_filter_set(client, create_movie):
+    create_movie(release_year=2000)
+    params = {"count": "estimated", "release_year": 2000}
+    assert client.get("/api/v1/movies/", params=params).json()["data"]["total_items"] == 1
+
+    create_movie(title="Memento", release_year=2000)
+
+    assert client.get("/api/v1/movies/", params=params).json()["data"]["total_items"] == 1
+    exact = client.get("/api/v1/movies/", params={**params, "count": "exact"}).json()["data"]
+    assert exact["total_items"] == 2
+    other = client.get("/api/v1/movies/", params={"count": "estimated"}).json()["data"]
+    assert other["total_items"] == 2
@@ -0,0 +1,51 @@
+import logging
+
+from sqlalchemy import func, select
+
+from app.models.models import MovieRatingStats, Rating, movie_genres
+from app.services.movie_service import MovieService
+
+
+def test_create_movie_starts_empty_stats(client, db, create_movie, genres):
+    movie_id = create_movie(genre_ids=[genres[0].id, genres[1].id])
+
+    movie = client.get(f"/api/v1/movies/{movie_id}").json()
+    assert movie["genres"] == ["Action", "Drama"]
+    assert (movie["average_rating"], movie["ratings_count"]) == (None, 0)
+    assert db.get(MovieRatingStats, movie_id).ratings_count == 0
+
+
+def test_delete_removes_ratings_stats_and_links(client, db, create_movie, genres):
+    movie_id = create_movie(genre_ids=[genres[0].id, genres[2].id])
+    other_id = create_movie(title="Tenet")
+    for score in (7, 9):
+        client.post(f"/api/v1/movies/{movie_id}/ratings", json={"score": score})
+    client.post(f"/api/v1/movies/{other_id}/ratings", json={"score": 5})
+
+    assert client.delete(f"/api/v1/movies/{movie_id}/").status_code == 204
+
+    assert client.get(f"/api/v1/movies/{movie_id}").status_code == 404
+    db.expire_all()
+    assert db.get(MovieRatingStats, movie_id) is None
+    assert db.scalar(select(func.count()).select_from(Rating).where(Rating.movie_id == movie_id)) == 0
+    links = select(func.count()).select_from(movie_genres).where(movie_genres.c.movie_id == movie_id)
+    assert db.scalar(links) == 0
+    # the other movie is untouched
+    assert db.get(MovieRatingStats, other_id).ratings_count == 1
+    assert client.delete(f"/api/v1/movies/{movie_id}/").status_code == 404
+
+
+def test_update_errors_are_logged_with_the_traceback(client, create_movie, monkeypatch, caplog):
+    movie_id = create_movie()
+
+    def fail(self, movie_id, movie_data):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(MovieService, "update_movie", fail)
+    with caplog.at_level(logging.ERROR, logger="movie_rating"):
+        response = client.put(f"/api/v1/movies/{movie_id}/", json={"title": "Renamed"})
+
+    assert response.status_code == 422
+    record = next(record for record in caplog.records if record.levelno == logging.ERROR)
+    assert record.getMessage() == f"Movie update failed (movie_id={movie_id}, route=/api/v1/movies/{{movie_id}}/)"
+    assert record.exc_info[1].args == ("database went away",)
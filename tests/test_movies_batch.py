@@ -0,0 +1,70 @@
+from sqlalchemy import func, select
+
+from app.models.models import Movie, MovieRatingStats
+
+
+def test_batch_create_reports_each_item(client, db, director, genres):
+    items = [
+        {"title": f"Movie {i}", "director_id": director.id, "release_year": 2000 + i, "cast": "x",
+         "genres": [genres[0].id, genres[1].id, genres[0].id]}
+        for i in range(3)
+    ]
+    items.append({"title": "Bad director", "director_id": 999, "release_year": 2000, "cast": "x",
+                  "genres": [genres[0].id]})
+    items.append({"title": "Bad genres", "director_id": director.id, "release_year": 2000, "cast": "x",
+                  "genres": [genres[0].id, 77, 78]})
+
+    response = client.post("/api/v1/movies:batch", json={"items": items})
+
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+    assert (data["created"], data["failed"]) == (3, 2)
+    assert [item["status"] for item in data["items"]] == ["created"] * 3 + ["failed"] * 2
+    assert data["items"][3]["error"] == "Director with id 999 not found."
+    assert data["items"][4]["error"] == "Genres not found: [77, 78]"
+
+    created = [item["id"] for item in data["items"][:3]]
+    for i, movie_id in enumerate(created):
+        movie = client.get(f"/api/v1/movies/{movie_id}").json()
+        assert (movie["title"], movie["release_year"]) == (f"Movie {i}", 2000 + i)
+        assert movie["genres"] == ["Action", "Drama"]  # duplicates collapse to one link
+        assert db.get(MovieRatingStats, movie_id) is not None
+    assert db.scalar(select(func.count()).select_from(Movie)) == 3
+
+
+def test_batch_update_applies_partial_changes(client, create_movie, genres):
+    first, second, third = (create_movie(title=f"Movie {i}") for i in range(3))
+
+    response = client.put(
+        "/api/v1/movies:batch",
+        json={"items": [
+            {"id": first, "title": "Renamed", "genres": [genres[1].id]},
+            {"id": second, "release_year": 1999},
+            {"id": third, "genres": []},
+            {"id": 12345, "title": "Missing"},
+            {"id": second, "title": "Duplicate"},
+        ]},
+    )
+
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+    assert (data["updated"], data["failed"]) == (3, 2)
+    assert [item["error"] for item in data["items"][3:]] == [
+        "Movie with id 12345 not found.",
+        "Duplicate movie id in batch.",
+    ]
+
+    movie = client.get(f"/api/v1/movies/{first}").json()
+    assert (movie["title"], movie["genres"]) == ("Renamed", ["Drama"])
+    movie = client.get(f"/api/v1/movies/{second}").json()
+    assert (movie["title"], movie["release_year"]) == ("Movie 1", 1999)
+    assert client.get(f"/api/v1/movies/{third}").json()["genres"] == []
+
+
+def test_batch_update_rejects_unknown_director(client, create_movie):
+    movie_id = create_movie()
+
+    response = client.put("/api/v1/movies:batch", json={"items": [{"id": movie_id, "director_id": 999}]})
+
+    assert response.json()["data"]["items"][0]["error"] == "Director with id 999 not found."
+    assert client.get(f"/api/v1/movies/{movie_id}").json()["director"]["name"] == "Christopher Nolan"
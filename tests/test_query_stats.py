@@ -0,0 +1,53 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.middleware import QueryStatsMiddleware
+from app.db.database import SessionLocal
+from app.models.models import Movie
+
+
+def test_responses_carry_statement_count_and_db_time(client, create_movie):
+    movie_id = create_movie()
+
+    response = client.get(f"/api/v1/movies/{movie_id}")
+    assert int(response.headers["x-db-queries"]) > 0
+    assert float(response.headers["x-db-time"]) >= 0
+    assert "x-db-violations" not in response.headers
+
+    # served from the movie cache: no SQL at all
+    assert client.get(f"/api/v1/movies/{movie_id}").headers["x-db-queries"] == "0"
+    assert client.get("/").headers["x-db-queries"] == "0"
+
+
+@pytest.fixture
+def strict_client(db):
+    """A bare app with one route that lazy-loads, behind a strict middleware."""
+    app = FastAPI()
+
+    @app.get("/movies/{movie_id}/director")
+    def director_name(movie_id: int, lazy: bool = True):
+        with SessionLocal() as session:
+            movie = session.get(Movie, movie_id)
+            return {"director": movie.director.name if lazy else None}
+
+    app.add_middleware(QueryStatsMiddleware, strict=True, budget=1)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_strict_mode_flags_lazy_loads_and_budget_overruns(strict_client, create_movie, caplog):
+    movie_id = create_movie()
+
+    with caplog.at_level(logging.WARNING, logger="movie_rating"):
+        response = strict_client.get(f"/movies/{movie_id}/director")
+
+    assert response.json() == {"director": "Christopher Nolan"}
+    assert response.headers["x-db-queries"] == "2"
+    assert response.headers["x-db-violations"] == "lazy load of Movie.director; 2 statements (budget 1)"
+    assert any(record.db_violations for record in caplog.records if hasattr(record, "db_violations"))
+
+    response = strict_client.get(f"/movies/{movie_id}/director", params={"lazy": False})
+    assert (response.headers["x-db-queries"], "x-db-violations" in response.headers) == ("1", False)
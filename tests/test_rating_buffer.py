@@ -0,0 +1,150 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+import app.controller.ratings as ratings_controller
+from app.db.database import SessionLocal
+from app.repositories.movie_repository import MovieRepository
+from app.services.rating_buffer import RatingBuffer
+from tests.utils import stored_stats
+
+
+class BlockingSessions:
+    """Session factory whose sessions are only handed out once `release` is set."""
+
+    def __init__(self):
+        self.waiting = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.waiting.set()
+        self.release.wait(5)
+        return SessionLocal()
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def make_buffer(session_factory=SessionLocal, **options) -> RatingBuffer:
+    options = {"flush_interval_ms": 20, "retry_backoff_ms": 1, **options}
+    return RatingBuffer(session_factory, **options)
+
+
+def test_flush_writes_queued_ratings_in_batches(db, create_movie):
+    first, second = create_movie(), create_movie(title="Tenet")
+    buffer = make_buffer()
+    buffer.start()
+
+    for movie_id, score in [(first, 4), (second, 6), (first, 10), (second, 1)]:
+        assert buffer.submit(movie_id, score) is True
+    buffer.stop()
+
+    snapshot = buffer.snapshot()
+    assert (snapshot["running"], snapshot["queued"], snapshot["flushed"], snapshot["pending"]) == (False, 4, 4, 0)
+    assert stored_stats(db, first)["ratings_sum"] == 14
+    assert stored_stats(db, second)["ratings_count"] == 2
+
+
+def test_failed_flush_is_retried(db, create_movie, monkeypatch):
+    movie_id = create_movie()
+    original = MovieRepository.add_ratings_bulk
+    failures = []
+
+    def flaky(repository, ratings):
+        if not failures:
+            failures.append(ratings)
+            raise OperationalError("INSERT", {}, Exception("connection reset"))
+        return original(repository, ratings)
+
+    monkeypatch.setattr(MovieRepository, "add_ratings_bulk", flaky)
+    buffer = make_buffer()
+    buffer.start()
+    buffer.submit(movie_id, 7)
+    buffer.stop()
+
+    assert (buffer.retried, buffer.flushed, buffer.dropped) == (1, 1, 0)
+    assert stored_stats(db, movie_id)["ratings_count"] == 1
+
+
+def test_integrity_error_falls_back_to_row_by_row(db, create_movie, monkeypatch):
+    good, bad = create_movie(), create_movie(title="Deleted")
+    original = MovieRepository.add_ratings_bulk
+
+    def reject_bad_movie(repository, ratings):
+        if any(movie_id == bad for movie_id, _ in ratings):
+            raise IntegrityError("INSERT", {}, Exception("foreign key violation"))
+        return original(repository, ratings)
+
+    monkeypatch.setattr(MovieRepository, "add_ratings_bulk", reject_bad_movie)
+    buffer = make_buffer()
+    buffer._flush([(good, 3), (bad, 5), (good, 9)])
+
+    assert (buffer.row_fallbacks, buffer.flushed, buffer.dropped) == (1, 2, 1)
+    assert stored_stats(db, good)["ratings_sum"] == 12
+    assert stored_stats(db, bad)["ratings_count"] == 0
+
+
+def test_submit_after_stop_asks_for_a_synchronous_write(db, create_movie):
+    movie_id = create_movie()
+    buffer = make_buffer()
+    buffer.start()
+    buffer.stop()
+
+    assert buffer.submit(movie_id, 8) is False
+    assert (buffer.sync_fallbacks, buffer.queued) == (1, 0)
+
+
+def test_stop_keeps_running_state_until_the_flusher_exits(db, create_movie):
+    movie_id = create_movie()
+    sessions = BlockingSessions()
+    buffer = make_buffer(sessions)
+    buffer.start()
+    buffer.submit(movie_id, 6)
+    assert sessions.waiting.wait(5)
+
+    buffer.stop(timeout=0.05)
+    assert buffer.snapshot()["running"] is True
+    assert buffer.pending == 1
+
+    sessions.release.set()
+    buffer.stop()
+    assert buffer.snapshot()["running"] is False
+    assert (buffer.pending, stored_stats(db, movie_id)["ratings_count"]) == (0, 1)
+
+
+@pytest.fixture
+def buffered_ratings(monkeypatch):
+    """Route ratings through a small buffer whose flusher blocks until released."""
+    sessions = BlockingSessions()
+    buffer = make_buffer(sessions, max_size=1, max_batch=1, put_timeout_ms=10)
+    monkeypatch.setattr(ratings_controller, "rating_buffer", buffer)
+    buffer.start()
+    yield buffer, sessions
+    sessions.release.set()
+    buffer.stop()
+
+
+def test_rating_route_answers_202_then_503_when_full(client, db, create_movie, buffered_ratings):
+    buffer, sessions = buffered_ratings
+    movie_id = create_movie()
+    url = f"/api/v1/movies/{movie_id}/ratings"
+
+    assert client.post(url, json={"score": 5}).status_code == 202
+    assert sessions.waiting.wait(5)  # the flusher holds the first rating
+    wait_for(lambda: buffer.depth == 0)
+    assert client.post(url, json={"score": 6}).status_code == 202  # fills the queue
+
+    response = client.post(url, json={"score": 7})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert buffer.rejected == 1
+
+    sessions.release.set()
+    buffer.stop()
+    assert stored_stats(db, movie_id)["ratings_count"] == 2
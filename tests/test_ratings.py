@@ -0,0 +1,43 @@
+import pytest
+
+from app.models.models import MovieRatingStats
+from app.repositories.movie_repository import MovieRepository
+from tests.utils import assert_stats_consistent, stored_stats
+
+
+def test_add_rating_updates_stats_and_histogram(client, db, create_movie):
+    movie_id = create_movie()
+    assert_stats_consistent(db, movie_id)
+
+    for score in (8, 3, 10, 8):
+        response = client.post(f"/api/v1/movies/{movie_id}/ratings", json={"score": score})
+        assert response.status_code == 201, response.text
+        assert_stats_consistent(db, movie_id)
+
+    movie = client.get(f"/api/v1/movies/{movie_id}").json()
+    assert movie["ratings_count"] == 4
+    assert movie["average_rating"] == pytest.approx(7.25)
+
+    histogram = client.get(f"/api/v1/movies/{movie_id}/ratings/histogram").json()["data"]
+    assert histogram["ratings_count"] == 4
+    assert histogram["counts"] == {str(score): {3: 1, 8: 2, 10: 1}.get(score, 0) for score in range(1, 11)}
+
+
+def test_add_rating_rejects_invalid_scores(client, db, create_movie):
+    movie_id = create_movie()
+
+    assert client.post(f"/api/v1/movies/{movie_id}/ratings", json={"score": 11}).status_code == 400
+    assert client.post("/api/v1/movies/999/ratings", json={"score": 5}).status_code == 404
+    assert stored_stats(db, movie_id)["ratings_count"] == 0
+
+
+def test_rebuild_rating_stats_repairs_drift(client, db, create_movie):
+    movie_id = create_movie()
+    for score in (2, 2, 9):
+        client.post(f"/api/v1/movies/{movie_id}/ratings", json={"score": score})
+    db.query(MovieRatingStats).filter_by(movie_id=movie_id).update({"ratings_count": 42, "score_2": 0})
+    db.commit()
+
+    MovieRepository(db).rebuild_rating_stats()
+
+    assert_stats_consistent(db, movie_id)
@@ -0,0 +1,61 @@
+import random
+
+from sqlalchemy import delete
+
+from app.models.models import MovieRatingStats
+from app.repositories.movie_repository import MovieRepository
+from tests.utils import assert_stats_consistent, expected_stats, stored_stats
+
+
+def test_ratings_batch_matches_recount(client, db, create_movie):
+    movie_ids = [create_movie(title=f"Movie {i}") for i in range(4)]
+    rng = random.Random(7)
+    pairs = [(rng.choice(movie_ids), rng.randint(1, 10)) for _ in range(300)]
+
+    # single ratings and a batch land on the same aggregates
+    for movie_id, score in pairs[:20]:
+        client.post(f"/api/v1/movies/{movie_id}/ratings", json={"score": score})
+    response = client.post(
+        "/api/v1/movies/ratings:batch",
+        json={"items": [{"movie_id": movie_id, "score": score} for movie_id, score in pairs[20:]]},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["data"]["created"] == len(pairs) - 20
+
+    for movie_id in movie_ids:
+        assert_stats_consistent(db, movie_id)
+        histogram = client.get(f"/api/v1/movies/{movie_id}/ratings/histogram").json()["data"]
+        expected = expected_stats(db, movie_id)
+        assert histogram["counts"] == {str(score): expected[f"score_{score}"] for score in range(1, 11)}
+
+
+def test_ratings_batch_reports_failures_per_item(client, db, create_movie):
+    movie_id = create_movie()
+
+    response = client.post(
+        "/api/v1/movies/ratings:batch",
+        json={"items": [
+            {"movie_id": movie_id, "score": 5},
+            {"movie_id": movie_id, "score": 11},
+            {"movie_id": 999, "score": 3},
+            {"movie_id": movie_id, "score": 9},
+        ]},
+    )
+
+    data = response.json()["data"]
+    assert (data["created"], data["failed"]) == (2, 2)
+    assert [item["status"] for item in data["items"]] == ["created", "failed", "failed", "created"]
+    assert data["items"][2]["error"] == "Movie with id 999 not found."
+    assert_stats_consistent(db, movie_id)
+    assert stored_stats(db, movie_id)["ratings_count"] == 2
+
+
+def test_add_ratings_bulk_recreates_missing_stats_row(db, create_movie):
+    movie_id = create_movie()
+    db.execute(delete(MovieRatingStats).where(MovieRatingStats.movie_id == movie_id))
+    db.commit()
+
+    result = MovieRepository(db).add_ratings_bulk([(movie_id, 4), (999, 5), (movie_id, 6)])
+
+    assert result[1] is None and None not in (result[0], result[2])
+    assert_stats_consistent(db, movie_id)
@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import insert
+
+from app.db.database import engine
+from app.models.models import Director, Genre
+from app.services.reference_cache import reference_cache
+
+
+@pytest.fixture
+def snapshot(client, director, genres):
+    """A loaded snapshot that only changes when a test refreshes it."""
+    reference_cache.stop()  # the lifespan's stop() is a no-op afterwards
+    reference_cache.refresh(force=True)
+    return reference_cache.current()
+
+
+def _insert_elsewhere(model, **values) -> int:
+    # a Core insert on its own connection, as another worker or an importer would
+    # do it: this process' snapshot is not invalidated
+    with engine.begin() as connection:
+        return connection.execute(insert(model).values(**values)).inserted_primary_key[0]
+
+
+def test_orm_writes_invalidate_the_snapshot(snapshot, db, director, genres):
+    assert snapshot.genres[genres[0].id] == "Action"
+
+    db.add(Genre(name="Western"))
+    db.commit()
+    assert reference_cache.current() is None
+
+    reference_cache.refresh()
+    assert "Western" in reference_cache.current().genres.values()
+
+    director.name = "Jonathan Nolan"
+    db.commit()
+    assert reference_cache.current() is None
+
+
+def test_ids_missing_from_the_snapshot_are_checked_in_the_database(snapshot, client, genres):
+    director_id = _insert_elsewhere(Director, name="Denis Villeneuve")
+    genre_id = _insert_elsewhere(Genre, name="Western")
+    assert reference_cache.current() is snapshot and director_id not in snapshot.directors
+
+    response = client.post(
+        "/api/v1/movies/",
+        json={"title": "Dune", "director_id": director_id, "release_year": 2021, "cast": "x",
+              "genres": [genres[0].id, genre_id]},
+    )
+
+    assert response.status_code == 201, response.text
+    assert response.json()["director"]["name"] == "Denis Villeneuve"
+    assert response.json()["genres"] == ["Action", "Western"]
+    assert client.get("/api/v1/movies/top", params={"genre": "western"}).status_code == 200
+
+
+def test_batch_create_accepts_ids_added_after_the_snapshot(snapshot, client, genres):
+    director_id = _insert_elsewhere(Director, name="Greta Gerwig")
+
+    response = client.post(
+        "/api/v1/movies:batch",
+        json={"items": [
+            {"title": "Lady Bird", "director_id": director_id, "release_year": 2017, "cast": "x",
+             "genres": [genres[1].id]},
+            {"title": "Unknown", "director_id": director_id + 1, "release_year": 2017, "cast": "x",
+             "genres": [genres[1].id]},
+        ]},
+    )
+
+    items = response.json()["data"]["items"]
+    assert [item["status"] for item in items] == ["created", "failed"]
+    assert items[1]["error"] == f"Director with id {director_id + 1} not found."
+
+
+def test_unknown_ids_are_still_rejected(snapshot, client, director):
+    response = client.post(
+        "/api/v1/movies/",
+        json={"title": "Nope", "director_id": director.id + 100, "release_year": 2000, "cast": "x",
+              "genres": [1]},
+    )
+
+    assert response.status_code == 400
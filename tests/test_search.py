@@ -0,0 +1,63 @@
+import pytest
+
+
+@pytest.fixture
+def catalog(create_movie, genres):
+    action, drama, _ = genres
+    return {
+        title: create_movie(title=title, genre_ids=[genre.id])
+        for title, genre in [
+            ("Interstellar", drama),
+            ("The Prestige", drama),
+            ("Inception", action),
+            ("Batman Begins", action),
+            ("Following", drama),
+        ]
+    }
+
+
+def search(client, **params):
+    response = client.get("/api/v1/movies/search", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def titles(data) -> list:
+    return [item["title"] for item in data["items"]]
+
+
+def test_fallback_ranks_exact_then_prefix_then_substring(client, catalog):
+    # SQLite has no full-text or trigram support: the ILIKE fallback is what runs here
+    data = search(client, q="in")
+
+    assert titles(data) == ["Interstellar", "Inception", "Batman Begins", "Following"]
+    assert [item["rank"] for item in data["items"]] == [0.75, 0.75, 0.5, 0.5]
+    assert data["items"][0]["highlight"] == "Interstellar"
+    assert data["query"] == "in"
+
+    exact = search(client, q="INCEPTION")["items"]
+    assert [(item["id"], item["rank"]) for item in exact] == [(catalog["Inception"], 1.0)]
+
+
+def test_search_filters_by_genre_and_pages(client, catalog):
+    assert titles(search(client, q="in", genre="drama")) == ["Interstellar", "Following"]
+
+    first = search(client, q="in", page_size=3)
+    second = search(client, q="in", page_size=3, page=2)
+    assert titles(first) + titles(second) == titles(search(client, q="in"))
+    assert second["page"] == 2
+
+
+def test_search_results_carry_the_movie_fields(client, catalog):
+    client.post(f"/api/v1/movies/{catalog['The Prestige']}/ratings", json={"score": 9})
+
+    item = search(client, q="prestige")["items"][0]
+
+    assert (item["title"], item["genres"], item["ratings_count"]) == ("The Prestige", ["Drama"], 1)
+    assert item["director"]["name"] == "Christopher Nolan"
+
+
+def test_search_without_a_match_or_query(client, catalog):
+    assert search(client, q="Tenet")["items"] == []
+    assert client.get("/api/v1/movies/search", params={"q": ""}).status_code == 422
+    assert client.get("/api/v1/movies/search").status_code == 422
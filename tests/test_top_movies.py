@@ -0,0 +1,61 @@
+import pytest
+
+from app.repositories.movie_repository import bayesian_score
+
+
+@pytest.fixture
+def rated(client, create_movie, genres):
+    action, drama, _ = genres
+    movies = {
+        "Inception": ([action.id, drama.id], [9, 10, 9]),
+        "Tenet": ([action.id], [6, 7]),
+        "Memento": ([drama.id], [10]),
+        "Insomnia": ([drama.id], []),
+    }
+    ids = {}
+    for title, (genre_ids, scores) in movies.items():
+        ids[title] = create_movie(title=title, genre_ids=genre_ids)
+        for score in scores:
+            client.post(f"/api/v1/movies/{ids[title]}/ratings", json={"score": score})
+    return ids
+
+
+def top(client, **params):
+    response = client.get("/api/v1/movies/top", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def test_top_orders_by_damped_average(client, rated):
+    items = top(client)["items"]
+
+    expected = sorted(
+        [("Inception", bayesian_score(28, 3)), ("Tenet", bayesian_score(13, 2)), ("Memento", bayesian_score(10, 1))],
+        key=lambda pair: -pair[1],
+    )
+    assert [(item["title"], item["score"]) for item in items] == [
+        (title, pytest.approx(score)) for title, score in expected
+    ]
+    assert [item["rank"] for item in items] == [1, 2, 3]  # unrated movies are left out
+
+
+def test_top_filters(client, rated):
+    assert [item["title"] for item in top(client, genre="ACTION")["items"]] == ["Inception", "Tenet"]
+    assert [item["title"] for item in top(client, min_votes=2)["items"]] == ["Inception", "Tenet"]
+    assert [item["title"] for item in top(client, genre="drama", limit=1)["items"]] == ["Inception"]
+    assert top(client, release_year=1999)["items"] == []
+    assert top(client, genre="Sci-Fi")["items"] == []
+
+
+def test_top_follows_new_ratings(client, rated):
+    for _ in range(5):
+        client.post(f"/api/v1/movies/{rated['Tenet']}/ratings", json={"score": 10})
+
+    assert top(client, genre="action")["items"][0]["title"] == "Tenet"
+
+
+def test_top_unknown_genre_is_a_404(client, rated):
+    response = client.get("/api/v1/movies/top", params={"genre": "Western"})
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["error"]["message"] == "Genre 'Western' not found"
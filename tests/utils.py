@@ -0,0 +1,35 @@
+from collections import Counter
+
+import pytest
+from sqlalchemy import select
+
+from app.models.models import SCORE_COLUMNS, MovieRatingStats, Rating
+from app.repositories.movie_repository import bayesian_score
+
+
+def expected_stats(db, movie_id: int) -> dict:
+    """movie_rating_stats values recomputed from scratch out of movie_ratings."""
+    scores = db.scalars(select(Rating.score).where(Rating.movie_id == movie_id)).all()
+    counts = Counter(scores)
+    stats = {
+        "ratings_sum": sum(scores),
+        "ratings_count": len(scores),
+        "min_score": min(scores, default=None),
+        "max_score": max(scores, default=None),
+        "bayesian_score": bayesian_score(sum(scores), len(scores)),
+    }
+    stats.update({column: counts[score] for score, column in SCORE_COLUMNS.items()})
+    return stats
+
+
+def stored_stats(db, movie_id: int) -> dict:
+    db.expire_all()
+    row = db.get(MovieRatingStats, movie_id)
+    assert row is not None, f"no movie_rating_stats row for movie {movie_id}"
+    return {name: getattr(row, name) for name in expected_stats(db, movie_id)}
+
+
+def assert_stats_consistent(db, movie_id: int) -> None:
+    stored, expected = stored_stats(db, movie_id), expected_stats(db, movie_id)
+    assert stored.pop("bayesian_score") == pytest.approx(expected.pop("bayesian_score"))
+    assert stored == expected